@@ -0,0 +1,90 @@
+import streamlit as st
+
+from utils.actions import encode_action_columns
+from utils.background_parse import BackgroundParse
+from utils.parse_cache import log_digest
+
+
+# How often results are redrawn while a log is being parsed
+REFRESH_SECONDS = 0.5
+# How long the first run waits for the first chunk before drawing the page
+FIRST_RESULT_WAIT = 0.5
+
+
+st.set_page_config(page_title="GG Analytics", layout="wide")
+st.title("GG Analytics")
+
+uploaded = st.file_uploader("GG tournament hand history", type=["txt"])
+normalize = st.checkbox("Amounts in big blinds", value=True)
+
+
+def current_job(uploaded, normalize: bool) -> BackgroundParse:
+    """
+    The parse of this upload, started in the background on the first run;
+    a new upload (or normalize setting) cancels the previous parse.
+    """
+    key = (uploaded.file_id, normalize)
+    job = st.session_state.get("parse_job")
+    if job is not None and st.session_state.get("parse_key") == key:
+        return job
+    if job is not None:
+        job.cancel()
+
+    # Hash each upload once per session; a log parsed before is then served from the parse cache
+    digests = st.session_state.setdefault("log_digests", {})
+    if uploaded.file_id not in digests:
+        digests[uploaded.file_id] = log_digest(uploaded.getvalue())
+
+    job = BackgroundParse(uploaded.getvalue(), normalize=normalize, digest=digests[uploaded.file_id]).start()
+    job.wait_first(FIRST_RESULT_WAIT)
+    st.session_state["parse_job"] = job
+    st.session_state["parse_key"] = key
+    return job
+
+
+def show_progress(job: BackgroundParse) -> None:
+    progress = job.progress()
+    counts = f"{progress['hands']:,} / {progress['total']:,} hands, {progress['hands_per_second']:,.0f} hands/s"
+    if job.running:
+        st.progress(progress["fraction"], text=f"Parsing... {counts}")
+    elif job.error is not None:
+        st.error(f"Error parsing log: {job.error}")
+    else:
+        st.caption(f"{counts}, {progress['rows']:,} player rows in {progress['seconds']:.1f}s")
+
+
+def show_results(job: BackgroundParse) -> None:
+    df, index = job.snapshot()
+    show_progress(job)
+    if df.empty:
+        return
+
+    stats = job.player_stats().stats().sort_values("Hands", ascending=False)
+    st.subheader("Players")
+    st.dataframe(stats, use_container_width=True)
+
+    players = sorted(df["Player"].dropna().unique())
+    default = players.index("Hero") if "Hero" in players else 0
+    player = st.selectbox("Player", players, index=default) if players else None
+    if player is not None:
+        # List-format actions mix strings and amounts, which Arrow (and so st.dataframe) can't convert
+        rows = encode_action_columns(df.take(index.rows("Player", player)))
+        st.dataframe(rows, use_container_width=True)
+
+
+if uploaded is None:
+    # Nothing to show: stop a parse left over from a removed upload
+    if "parse_job" in st.session_state:
+        st.session_state.pop("parse_job").cancel()
+        st.session_state.pop("parse_key", None)
+else:
+    job = current_job(uploaded, normalize)
+
+    # Redraw only the results while parsing; once done, rerun the app once so they stop refreshing
+    @st.fragment(run_every=REFRESH_SECONDS if job.running else None)
+    def results(polling: bool) -> None:
+        show_results(job)
+        if polling and not job.running:
+            st.rerun()
+
+    results(job.running)
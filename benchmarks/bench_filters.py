@@ -0,0 +1,117 @@
+"""
+Benchmark of the vectorized FilterAction / FilterActionAmount against the
+previous per-row .apply implementations, which are kept here as references.
+
+    python -m benchmarks.bench_filters --rows 1000000
+"""
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from utils.actions import ACTION_COLUMNS, encode_action_columns
+from utils.filters import FilterAction, FilterActionAmount
+
+
+def legacy_filter_action(df, column, action, street=None):
+    def match(actions):
+        if not isinstance(actions, list) or not actions:
+            return False
+        if street is None:
+            return any(a[0] == action for a in actions if isinstance(a, list) and a[0] is not None)
+        elif 1 <= street <= len(actions):
+            a = actions[street - 1]
+            return isinstance(a, list) and a[0] == action
+        return False
+
+    return df[df[column].apply(match)]
+
+
+def legacy_filter_action_amount(df, column, comparison, amount, street=None):
+    def compare_value(val):
+        if not isinstance(val, list) or not val:
+            return False
+        actions = [val[street - 1]] if street is not None and 1 <= street <= len(val) else val
+
+        for action in actions:
+            if not isinstance(action, list) or len(action) < 2:
+                continue
+            action_amt = action[1]
+            if isinstance(action_amt, (int, float)):
+                if comparison == 'gte' and action_amt >= amount:
+                    return True
+                elif comparison == 'lte' and action_amt <= amount:
+                    return True
+                elif comparison == 'gt' and action_amt > amount:
+                    return True
+                elif comparison == 'lt' and action_amt < amount:
+                    return True
+                elif comparison == 'eq' and action_amt == amount:
+                    return True
+        return False
+
+    return df[df[column].apply(compare_value)]
+
+
+def random_actions(rng: random.Random):
+    if rng.random() < 0.4:
+        return [[None]]
+    actions = []
+    for _ in range(rng.choice([1, 1, 1, 2, 2, 3])):
+        name = rng.choice(["fold", "check", "call", "bet", "raise"])
+        amount = None if name in ("fold", "check") else round(rng.uniform(0.5, 30), 2)
+        actions.append([name, amount])
+    return actions
+
+
+def build_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = random.Random(seed)
+    return pd.DataFrame({col: [random_actions(rng) for _ in range(rows)] for col in ACTION_COLUMNS})
+
+
+CASES = [
+    ("FilterAction raise", lambda f, df: f[0](df, "PreflopAction", "raise")),
+    ("FilterAction call street=2", lambda f, df: f[0](df, "FlopAction", "call", 2)),
+    ("FilterActionAmount gte 2.5", lambda f, df: f[1](df, "PreflopAction", "gte", 2.5)),
+    ("FilterActionAmount lt 10 street=1", lambda f, df: f[1](df, "TurnAction", "lt", 10, 1)),
+]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def run(rows: int, seed: int = 0) -> list:
+    df = build_frame(rows, seed)
+    arrow_df = encode_action_columns(df)
+    legacy = (legacy_filter_action, legacy_filter_action_amount)
+    vectorized = (FilterAction, FilterActionAmount)
+    results = []
+    for name, case in CASES:
+        expected, legacy_time = timed(lambda: case(legacy, df))
+        # Shallow copies so the flat view is rebuilt and its cost is included
+        got, list_time = timed(lambda: case(vectorized, df.copy(deep=False)))
+        got_arrow, arrow_time = timed(lambda: case(vectorized, arrow_df.copy(deep=False)))
+        assert got.index.equals(expected.index), name
+        assert got_arrow.index.equals(expected.index), name
+        results.append({
+            "case": name,
+            "rows": rows,
+            "legacy_s": round(legacy_time, 4),
+            "list_format_s": round(list_time, 4),
+            "arrow_format_s": round(arrow_time, 4),
+            "speedup_list": round(legacy_time / list_time, 1),
+            "speedup_arrow": round(legacy_time / arrow_time, 1),
+        })
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(pd.DataFrame(run(args.rows, args.seed)).to_string(index=False))
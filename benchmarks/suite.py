@@ -0,0 +1,488 @@
+"""
+Benchmark suite for the parser and the filters, on synthetic logs
+(see benchmarks.synthetic). Results are written as JSON so runs on two
+commits can be compared.
+
+    python -m benchmarks.suite run --sizes 1000 100000 1000000 --out results.json
+    python -m benchmarks.suite compare before.json after.json
+    python -m benchmarks.suite check-startup
+
+Suites:
+- parse: parse_tour_clean hands/sec and peak traced memory. Sizes above
+  --max-in-memory are parsed with stream_tour_clean instead, since the full
+  row list would not fit in memory.
+- extract: per-call cost of every RegexExtraction.extract_* method, on the
+  first --extract-hands hands of the log.
+- filters: every function in utils/filters.py on the parsed frame. Frames
+  above --frame-hands hands are built by repeating the parsed sample with
+  new HandIDs. Per-hand groupby functions run on --group-hands hands.
+- equity: evaluate_hands on --eval-hands random 7-card hands (hands/sec),
+  and equity_columns on the parsed frame (all-in spots/sec).
+- startup: wall time of cli.py commands on the first --startup-hands hands,
+  each in a fresh interpreter. Commands that must not load pandas, numpy or
+  pyarrow (--help, validate, parse to JSON lines) are checked against
+  STARTUP_BUDGET_SECONDS over a bare interpreter start; the run exits with
+  status 1 if one is over budget or imports them.
+
+Every run first asserts that those light commands don't import pandas,
+numpy or pyarrow (see check_startup_imports), whatever suites are selected.
+check-startup runs that check and the startup budget on their own, in a few
+seconds; tests/test_cli_startup.py covers the same under pytest.
+
+Generated logs are cached in --data-dir.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import write_log
+from models.regex_extractor import RegexExtraction
+from parser.reader import iter_hand_texts, split_hand_texts
+from parser.tour import parse_tour_clean, stream_tour_clean
+from utils import filters
+from utils.equity import equity_columns
+from utils.evaluator import evaluate_hands
+from utils.hand_features import build_hand_features
+
+
+DEFAULT_SIZES = (1_000,)
+SUITES = ("parse", "extract", "filters", "equity", "startup")
+DEFAULT_SUITES = ("parse", "extract", "filters", "startup")
+MAX_IN_MEMORY_HANDS = 100_000
+EXTRACT_HANDS = 2_000
+FRAME_HANDS = 20_000
+GROUP_HANDS = 2_000
+EVAL_HANDS = 1_000_000
+STARTUP_HANDS = 20
+# Allowed startup of the light CLI commands, on top of a bare `python -c pass`
+STARTUP_BUDGET_SECONDS = 0.15
+STARTUP_REPEAT = 5
+
+
+def timed(fn: Callable, repeat: int = 1) -> float:
+    """Best wall time of repeat calls, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(fn: Callable) -> int:
+    """Peak memory traced by tracemalloc while fn runs, in bytes."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def log_path(data_dir: str, hands: int, seed: int) -> str:
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f"synthetic-{hands}-{seed}.txt")
+    if not os.path.exists(path):
+        write_log(path + ".tmp", hands, seed=seed, table_size=None)
+        os.replace(path + ".tmp", path)
+    return path
+
+
+# ----------- PARSE -----------
+def bench_parse(path: str, hands: int, max_in_memory: int, memory: bool) -> List[Dict]:
+    if hands <= max_in_memory:
+        with open(path, encoding="utf-8") as f:
+            log_text = f.read()
+        case, run = "parse_tour_clean", lambda: parse_tour_clean(log_text)
+    else:
+        case, run = "stream_tour_clean", lambda: sum(1 for _ in stream_tour_clean(path))
+
+    seconds = timed(run)
+    result = {
+        "suite": "parse",
+        "case": case,
+        "hands": hands,
+        "seconds": round(seconds, 4),
+        "hands_per_sec": round(hands / seconds, 1),
+    }
+    if memory:
+        result["peak_mb"] = round(peak_memory(run) / 2**20, 1)
+    return [result]
+
+
+# ----------- EXTRACT -----------
+HAND_EXTRACTS = {
+    "extract_blinds": lambda p: p.extract_blinds(),
+    "extract_modality": lambda p: p.extract_modality(),
+    "extract_table_size": lambda p: p.extract_table_size(),
+    "extract_buyin": lambda p: p.extract_buyin(),
+    "extract_tournament_id": lambda p: p.extract_tournament_id(),
+    "extract_hand_id": lambda p: p.extract_hand_id(),
+    "extract_local_time": lambda p: p.extract_local_time(),
+    "extract_level": lambda p: p.extract_level(),
+    "extract_ante": lambda p: p.extract_ante(),
+    "extract_players_info": lambda p: p.extract_players_info(),
+    "extract_hero_hand": lambda p: p.extract_hero_hand(),
+    "extract_board_cards": lambda p: p.extract_board_cards(),
+    "extract_balances": lambda p: p.extract_balances(),
+    "extract_investments": lambda p: p.extract_investments(),
+    "extract_rake": lambda p: p.extract_rake(),
+}
+
+PLAYER_EXTRACTS = {
+    "extract_posted_ante": lambda p, name, players: p.extract_posted_ante(name),
+    "extract_posted_blind": lambda p, name, players: p.extract_posted_blind(name),
+    "extract_street_action(HOLE CARDS)": lambda p, name, players: p.extract_street_action("HOLE CARDS", name),
+    "extract_street_action(FLOP)": lambda p, name, players: p.extract_street_action("FLOP", name),
+    "extract_street_action(RIVER)": lambda p, name, players: p.extract_street_action("RIVER", name),
+    "extract_allin(HOLE CARDS)": lambda p, name, players: p.extract_allin("HOLE CARDS", name),
+    "extract_allin(RIVER)": lambda p, name, players: p.extract_allin("RIVER", name),
+    "extract_ante_allin": lambda p, name, players: p.extract_ante_allin(name, players),
+    "extract_showdown_cards": lambda p, name, players: p.extract_showdown_cards(name),
+    "extract_result": lambda p, name, players: p.extract_result(name),
+    "extract_balance": lambda p, name, players: p.extract_balance(name),
+}
+
+
+def bench_extract(path: str, hands: int, sample: int) -> List[Dict]:
+    hand_texts = []
+    for hand_text in iter_hand_texts(path):
+        hand_texts.append(hand_text)
+        if len(hand_texts) == sample:
+            break
+
+    results = []
+
+    def add(case: str, calls: int, seconds: float) -> None:
+        results.append({
+            "suite": "extract",
+            "case": case,
+            "hands": hands,
+            "sample_hands": len(hand_texts),
+            "calls": calls,
+            "seconds": round(seconds, 4),
+            "us_per_call": round(seconds / calls * 1e6, 2) if calls else None,
+        })
+
+    parsers = []
+    add("RegexExtraction.__init__", len(hand_texts), timed(lambda: parsers.extend(RegexExtraction(t) for t in hand_texts)))
+    seated = [(p, p.extract_players_info()) for p in parsers]
+
+    for case, extract in HAND_EXTRACTS.items():
+        add(case, len(parsers), timed(lambda: [extract(p) for p in parsers], repeat=3))
+
+    calls = sum(len(players) for _, players in seated)
+    for case, extract in PLAYER_EXTRACTS.items():
+        run = lambda: [extract(p, player["Player"], players) for p, players in seated for player in players]
+        add(case, calls, timed(run))
+
+    return results
+
+
+# ----------- FILTERS -----------
+def build_frame(path: str, hands: int, sample: int) -> pd.DataFrame:
+    """Parsed frame of hands hands, repeating a parsed sample with new HandIDs if needed."""
+    hand_texts = []
+    for hand_text in iter_hand_texts(path):
+        hand_texts.append(hand_text)
+        if len(hand_texts) == min(hands, sample):
+            break
+    base = pd.DataFrame(parse_tour_clean("\n\n".join(reversed(hand_texts))))
+    if hands <= sample:
+        return base
+
+    copies = -(-hands // len(hand_texts))
+    frames = [base.assign(HandID=base["HandID"] + f"-{k}") if k else base for k in range(copies)]
+    df = pd.concat(frames, ignore_index=True)
+    return df[df["HandID"].isin(pd.unique(df["HandID"])[:hands])].reset_index(drop=True)
+
+
+FILTER_CASES = {
+    "FilterAction": lambda df: filters.FilterAction(df, "PreflopAction", "raise"),
+    "FilterActionAmount": lambda df: filters.FilterActionAmount(df, "PreflopAction", "gte", 2.5),
+    "action_mask": lambda df: filters.action_mask(df, "FlopAction", "bet"),
+    "action_amount_mask": lambda df: filters.action_amount_mask(df, "FlopAction", "lt", 10, 1),
+    "detect_check_raises": lambda df: filters.detect_check_raises(df, "Flop"),
+    "filter_postflop_players_by_position": lambda df: filters.filter_postflop_players_by_position(
+        df, ["small blind", "big blind"], 2, "Flop"),
+    "filter_all_checked_on_street": lambda df: filters.filter_all_checked_on_street(df, "Flop"),
+    "count_checks": lambda df: df["FlopAction"].apply(filters.count_checks),
+    "is_active": lambda df: df["FlopAction"].apply(filters.is_active),
+}
+
+GROUP_CASES = {
+    "identify_single_raise_pot_preflop": lambda df: df.groupby("HandID").apply(
+        filters.identify_single_raise_pot_preflop, include_groups=False),
+    "get_preflop_aggresor": lambda df: df.groupby("HandID").apply(
+        filters.get_preflop_aggresor, include_groups=False),
+    "aggressor_bet_and_call_on_streets": lambda df: df.groupby("HandID").apply(
+        filters.aggressor_bet_and_call_on_streets, ["Flop"], include_groups=False),
+}
+
+
+def bench_filters(path: str, hands: int, frame_hands: int, group_hands: int) -> List[Dict]:
+    df = build_frame(path, hands, frame_hands)
+    results = []
+    for case, run in FILTER_CASES.items():
+        # Shallow copies so cached flat views are rebuilt and their cost counted
+        seconds = timed(lambda: run(df.copy(deep=False)), repeat=3)
+        results.append({"suite": "filters", "case": case, "hands": hands, "rows": len(df), "seconds": round(seconds, 4)})
+
+    group_ids = pd.unique(df["HandID"])[:group_hands]
+    group_df = df[df["HandID"].isin(group_ids)]
+    group_df = group_df.join(build_hand_features(group_df)["PreflopAggressor"].rename("Aggressor"), on="HandID")
+    for case, run in GROUP_CASES.items():
+        seconds = timed(lambda: run(group_df))
+        results.append({
+            "suite": "filters", "case": case, "hands": hands, "sample_hands": len(group_ids),
+            "rows": len(group_df), "seconds": round(seconds, 4),
+        })
+    return results
+
+
+# ----------- EQUITY -----------
+def bench_equity(path: str, hands: int, frame_hands: int, eval_hands: int) -> List[Dict]:
+    rng = np.random.default_rng(0)
+    # Seven distinct cards per hand: the first seven of a random permutation of the deck
+    cards = np.argsort(rng.random((eval_hands, 52)), axis=1)[:, :7].astype(np.uint8)
+    seconds = timed(lambda: evaluate_hands(cards), repeat=3)
+    results = [{
+        "suite": "equity", "case": "evaluate_hands", "hands": eval_hands,
+        "seconds": round(seconds, 4), "hands_per_sec": round(eval_hands / seconds, 1),
+    }]
+
+    df = build_frame(path, hands, frame_hands)
+    spots = 0
+    def run_equity():
+        nonlocal spots
+        spots = equity_columns(df, seed=0)["AllInEquity"].notna().groupby(df["HandID"]).any().sum()
+    seconds = timed(run_equity)
+    results.append({
+        "suite": "equity", "case": "equity_columns", "hands": hands, "rows": len(df), "spots": int(spots),
+        "seconds": round(seconds, 4), "spots_per_sec": round(spots / seconds, 1),
+    })
+    return results
+
+
+# ----------- STARTUP -----------
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow")
+CLI_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cli.py")
+# Runs a CLI command and reports the heavy modules it loaded on the last line of stderr
+IMPORT_PROBE = """
+import sys
+sys.argv[0] = {cli!r}
+sys.path.insert(0, {root!r})
+import cli
+try:
+    code = cli.main(sys.argv[1:])
+finally:
+    print(",".join(m for m in {heavy!r} if m in sys.modules), file=sys.stderr)
+sys.exit(code)
+"""
+
+
+def _startup_cases(path: str) -> Dict[str, tuple]:
+    """Command-line arguments and whether the command has to start light."""
+    return {
+        "--help": (["--help"], True),
+        "validate": (["-q", "validate", path], True),
+        "parse jsonl": (["-q", "parse", path, "--out", os.devnull], True),
+        "parse csv": (["-q", "parse", path, "--out", os.devnull, "--format", "csv"], False),
+        "stats": (["-q", "stats", path], False),
+    }
+
+
+def _run_quiet(command: List[str]) -> subprocess.CompletedProcess:
+    return subprocess.run(command, capture_output=True, text=True, cwd=os.path.dirname(CLI_PATH))
+
+
+def _probe_imports(args: List[str]) -> Tuple[int, str]:
+    """Exit code of a CLI command run in a fresh interpreter, and the heavy modules it imported."""
+    probe = IMPORT_PROBE.format(cli=CLI_PATH, root=os.path.dirname(CLI_PATH), heavy=HEAVY_MODULES)
+    probed = _run_quiet([sys.executable, "-c", probe, *args])
+    lines = probed.stderr.strip().splitlines()
+    return probed.returncode, lines[-1] if lines else ""
+
+
+@contextmanager
+def _startup_sample(path: str, startup_hands: int):
+    """Temporary log of the first startup_hands hands of path."""
+    with open(path, encoding="utf-8") as f:
+        # Oldest first, so written back newest first like the original file
+        sample = split_hand_texts(f.read())[:startup_hands][::-1]
+    fd, sample_path = tempfile.mkstemp(suffix=".txt")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write("\n\n\n".join(sample) + "\n")
+    try:
+        yield sample_path
+    finally:
+        os.remove(sample_path)
+
+
+def check_startup_imports(path: str, startup_hands: int = STARTUP_HANDS) -> None:
+    """
+    Assert that the light CLI commands (--help, validate, parse to JSON lines)
+    run without importing pandas, numpy or pyarrow.
+    """
+    with _startup_sample(path, startup_hands) as sample_path:
+        for case, (args, light) in _startup_cases(sample_path).items():
+            if not light:
+                continue
+            code, heavy = _probe_imports(args)
+            # validate exits with 1 when a hand doesn't balance; anything else is a crash
+            assert code in (0, 1), f"cli.py {case} failed with exit code {code}"
+            assert not heavy, f"cli.py {case} imported {heavy}"
+
+
+def bench_startup(path: str, hands: int, startup_hands: int) -> List[Dict]:
+    with _startup_sample(path, startup_hands) as sample_path:
+        baseline = timed(lambda: _run_quiet([sys.executable, "-c", "pass"]), repeat=STARTUP_REPEAT)
+        results = []
+        for case, (args, light) in _startup_cases(sample_path).items():
+            _, heavy = _probe_imports(args)
+            seconds = timed(lambda: _run_quiet([sys.executable, CLI_PATH, *args]), repeat=STARTUP_REPEAT)
+            overhead = seconds - baseline
+            result = {
+                "suite": "startup", "case": case, "hands": hands, "seconds": round(seconds, 4),
+                "overhead_seconds": round(overhead, 4), "heavy_imports": heavy,
+            }
+            if light:
+                result["budget_seconds"] = STARTUP_BUDGET_SECONDS
+                result["ok"] = overhead <= STARTUP_BUDGET_SECONDS and not heavy
+            results.append(result)
+        return results
+
+
+# ----------- RUN / COMPARE -----------
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=os.path.dirname(__file__)
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(
+    sizes=DEFAULT_SIZES,
+    suites=DEFAULT_SUITES,
+    seed: int = 0,
+    data_dir: Optional[str] = None,
+    max_in_memory: int = MAX_IN_MEMORY_HANDS,
+    memory: bool = True,
+    extract_hands: int = EXTRACT_HANDS,
+    frame_hands: int = FRAME_HANDS,
+    group_hands: int = GROUP_HANDS,
+    eval_hands: int = EVAL_HANDS,
+    startup_hands: int = STARTUP_HANDS,
+) -> Dict:
+    data_dir = data_dir or os.path.join(tempfile.gettempdir(), "gg_bench")
+    check_startup_imports(log_path(data_dir, sizes[0], seed), startup_hands)
+    results = []
+    for hands in sizes:
+        path = log_path(data_dir, hands, seed)
+        if "parse" in suites:
+            results += bench_parse(path, hands, max_in_memory, memory)
+        if "extract" in suites:
+            results += bench_extract(path, hands, extract_hands)
+        if "filters" in suites:
+            results += bench_filters(path, hands, frame_hands, group_hands)
+        if "equity" in suites:
+            results += bench_equity(path, hands, frame_hands, eval_hands)
+        if "startup" in suites:
+            results += bench_startup(path, hands, startup_hands)
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(before: Dict, after: Dict) -> pd.DataFrame:
+    """
+    Join two runs on (suite, case, hands). ratio > 1 means after is slower.
+    """
+    keys = ["suite", "case", "hands"]
+    old = pd.DataFrame(before["results"])[keys + ["seconds"]]
+    new = pd.DataFrame(after["results"])[keys + ["seconds"]]
+    merged = old.merge(new, on=keys, suffixes=("_before", "_after"))
+    merged["ratio"] = (merged["seconds_after"] / merged["seconds_before"]).round(2)
+    return merged
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    run_parser.add_argument("--suites", nargs="+", default=list(DEFAULT_SUITES), choices=SUITES)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--data-dir", default=None)
+    run_parser.add_argument("--max-in-memory", type=int, default=MAX_IN_MEMORY_HANDS)
+    run_parser.add_argument("--extract-hands", type=int, default=EXTRACT_HANDS)
+    run_parser.add_argument("--frame-hands", type=int, default=FRAME_HANDS)
+    run_parser.add_argument("--group-hands", type=int, default=GROUP_HANDS)
+    run_parser.add_argument("--eval-hands", type=int, default=EVAL_HANDS)
+    run_parser.add_argument("--startup-hands", type=int, default=STARTUP_HANDS)
+    run_parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    run_parser.add_argument("--out", default=None, help="JSON file (default: bench-<commit>.json)")
+
+    compare_parser = commands.add_parser("compare")
+    compare_parser.add_argument("before")
+    compare_parser.add_argument("after")
+
+    check_parser = commands.add_parser("check-startup")
+    check_parser.add_argument("--data-dir", default=None)
+
+    args = parser.parse_args()
+    if args.command == "run":
+        report = run(
+            args.sizes, args.suites, args.seed, args.data_dir, args.max_in_memory, not args.no_memory,
+            args.extract_hands, args.frame_hands, args.group_hands, args.eval_hands, args.startup_hands
+        )
+        out = args.out or f"bench-{report['meta']['commit'] or 'local'}.json"
+        with open(out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(pd.DataFrame(report["results"]).to_string(index=False))
+        print(f"\nSaved to {out}")
+        over_budget = [r["case"] for r in report["results"] if r.get("ok") is False]
+        if over_budget:
+            print(f"Startup over budget or importing {', '.join(HEAVY_MODULES)}: {over_budget}")
+            sys.exit(1)
+    elif args.command == "check-startup":
+        path = log_path(args.data_dir or os.path.join(tempfile.gettempdir(), "gg_bench"), DEFAULT_SIZES[0], 0)
+        check_startup_imports(path)
+        over_budget = [r["case"] for r in bench_startup(path, DEFAULT_SIZES[0], STARTUP_HANDS) if r.get("ok") is False]
+        if over_budget:
+            print(f"Startup over {STARTUP_BUDGET_SECONDS}s: {over_budget}")
+            sys.exit(1)
+        print(f"Light commands start without {', '.join(HEAVY_MODULES)}, within {STARTUP_BUDGET_SECONDS}s")
+    else:
+        with open(args.before) as f:
+            before = json.load(f)
+        with open(args.after) as f:
+            after = json.load(f)
+        print(compare(before, after).to_string(index=False))
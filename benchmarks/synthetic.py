@@ -0,0 +1,327 @@
+"""
+Synthetic GG tournament hand histories, in the format RegexExtraction parses.
+
+Hands are played out with a simple random betting model, so logs cover
+heads-up to full-ring tables, hands ending on every street, all-ins (antes
+included), uncalled bets, side pots and split pots. odd_names=True mixes in
+screen names with regex metacharacters. Output is deterministic for a seed.
+
+    python -m benchmarks.synthetic --hands 100000 --out history.txt
+"""
+import argparse
+import random
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional
+
+
+RANKS = "23456789TJQKA"
+SUITS = "cdhs"
+DECK = [r + s for r in RANKS for s in SUITS]
+
+TABLE_SIZES = (2, 6, 8, 9)
+HANDS_PER_TOURNAMENT = 200
+
+ODD_NAMES = ["a.b", "x+y", "Mr(Pot)", "[z]", "c$h", "q?q", "st*r", "back\\slash", "pipe|x", "^caret"]
+
+
+def _fmt(amount: int) -> str:
+    return f"{amount:,}"
+
+
+def _random_name(rng: random.Random, odd_names: bool) -> str:
+    if odd_names and rng.random() < 0.3:
+        return rng.choice(ODD_NAMES) + str(rng.randint(0, 99))
+    return "".join(rng.choice("0123456789abcdef") for _ in range(8))
+
+
+class _Table:
+    def __init__(self, rng: random.Random, names: List[str], stacks: List[int], button: int):
+        self.rng = rng
+        self.names = names
+        self.stacks = stacks[:]
+        self.start = stacks[:]
+        self.n = len(names)
+        self.button = button
+        self.folded = [False] * self.n
+        self.allin = [False] * self.n
+        self.total = [0] * self.n
+        self.lines: List[str] = []
+        self.street = "before Flop"
+        self.fold_street = [""] * self.n
+
+    def order_from(self, first: int) -> List[int]:
+        return [(first + i) % self.n for i in range(self.n)]
+
+    def put(self, i: int, amount: int) -> int:
+        amount = min(amount, self.stacks[i])
+        self.stacks[i] -= amount
+        self.total[i] += amount
+        if self.stacks[i] == 0:
+            self.allin[i] = True
+        return amount
+
+    def live(self) -> List[int]:
+        return [i for i in range(self.n) if not self.folded[i]]
+
+    def can_act(self) -> List[int]:
+        return [i for i in range(self.n) if not self.folded[i] and not self.allin[i]]
+
+    def betting_round(self, order: List[int], committed: List[int], bet: int, bb: int, aggression: float) -> None:
+        last_raise = bb
+        acted = set()
+        queue = [i for i in order if not self.folded[i] and not self.allin[i]]
+        while queue:
+            i = queue.pop(0)
+            if self.folded[i] or self.allin[i]:
+                continue
+            if len(self.live()) == 1:
+                return
+            to_call = bet - committed[i]
+            others_can_act = any(j != i for j in self.can_act())
+            r = self.rng.random()
+            name = self.names[i]
+            if to_call > 0:
+                if r < 0.35:
+                    self.folded[i] = True
+                    self.fold_street[i] = self.street
+                    self.lines.append(f"{name}: folds")
+                elif r < 0.35 + aggression and others_can_act:
+                    target = bet + max(last_raise, bet) * self.rng.choice([1, 1, 2])
+                    add = self.put(i, target - committed[i])
+                    committed[i] += add
+                    suffix = " and is all-in" if self.allin[i] else ""
+                    if committed[i] > bet:
+                        last_raise = max(last_raise, committed[i] - bet)
+                        self.lines.append(f"{name}: raises {_fmt(committed[i] - bet)} to {_fmt(committed[i])}{suffix}")
+                        bet = committed[i]
+                        acted = {i}
+                        queue = [j for j in self.order_from(i + 1) if j != i and not self.folded[j] and not self.allin[j]]
+                        continue
+                    self.lines.append(f"{name}: calls {_fmt(add)}{suffix}")
+                else:
+                    add = self.put(i, to_call)
+                    committed[i] += add
+                    suffix = " and is all-in" if self.allin[i] else ""
+                    self.lines.append(f"{name}: calls {_fmt(add)}{suffix}")
+            else:
+                if r < aggression and others_can_act:
+                    size = max(bb, int(sum(self.total) * self.rng.choice([0.33, 0.5, 0.75, 1.0])) // 10 * 10)
+                    add = self.put(i, size)
+                    committed[i] += add
+                    suffix = " and is all-in" if self.allin[i] else ""
+                    if bet == 0:
+                        self.lines.append(f"{name}: bets {_fmt(add)}{suffix}")
+                    else:
+                        self.lines.append(f"{name}: raises {_fmt(committed[i] - bet)} to {_fmt(committed[i])}{suffix}")
+                    last_raise = max(last_raise, committed[i] - bet)
+                    bet = committed[i]
+                    acted = {i}
+                    queue = [j for j in self.order_from(i + 1) if j != i and not self.folded[j] and not self.allin[j]]
+                    continue
+                self.lines.append(f"{name}: checks")
+            acted.add(i)
+
+        self.return_uncalled(committed)
+
+    def return_uncalled(self, committed: List[int]) -> None:
+        ranked = sorted(range(self.n), key=lambda j: committed[j], reverse=True)
+        top, second = ranked[0], ranked[1] if self.n > 1 else None
+        excess = committed[top] - (committed[second] if second is not None else 0)
+        if excess > 0:
+            committed[top] -= excess
+            self.total[top] -= excess
+            self.stacks[top] += excess
+            if self.stacks[top] > 0:
+                self.allin[top] = False
+            self.lines.append(f"Uncalled bet ({_fmt(excess)}) returned to {self.names[top]}")
+
+
+def generate_hand(
+    rng: random.Random,
+    hand_id: int,
+    tourn_id: int,
+    when: datetime,
+    table_size: int = 6,
+    players: Optional[int] = None,
+    odd_names: bool = False,
+    hero: bool = True,
+) -> str:
+    n = players or rng.randint(2, table_size)
+    names: List[str] = []
+    while len(names) < n:
+        name = _random_name(rng, odd_names)
+        if name not in names:
+            names.append(name)
+    if hero:
+        names[rng.randrange(n)] = "Hero"
+    level = rng.randint(1, 12)
+    bb = 100 * level
+    sb = bb // 2
+    ante = bb // 10
+    stacks = [rng.choice([rng.randint(1, 8), rng.randint(8, 60), rng.randint(60, 150)]) * bb // 10 * 10 for _ in range(n)]
+    stacks = [max(s, ante) for s in stacks]
+    button = rng.randrange(n)
+    table = _Table(rng, names, stacks, button)
+
+    deck = DECK[:]
+    rng.shuffle(deck)
+    holes = [[deck.pop(), deck.pop()] for _ in range(n)]
+    board = [deck.pop() for _ in range(5)]
+
+    sb_i = button if n == 2 else (button + 1) % n
+    bb_i = (sb_i + 1) % n
+    first_pre = sb_i if n == 2 else (bb_i + 1) % n
+
+    lines = [
+        f"Poker Hand #tour_{hand_id}: Tournament #{tourn_id}, Daily Hyper (5+4+1) Hold'em No Limit - "
+        f"Level{level}({_fmt(sb)}/{_fmt(bb)}) - {when.strftime('%Y/%m/%d %H:%M:%S')}",
+        f"Table '' {table_size}-max Seat #{button + 1} is the button",
+    ]
+    for i in range(n):
+        lines.append(f"Seat {i + 1}: {names[i]} ({_fmt(stacks[i])} in chips)")
+
+    committed = [0] * n
+    for i in table.order_from(sb_i):
+        paid = table.put(i, ante)
+        suffix = " and is all-in" if table.allin[i] else ""
+        lines.append(f"{names[i]}: posts the ante {_fmt(paid)}{suffix}")
+    table.total = [0] * n
+    antes = [min(ante, s) for s in stacks]
+    for i, blind, label in ((sb_i, sb, "small"), (bb_i, bb, "big")):
+        if table.allin[i]:
+            continue
+        paid = table.put(i, blind)
+        committed[i] = paid
+        lines.append(f"{names[i]}: posts {label} blind {_fmt(paid)}")
+
+    lines.append("*** HOLE CARDS ***")
+    for i in range(n):
+        lines.append(f"Dealt to {names[i]} [{' '.join(holes[i])}]" if names[i] == "Hero" else f"Dealt to {names[i]} ")
+
+    table.lines = lines
+    table.betting_round(table.order_from(first_pre), committed, max(committed), bb, 0.2)
+
+    streets = [("FLOP", 3), ("TURN", 4), ("RIVER", 5)]
+    first_post = sb_i if n > 2 else bb_i
+    reached = "Pre Flop"
+    for street, count in streets:
+        if len(table.live()) < 2:
+            break
+        shown = board[:count]
+        if street == "FLOP":
+            lines.append(f"*** FLOP *** [{' '.join(shown)}]")
+        else:
+            lines.append(f"*** {street} *** [{' '.join(shown[:-1])}] [{shown[-1]}]")
+        reached = street
+        table.street = f"on the {street.capitalize()}"
+        if len(table.can_act()) >= 2:
+            table.betting_round(table.order_from(first_post), [0] * n, 0, bb, 0.3)
+
+    live = table.live()
+    contributions = [table.total[i] + antes[i] for i in range(n)]
+    lines.append("*** SHOWDOWN ***")
+    winnings = [0] * n
+    if len(live) == 1:
+        winnings[live[0]] = sum(contributions)
+    else:
+        for i in live:
+            lines.append(f"{names[i]}: shows [{' '.join(holes[i])}]")
+        levels = sorted({contributions[i] for i in live})
+        strength = {i: rng.random() for i in live}
+        if rng.random() < 0.1:
+            tied = rng.sample(live, 2)
+            strength[tied[1]] = strength[tied[0]] = 2.0
+        prev = 0
+        for lvl in levels:
+            pot = sum(min(c, lvl) - min(c, prev) for c in contributions)
+            eligible = [i for i in live if contributions[i] >= lvl]
+            best = max(strength[i] for i in eligible)
+            winners = [i for i in eligible if strength[i] == best]
+            share = pot // len(winners)
+            for k, w in enumerate(winners):
+                winnings[w] += share + (pot - share * len(winners) if k == 0 else 0)
+            prev = lvl
+    for i in range(n):
+        if winnings[i]:
+            lines.append(f"{names[i]} collected {_fmt(winnings[i])} from pot")
+
+    lines.append("*** SUMMARY ***")
+    lines.append(f"Total pot {_fmt(sum(contributions))} | Rake 0 | Jackpot 0 | Bingo 0 | Fortune 0 | Tax 0")
+    shown_board = {"Pre Flop": 0, "FLOP": 3, "TURN": 4, "RIVER": 5}[reached]
+    if shown_board:
+        lines.append(f"Board [{' '.join(board[:shown_board])}]")
+    for i in range(n):
+        role = " (button)" if i == button else " (small blind)" if i == sb_i else " (big blind)" if i == bb_i else ""
+        if winnings[i]:
+            lines.append(f"Seat {i + 1}: {names[i]}{role} collected ({_fmt(winnings[i])})")
+        elif table.folded[i]:
+            lines.append(f"Seat {i + 1}: {names[i]}{role} folded {table.fold_street[i]}")
+        else:
+            lines.append(f"Seat {i + 1}: {names[i]}{role} showed [{' '.join(holes[i])}] and lost")
+    return "\n".join(lines)
+
+
+def generate_log(
+    hands: int,
+    seed: int = 0,
+    table_size: Optional[int] = 6,
+    odd_names: bool = False,
+) -> str:
+    """
+    A whole log as one string. table_size=None picks a size from TABLE_SIZES
+    for every tournament.
+    """
+    return "\n\n".join(iter_hands(hands, seed=seed, table_size=table_size, odd_names=odd_names))
+
+
+def iter_hands(hands: int, seed: int = 0, table_size: Optional[int] = 6, odd_names: bool = False) -> Iterator[str]:
+    """
+    Yield hand texts newest first, like GG exports them. Every
+    HANDS_PER_TOURNAMENT hands share a tournament ID.
+    """
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1, 12, 0, 0)
+    sizes = {}
+    for k in range(hands):
+        idx = hands - 1 - k
+        tourn_id = 500 + idx // HANDS_PER_TOURNAMENT
+        if table_size is None and tourn_id not in sizes:
+            sizes[tourn_id] = rng.choice(TABLE_SIZES)
+        yield generate_hand(
+            rng,
+            hand_id=1_000_000 + idx,
+            tourn_id=tourn_id,
+            when=start + timedelta(seconds=40 * idx),
+            table_size=table_size or sizes[tourn_id],
+            odd_names=odd_names,
+        )
+
+
+def write_log(
+    path: str,
+    hands: int,
+    seed: int = 0,
+    table_size: Optional[int] = 6,
+    odd_names: bool = False,
+) -> str:
+    """
+    Write a log to path hand by hand, so large logs never sit in memory.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        for k, hand in enumerate(iter_hands(hands, seed=seed, table_size=table_size, odd_names=odd_names)):
+            if k:
+                f.write("\n\n")
+            f.write(hand)
+        f.write("\n")
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hands", type=int, default=1_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--table-size", type=int, default=None, help="fixed table size (default: varies per tournament)")
+    parser.add_argument("--odd-names", action="store_true")
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args()
+    write_log(args.out, args.hands, seed=args.seed, table_size=args.table_size, odd_names=args.odd_names)
@@ -0,0 +1,223 @@
+"""
+Command-line entry point for batch jobs, e.g. cron runs over thousands of
+small hand-history files:
+
+    python cli.py parse history/*.txt --out rows.jsonl
+    python cli.py ingest ~/gg_store history/*.txt
+    python cli.py stats history/*.txt --by Player Position
+    python cli.py validate history/*.txt
+
+Only the standard library and the row parser are imported up front;
+pandas, numpy and pyarrow are imported by the commands that need them
+(parse to CSV/Parquet, ingest, stats), so parse to JSON lines and validate
+start in a few tens of milliseconds. tests/test_cli_startup.py and
+`python -m benchmarks.suite check-startup` assert they stay free of those
+imports and within a time budget.
+"""
+import argparse
+import json
+import os
+import sys
+from typing import Callable, Dict, Optional, Sequence
+
+from models.regex_extractor import RegexExtraction
+from parser.reader import iter_hand_texts
+from parser.hands import check_columns
+from parser.tour import TOUR_FIELDS, stream_tour_clean, stream_tour_frames
+
+
+PROG = "gg-analytics"
+OUTPUT_FORMATS = ("jsonl", "csv", "parquet")
+STATS_FORMATS = ("table", "csv", "json")
+
+
+# ----------- PARSE -----------
+def _output_format(args: argparse.Namespace) -> str:
+    if args.format:
+        return args.format
+    extension = os.path.splitext(args.out)[1].lstrip(".").lower()
+    return extension if extension in OUTPUT_FORMATS else "jsonl"
+
+
+def cmd_parse(args: argparse.Namespace) -> int:
+    """Parse files into one output: JSON lines (streamed), CSV or Parquet."""
+    output_format = _output_format(args)
+    options = {"normalize": not args.chips, "workers": args.workers, "columns": args.columns, "players": args.players}
+
+    if output_format == "jsonl":
+        out = sys.stdout if args.out == "-" else open(args.out, "w")
+        try:
+            rows = 0
+            for path in args.files:
+                for row in stream_tour_clean(path, **options):
+                    out.write(json.dumps(row, default=str) + "\n")
+                    rows += 1
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        _report(args, f"Wrote {rows:,} rows from {len(args.files):,} files")
+        return 0
+
+    if output_format == "parquet" and args.out == "-":
+        print("Error: Parquet output needs --out", file=sys.stderr)
+        return 2
+
+    import pandas as pd
+
+    action_format = "arrow" if output_format == "parquet" else "list"
+    frames = [frame for path in args.files for frame in stream_tour_frames(path, action_format=action_format, **options)]
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    if output_format == "csv":
+        df.to_csv(sys.stdout if args.out == "-" else args.out, index=False)
+    else:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # Without the pandas metadata, which can't describe the Arrow action columns (as in HandStore)
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False).replace_schema_metadata(), args.out)
+    _report(args, f"Wrote {len(df):,} rows from {len(args.files):,} files")
+    return 0
+
+
+# ----------- INGEST -----------
+def cmd_ingest(args: argparse.Namespace) -> int:
+    """Add the hands of every file to a HandStore; stored hands are skipped."""
+    from store.hand_store import HandStore
+
+    store = HandStore(args.store)
+    new_hands = store.ingest_files(args.files, normalize=not args.chips, validate=not args.no_validate)
+    _report(args, f"Ingested {new_hands:,} new hands into {store.root}")
+    return 0
+
+
+# ----------- STATS -----------
+def cmd_stats(args: argparse.Namespace) -> int:
+    """Player stats (VPIP, PFR, 3Bet, AF, WTSD) over every file."""
+    from utils.player_stats import PlayerStats
+
+    stats = PlayerStats()
+    for path in args.files:
+        for frame in stream_tour_frames(path, normalize=not args.chips, workers=args.workers):
+            stats.add(frame)
+
+    table = stats.stats(by=args.by).sort_values("Hands", ascending=False)
+    table = table[table["Hands"] >= args.min_hands]
+    if args.players and "Player" in args.by:
+        table = table[table.index.get_level_values("Player").isin(args.players)]
+
+    if args.format == "csv":
+        table.to_csv(sys.stdout)
+    elif args.format == "json":
+        print(table.reset_index().to_json(orient="records"))
+    else:
+        print(table.to_string())
+    return 0
+
+
+# ----------- VALIDATE -----------
+def cmd_validate(args: argparse.Namespace) -> int:
+    """
+    Check that chips are conserved in every hand (see utils.validation) and
+    that every hand parses. Failing hands are reported on stderr with the
+    summary; exits with 1 if any hand fails.
+    """
+    from utils.validation import hand_balance_error
+
+    hands = failed = 0
+    for path in args.files:
+        for hand_text in iter_hand_texts(path):
+            hands += 1
+            try:
+                parser = RegexExtraction(hand_text, normalize=False)
+                residual = hand_balance_error(parser, tolerance=args.tolerance)
+            except Exception as e:
+                failed += 1
+                print(f"{path}: Error parsing hand: {e}", file=sys.stderr)
+                continue
+            if residual is not None:
+                failed += 1
+                print(f"{path}: hand {parser.extract_hand_id()} doesn't balance (residual {residual})", file=sys.stderr)
+
+    _report(args, f"Checked {hands:,} hands in {len(args.files):,} files, {failed:,} failed")
+    return 1 if failed else 0
+
+
+# ----------- ENTRY POINT -----------
+def _report(args: argparse.Namespace, message: str) -> None:
+    # Summaries go to stderr, so stdout only carries the data
+    if not args.quiet:
+        print(message, file=sys.stderr)
+
+
+COMMANDS: Dict[str, Callable[[argparse.Namespace], int]] = {
+    "parse": cmd_parse,
+    "ingest": cmd_ingest,
+    "stats": cmd_stats,
+    "validate": cmd_validate,
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog=PROG, description="Batch tools for GG tournament hand histories.")
+    parser.add_argument("-q", "--quiet", action="store_true", help="no summary on stderr")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    parse_parser = commands.add_parser("parse", help="parse files to JSON lines, CSV or Parquet")
+    parse_parser.add_argument("files", nargs="+")
+    parse_parser.add_argument("--out", default="-", help="output file (default: stdout)")
+    parse_parser.add_argument("--format", choices=OUTPUT_FORMATS, default=None,
+                              help="default: from the --out extension, else jsonl")
+    parse_parser.add_argument("--columns", nargs="+", default=None)
+    parse_parser.add_argument("--players", nargs="+", default=None)
+
+    ingest_parser = commands.add_parser("ingest", help="add files to a Parquet hand store")
+    ingest_parser.add_argument("store")
+    ingest_parser.add_argument("files", nargs="+")
+    ingest_parser.add_argument("--no-validate", action="store_true", help="also store hands that don't balance")
+
+    stats_parser = commands.add_parser("stats", help="player stats over files")
+    stats_parser.add_argument("files", nargs="+")
+    stats_parser.add_argument("--by", nargs="+", default=["Player"], choices=["Player", "Position"])
+    stats_parser.add_argument("--players", nargs="+", default=None)
+    stats_parser.add_argument("--min-hands", type=int, default=1)
+    stats_parser.add_argument("--format", choices=STATS_FORMATS, default="table")
+
+    validate_parser = commands.add_parser("validate", help="check that every hand parses and balances")
+    validate_parser.add_argument("files", nargs="+")
+    validate_parser.add_argument("--tolerance", type=float, default=None,
+                                 help="allowed residual per hand, in chips (default: rounding per player)")
+
+    for command_parser in (parse_parser, ingest_parser, stats_parser):
+        command_parser.add_argument("--chips", action="store_true", help="amounts in chips instead of big blinds")
+    for command_parser in (parse_parser, stats_parser):
+        command_parser.add_argument("--workers", type=int, default=None)
+    return parser
+
+
+def check_options(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    """Reject bad option values as usage errors (exit 2) before any output is written."""
+    if args.command == "parse":
+        try:
+            check_columns(TOUR_FIELDS, args.columns)
+        except ValueError as e:
+            parser.error(str(e))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    check_options(parser, args)
+    missing = [path for path in getattr(args, "files", []) if not os.path.isfile(path)]
+    if missing:
+        print(f"Error: no such file: {', '.join(missing)}", file=sys.stderr)
+        return 2
+    try:
+        return COMMANDS[args.command](args)
+    except BrokenPipeError:
+        # Output piped into e.g. head: stop quietly
+        sys.stdout = open(os.devnull, "w")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,42 @@
-
-import pandas as pd
-import numpy as np
-import uuid
-import re
-from typing import List, Dict, Optional, Tuple, Literal
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
-import re
-
+from models import regex_patterns as patterns
+
+
+SEATS_SECTION = "SEATS"
+STREET_SECTIONS = {
+    "preflop": "HOLE CARDS",
+    "flop": "FLOP",
+    "turn": "TURN",
+    "river": "RIVER"
+}
+# The actions kept in the action log (see extract_action_log)
+BETTING_ACTIONS = ("fold", "check", "call", "bet", "raise")
+
+
+def detect_game_type(header: str) -> Optional[str]:
+    """
+    Tell tournament and cash hands apart from the first line of the hand:
+    "tour", "cash", or None if the header is not recognised.
+    """
+    if header.startswith(patterns.TOUR_HEADER):
+        return "tour"
+    if patterns.CASH_BLINDS.search(header):
+        return "cash"
+    if patterns.TOURNAMENT_ID.search(header):
+        return "tour"
+    return None
+
+
+def _search_amount(pattern, content: str) -> Optional[float]:
+    """First group of pattern in content as an amount; None if missing or malformed."""
+    match = pattern.search(content)
+    if match is None:
+        return None
+    try:
+        return float(match.group(1).replace(",", ""))
+    except ValueError:
+        return None
 
 
 class RegexExtraction:
@@ -15,6 +45,116 @@ class RegexExtraction:
         self.header = hand_text.splitlines()[0]
         self.normalize = normalize
         self._blinds = self.extract_blinds()
+        self._build_index()
+
+    @classmethod
+    def from_buffer(cls, buffer, normalize: bool = True) -> "RegexExtraction":
+        """
+        Extractor of a hand given as raw UTF-8 bytes, e.g. a memoryview slice
+        of a memory-mapped file (see parser.offsets): only that slice is decoded.
+        """
+        return cls(str(buffer, "utf-8-sig", errors="replace").strip(), normalize=normalize)
+
+
+    # ----------- SECTION INDEX -----------
+    def _build_index(self) -> None:
+        """
+        Tokenize the hand once into sections (header, seats, HOLE CARDS, FLOP, TURN,
+        RIVER, SHOWDOWN, SUMMARY) and index every "player: action" line by player,
+        so the extract_* methods never have to rescan the full hand text.
+        """
+        self._sections: Dict[str, List[str]] = {SEATS_SECTION: []}
+        self._markers: Dict[str, str] = {}
+        self._player_lines: Dict[str, Dict[str, List[str]]] = {SEATS_SECTION: {}}
+        self._collected: Dict[str, Dict[str, List[float]]] = {}
+        self._uncalled: Dict[str, List[float]] = {}
+        self._seats: List[Tuple[int, str, float]] = []
+        self._table_name = None
+        self._table_size = None
+        self._button_seat = None
+        self._ante = None
+        self._hero_hand: List[str] = []
+        self._balances: Optional[Dict[str, float]] = None
+        self._investments: Optional[Dict[str, float]] = None
+
+        lines = self.hand_text.splitlines()[1:]
+        section = SEATS_SECTION
+        current_lines = self._sections[section]
+        current_players = self._player_lines[section]
+
+        for line in lines:
+            if line.startswith("***"):
+                marker = patterns.SECTION_MARKER.match(line)
+                if marker:
+                    section = marker.group(1)
+                    if section in self._sections:
+                        # A repeated marker keeps the first section, like re.search did
+                        section = f"{section}#{len(self._sections)}"
+                    self._markers[section] = marker.group(2)
+                    current_lines = self._sections[section] = []
+                    current_players = self._player_lines[section] = {}
+                    continue
+
+            current_lines.append(line)
+
+            head, sep, rest = line.partition(":")
+            if sep:
+                current_players.setdefault(head, []).append(rest)
+
+            if section == SEATS_SECTION:
+                if line.startswith("Seat "):
+                    seat_match = patterns.SEAT.search(line)
+                    if seat_match:
+                        seat, name, stack = seat_match.groups()
+                        self._seats.append((int(seat), name, float(stack.replace(",", ""))))
+                elif line.startswith("Table ") and self._table_size is None:
+                    table_match = patterns.TABLE.search(line)
+                    if table_match:
+                        self._table_name = table_match.group(1)
+                        self._table_size = table_match.group(2).strip()
+                        self._button_seat = int(table_match.group(3))
+                if self._ante is None and "posts the ante" in line:
+                    ante_match = patterns.ANTE.search(line)
+                    if ante_match:
+                        self._ante = float(ante_match.group(1).replace(",", ""))
+            elif line.startswith("Dealt to Hero [") and not self._hero_hand:
+                self._hero_hand = line[len("Dealt to Hero ["):].split("]")[0].split()
+
+            if " collected " in line:
+                collected_match = patterns.COLLECTED.match(line)
+                if collected_match:
+                    name, amount = collected_match.groups()
+                    self._collected.setdefault(section, {}).setdefault(name, []).append(float(amount.replace(",", "")))
+            elif line.startswith("Uncalled bet ("):
+                uncalled_match = patterns.UNCALLED.match(line)
+                if uncalled_match:
+                    amount, name = uncalled_match.groups()
+                    self._uncalled.setdefault(name.strip(), []).append(float(amount.replace(",", "")))
+
+        self._showdown_text = "\n".join(self._sections.get("SHOWDOWN", []))
+        uncalled_at = self.hand_text.rfind("Uncalled bet")
+        self._after_uncalled = self.hand_text[uncalled_at + len("Uncalled bet"):] if uncalled_at != -1 else None
+
+        self._folded: Dict[str, str] = {}
+        for line in self._sections.get("SUMMARY", []):
+            fold_match = patterns.SUMMARY_FOLD.match(line)
+            if fold_match:
+                self._folded.setdefault(fold_match.group(1), fold_match.group(2))
+
+    def _lines_for(self, section: str, player: str) -> Optional[List[str]]:
+        """
+        Return the text after "player:" for every line of the player in a section,
+        or None if the section does not exist in this hand.
+        """
+        by_player = self._player_lines.get(section)
+        if by_player is None:
+            return None
+        if ":" not in player:
+            return by_player.get(player, [])
+        # Names with a colon were split at the wrong place while indexing
+        pattern = patterns.player_pattern(r'{player}:(.*)', player)
+        matches = (pattern.match(line) for line in self._sections[section])
+        return [match.group(1) for match in matches if match]
 
 
     # ----------- CALCS -----------
@@ -26,7 +166,7 @@ class RegexExtraction:
 
     def extract_blinds(self) -> List[float]:
         # Tournament style (e.g. (150/300))
-        match = re.search(r'\(([\d,]+)/([\d,]+)\)', self.header)
+        match = patterns.TOUR_BLINDS.search(self.header)
         if match:
             return [
                 float(match.group(1).replace(",", "")),
@@ -34,7 +174,7 @@ class RegexExtraction:
             ]
 
         # Cash game style (e.g. ($2/$4))
-        match_cash = re.search(r'\(\$([\d,.]+)\/\$([\d,.]+)\)', self.header)
+        match_cash = patterns.CASH_BLINDS.search(self.header)
         if match_cash:
             return [
                 float(match_cash.group(1).replace(",", "")),
@@ -48,67 +188,65 @@ class RegexExtraction:
 
     # ----------- HEADER / GENERAL INFO -----------
     def extract_modality(self) -> str:
-        match = re.search(r'Tournament #\d+, (.+?) - Level', self.header)
+        match = patterns.MODALITY.search(self.header)
         return match.group(1).strip() if match else None
 
+    def extract_table_name(self) -> str:
+        return self._table_name
+
     def extract_table_size(self) -> str:
-        match = re.search(r'Table \'\' (.+?) Seat #\d+ is the button', self.hand_text)
-        return match.group(1).strip() if match else None
+        return self._table_size
 
     def extract_buyin(self) -> List[int]:
-        match = re.search(r'\((\d+)\+(\d+)\+\d+\)', self.header)
+        match = patterns.BUYIN.search(self.header)
         return [int(match.group(1)), int(match.group(2))] if match else [None, None]
 
     def extract_tournament_id(self) -> str:
-        match = re.search(r'Tournament (#\d+)', self.header)
+        match = patterns.TOURNAMENT_ID.search(self.header)
         return match.group(1) if match else None
 
     def extract_hand_id(self) -> str:
-        match = re.search(r'Poker Hand #tour_(\d+)', self.header)
+        match = patterns.HAND_ID.search(self.header)
         return match.group(1) if match else None
 
     def extract_local_time(self) -> Optional[datetime]:
-        match = re.search(r' - (\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2})', self.header)
+        match = patterns.LOCAL_TIME.search(self.header)
         return datetime.strptime(match.group(1), '%Y/%m/%d %H:%M:%S') if match else None
 
     def extract_level(self) -> str:
-        match = re.search(r'-( Level\d+)', self.header)
+        match = patterns.LEVEL.search(self.header)
         return match.group(1) if match else None
 
     def extract_ante(self) -> float:
-        match = re.search(r'posts the ante (\d{1,3}(?:,\d{3})*)', self.hand_text)
-        return float(match.group(1).replace(",", "")) if match else None
-
-    def extract_blinds(self) -> List[float]:
-        match = re.search(r'\(([\d,]+)/([\d,]+)\)', self.header)
-        if match:
-            return [float(match.group(1).replace(",", "")), float(match.group(2).replace(",", ""))]
-        return [None, None]
+        return self._ante
 
     # ----------- SEATING AND PLAYER INFO -----------
     def extract_players_info(self) -> List[Dict]:
         players = []
-        for seat_match in re.finditer(r'Seat (\d+): ([\w\d]+) \(([\d,]+) in chips\)', self.hand_text):
-            seat, name, stack = seat_match.groups()
-            stack_val = float(stack.replace(",", ""))
+        for seat, name, stack_val in self._seats:
             players.append({
-                "Seat": int(seat),
+                "Seat": seat,
                 "Player": name,
                 "Stack": self.normalize_amount(stack_val),
             })
         return players
 
     def extract_hero_hand(self) -> List[str]:
-        match = re.search(r'Dealt to Hero \[(.*?)\]', self.hand_text)
-        return match.group(1).split() if match else []
+        return list(self._hero_hand)
 
     def extract_posted_ante(self, player: str) -> float:
-        match = re.search(rf'{player}:\s+posts the ante ([\d,]+)', self.hand_text)
-        return float(match.group(1).replace(",", "")) if match else 0.0
+        for content in self._lines_for(SEATS_SECTION, player):
+            match = patterns.POSTED_ANTE.match(content)
+            if match:
+                return float(match.group(1).replace(",", ""))
+        return 0.0
 
     def extract_posted_blind(self, player: str) -> float:
-        match = re.search(rf'{player}:\s+posts (small|big) blind ([\d,]+)', self.hand_text)
-        return float(match.group(2).replace(",", "")) if match else 0.0
+        for content in self._lines_for(SEATS_SECTION, player):
+            match = patterns.POSTED_BLIND.match(content)
+            if match:
+                return float(match.group(2).replace(",", ""))
+        return 0.0
 
     # ----------- POSITION -----------
     @staticmethod
@@ -134,7 +272,11 @@ class RegexExtraction:
 
     def assign_positions(self, players: List[Dict]) -> Dict[str, str]:
         # Extract player order from ante posting
-        ante_order = re.findall(r'(\w+): posts the ante', self.hand_text)
+        ante_order = [
+            line.split(": posts the ante")[0]
+            for line in self._sections[SEATS_SECTION]
+            if ": posts the ante" in line
+        ]
         position_labels = self.get_positions_order(len(ante_order))
 
         return {player: pos for player, pos in zip(ante_order, position_labels)}
@@ -161,68 +303,113 @@ class RegexExtraction:
 
     # ----------- ACTIONS & ALL-INS -----------
     def extract_street_action(self, street: str, player: str) -> List[List[str]]:
-        street_map = {
-            "preflop": "HOLE CARDS",
-            "flop": "FLOP",
-            "turn": "TURN",
-            "river": "RIVER"
-        }
-        street_key = street_map.get(street.lower(), street.upper())
-        pattern = rf'\*\*\* {street_key} \*\*\*(.*?)(?=\*\*\*|$)'
-        match = re.search(pattern, self.hand_text, re.DOTALL)
-        if not match:
+        street_key = STREET_SECTIONS.get(street.lower(), street.upper())
+        player_lines = self._lines_for(street_key, player)
+        if player_lines is None:
             return [[None]]
 
-        street_text = match.group(1).strip()
         actions = []
+        for line in player_lines:
+            action, amount = self._classify_action(line)
+            actions.append([action, self.normalize_amount(amount)])
 
-        for line in street_text.splitlines():
-            if not line.startswith(player + ":"):
-                continue
-            content = line[len(player)+1:].strip().lower()
+        return actions or [[None]]
 
-            if re.match(r'[\d,]+\s+to\s+[\d,]+', content):
-                try:
-                    final_amount = float(re.search(r'to\s+([\d,]+)', content).group(1).replace(",", ""))
-                    actions.append(["bet", self.normalize_amount(final_amount)])
+    @staticmethod
+    def _classify_action(line: str) -> Tuple[str, Optional[float]]:
+        """
+        Action name and raw amount of the text after "player:" (for raises,
+        the amount raised to). Amounts that fail to parse are None.
+        """
+        content = line.strip().lower()
+
+        if patterns.AMOUNT_TO_AMOUNT.match(content):
+            return "bet", _search_amount(patterns.TO_AMOUNT, content)
+
+        if "raises" in content and "to" in content:
+            return "raise", _search_amount(patterns.TO_AMOUNT, content)
+        elif "bets" in content:
+            return "bet", _search_amount(patterns.BETS_AMOUNT, content)
+        elif "calls" in content:
+            return "call", _search_amount(patterns.CALLS_AMOUNT, content)
+        elif "folds" in content:
+            return "fold", None
+        elif "checks" in content:
+            return "check", None
+        else:
+            return content.split()[0], None
+
+    def extract_action_log(self) -> List[Tuple[str, str, str, Optional[float], float, bool]]:
+        """
+        Every betting action of the hand in the order it was taken, across
+        players and streets: (street, player, action, amount, pot before the
+        action, all-in). Street is a STREET_SECTIONS key, action and amount
+        are as in extract_street_action. The pot follows the chip flows of
+        _chip_flows: antes and blinds are in it from the start, a raise brings
+        the player's street total up to its amount, bets and calls add to it.
+        Lines that are not fold/check/call/bet/raise are left out.
+        """
+        names = [name for _, name, _ in self._seats]
+        seated = set(names)
+
+        pot = 0.0
+        street_totals: Dict[str, float] = {}
+        for player, contents in self._player_lines[SEATS_SECTION].items():
+            for content in contents:
+                match = patterns.CHIPS_IN.match(content)
+                if not match:
                     continue
-                except:
-                    actions.append(["bet", None])
+                amount = float(match.group(2).replace(",", ""))
+                if match.group(1) == "posts the ante":
+                    pot += amount
+                else:
+                    street_totals[player] = street_totals.get(player, 0.0) + amount
+
+        log = []
+        street_pot = sum(street_totals.values())
+        for street, section in STREET_SECTIONS.items():
+            lines = self._sections.get(section)
+            if lines is None:
+                continue
+            if street != "preflop":
+                pot += street_pot
+                street_pot, street_totals = 0.0, {}
+            for line in lines:
+                player, sep, rest = line.partition(":")
+                if not sep:
+                    continue
+                if player not in seated:
+                    # Names with a colon were split at the wrong place
+                    player = next((name for name in names if line.startswith(f"{name}:")), None)
+                    if player is None:
+                        continue
+                    rest = line[len(player) + 1:]
+                action, amount = self._classify_action(rest)
+                if action not in BETTING_ACTIONS:
                     continue
 
-            if "raises" in content and "to" in content:
-                try:
-                    final_amount = float(re.search(r'to\s+([\d,]+)', content).group(1).replace(",", ""))
-                    actions.append(["raise", self.normalize_amount(final_amount)])
-                except:
-                    actions.append(["raise", None])
-            elif "bets" in content:
-                try:
-                    amount = float(re.search(r'bets\s+([\d,]+)', content).group(1).replace(",", ""))
-                    actions.append(["bet", self.normalize_amount(amount)])
-                except:
-                    actions.append(["bet", None])
-            elif "calls" in content:
-                try:
-                    amount = float(re.search(r'calls\s+([\d,]+)', content).group(1).replace(",", ""))
-                    actions.append(["call", self.normalize_amount(amount)])
-                except:
-                    actions.append(["call", None])
-            elif "folds" in content:
-                actions.append(["fold", None])
-            elif "checks" in content:
-                actions.append(["check", None])
-            else:
-                actions.append([content.split()[0], None])
+                pot_before = pot + street_pot
+                if amount is not None:
+                    total = street_totals.get(player, 0.0)
+                    added = amount - total if action == "raise" else amount
+                    street_totals[player] = total + added
+                    street_pot += added
+                log.append((
+                    street,
+                    player,
+                    action,
+                    self.normalize_amount(amount),
+                    self.normalize_amount(round(pot_before, 2)),
+                    "all-in" in rest,
+                ))
 
-        return actions or [[None]]
+        return log
 
 
 
     def extract_allin(self, street: str, player: str) -> bool:
-        pattern = rf'\*\*\* {street.upper()} \*\*\*(.*?)(?=\*\*\*|$)'
-        match = re.search(pattern, self.hand_text, re.DOTALL)
-        return bool(re.search(rf'{player}:.*all-in', match.group(1))) if match else False
+        player_lines = self._lines_for(street.upper(), player)
+        return any("all-in" in line for line in player_lines) if player_lines else False
 
     def extract_ante_allin(self, player: str, players: List[Dict]) -> bool:
       """
@@ -237,9 +424,9 @@ class RegexExtraction:
     # ----------- BOARD CARDS -----------
     def extract_board_cards(self) -> Tuple[List[str], List[str], List[str]]:
         flop, turn, river = [], [], []
-        flop_match = re.search(r'\*\*\* FLOP \*\*\* \[(.*?)\]', self.hand_text)
-        turn_match = re.search(r'\*\*\* TURN \*\*\* \[.*?\] \[(.*?)\]', self.hand_text)
-        river_match = re.search(r'\*\*\* RIVER \*\*\* \[.*?\] \[(.*?)\]', self.hand_text)
+        flop_match = patterns.FLOP_CARDS.match(self._markers.get("FLOP", ""))
+        turn_match = patterns.STREET_CARD.match(self._markers.get("TURN", ""))
+        river_match = patterns.STREET_CARD.match(self._markers.get("RIVER", ""))
 
         if flop_match: flop = flop_match.group(1).split()
         if turn_match: turn = flop + [turn_match.group(1)]
@@ -249,48 +436,47 @@ class RegexExtraction:
 
     # ----------- RESULT & WINNINGS -----------
     def extract_showdown_cards(self, player: str) -> List[str]:
-        match = re.search(rf'{player}: shows \[(.*?)\]', self.hand_text)
-        return match.group(1).split() if match else []
+        for section in self._sections:
+            for line in self._lines_for(section, player):
+                match = patterns.SHOWS.match(line)
+                if match:
+                    return match.group(1).split()
+        return []
 
 
     def extract_result(self, player: str) -> str:
-        summary = self.hand_text.split("*** SUMMARY ***")[-1]
-        showdown_section = re.search(r"\*\*\* SHOWDOWN \*\*\*(.*?)(?=\*\*\*|\Z)", self.hand_text, re.DOTALL)
-        showdown_text = showdown_section.group(1) if showdown_section else ""
-        river_exists = "*** RIVER ***" in self.hand_text
-        turn_exists = "*** TURN ***" in self.hand_text
-        flop_exists = "*** FLOP ***" in self.hand_text
+        showdown_text = self._showdown_text
+        river_exists = "RIVER" in self._sections
+        turn_exists = "TURN" in self._sections
+        flop_exists = "FLOP" in self._sections
 
         # Capitalized results from summary with optional (role)
-        if re.search(rf"{player}(?:\(\w+ blind\))?\s+folded before Flop", summary):
+        folded = self._folded.get(player)
+        if folded == "before Flop":
             return "Folded Pre Flop"
-        elif re.search(rf"{player}(?:\(\w+ blind\))?\s+folded on the Flop", summary):
+        elif folded == "on the Flop":
             return "Folded On The Flop"
-        elif re.search(rf"{player}(?:\(\w+ blind\))?\s+folded on the Turn", summary):
+        elif folded == "on the Turn":
             return "Folded On The Turn"
-        elif re.search(rf"{player}(?:\(\w+ blind\))?\s+folded on the River", summary):
+        elif folded == "on the River":
             return "Folded On The River"
 
         # Won categories
-        if f"{player} collected" in self.hand_text and len(set(re.findall(r'(\w+)\s+collected\s+[\d,]+', showdown_text))) == 1:
+        collected_dict = self._collected.get("SHOWDOWN", {})
+        player_won = any(player in collected for collected in self._collected.values())
+        if player_won and len(collected_dict) == 1:
             if not flop_exists:
                 return "Won Pre Flop"
             elif flop_exists and not turn_exists:
                 return "Won At The Flop"
             elif turn_exists and not river_exists:
                 return "Won At The Turn"
-            elif river_exists and "Uncalled bet" in self.hand_text and player in self.hand_text.split("Uncalled bet")[-1]:
+            elif river_exists and self._after_uncalled is not None and player in self._after_uncalled:
                 return "Won At The River"
             else:
                 return "Won At Showdown"
 
         # Split logic
-        collected_matches = re.findall(r'(\w+)\s+collected\s+([\d,]+)', showdown_text)
-        collected_dict = {}
-        for p, amt in collected_matches:
-            amt = float(amt.replace(",", ""))
-            collected_dict.setdefault(p, []).append(amt)
-
         player_collected = collected_dict.get(player, [])
         all_totals = {p: sum(v) for p, v in collected_dict.items()}
         player_total = sum(player_collected)
@@ -340,44 +526,102 @@ class RegexExtraction:
 
         return "Lost"
 
-    # THIS IS A GOOD VERSION BUT NOT PERFECT, I STILL HAVE SOME BUGS HERE. THE VALIDATION IS CHECK ALL THE VALUES SUMING UP TO
-    # df[['HandID','Balance']].groupby('HandID').sum().reset_index()['Balance'].value_counts()
+    # ----------- BALANCE -----------
+    def _chip_flows(self) -> None:
+        """
+        Chips every seated player put in and got back, in one pass over the
+        indexed action lines. Antes are dead money; blinds count towards the
+        preflop bet; a raise sets the player's total for the street ("raises
+        600 to 900" puts in 900 in all); bets and calls add to it. Uncalled
+        bets are taken back out of the investment; every pot collected (main
+        and side pots) is returned.
+        """
+        investments, balances = {}, {}
+        for _, player, _ in self._seats:
+            invested = 0.0
+            street_total = 0.0
+            for section in self._player_lines:
+                if section != "HOLE CARDS":
+                    # Blinds (SEATS) carry over into the preflop betting
+                    invested += street_total
+                    street_total = 0.0
+                for content in self._lines_for(section, player):
+                    match = patterns.CHIPS_IN.match(content)
+                    if not match:
+                        continue
+                    action, amount = match.group(1), float(match.group(2).replace(",", ""))
+                    if action == "posts the ante":
+                        invested += amount
+                    elif action.startswith("raises"):
+                        street_total = amount
+                    else:
+                        street_total += amount
+            invested += street_total - sum(self._uncalled.get(player, []))
+
+            returned = sum(amount for collected in self._collected.values() for amount in collected.get(player, []))
+            investments[player] = self.normalize_amount(round(invested, 2))
+            balances[player] = self.normalize_amount(round(returned - invested, 2))
+
+        self._investments, self._balances = investments, balances
+
+    def extract_balances(self) -> Dict[str, float]:
+        """
+        Net result of every seated player (see _chip_flows). Summed over the
+        players of a hand, balances equal minus the rake (see utils.validation).
+        """
+        if self._balances is None:
+            self._chip_flows()
+        return self._balances
+
+    def extract_investments(self) -> Dict[str, float]:
+        """
+        Chips every seated player put in the pot, uncalled bets excluded
+        (the pot sizes behind all-in EV, see utils.equity).
+        """
+        if self._investments is None:
+            self._chip_flows()
+        return self._investments
+
     def extract_balance(self, player: str) -> float:
-        try:
-            balance = 0.0
-
-            ante = self.extract_posted_ante(player)
-            if ante:
-                balance -= ante
-
-            blind = self.extract_posted_blind(player)
-            if blind:
-                balance -= blind
-
-            for street in ["preflop", "flop", "turn", "river"]:
-                actions = self.extract_street_action(street, player)
-                for action in actions:
-                    if (
-                        action
-                        and isinstance(action, list)
-                        and action[0] in {"bet", "raise", "call"}
-                        and isinstance(action[1], (int, float))
-                    ):
-                        balance -= action[1]
-
-            collected_matches = re.findall(rf'{player} collected ([\d,]+)', self.hand_text)
-            for match in collected_matches:
-                amount = float(match.replace(",", ""))
-                balance += self.normalize_amount(amount)
-
-            returned_matches = re.findall(rf'Uncalled bet \(([\d,]+)\) returned to {player}', self.hand_text)
-            for match in returned_matches:
-                amount = float(match.replace(",", ""))
-                balance += self.normalize_amount(amount)
-
-            return round(balance, 2)
-
-        except Exception as e:
-            print(f"Balance calc error for {player}: {e}")
-            return 0.0
+        return self.extract_balances().get(player, 0.0)
+
+    def extract_rake(self) -> float:
+        """Everything taken from the pot: rake, jackpot and the other fees of the summary."""
+        for line in self._sections.get("SUMMARY", []):
+            if line.startswith("Total pot"):
+                fees = patterns.POT_FEES.findall(line)
+                return self.normalize_amount(round(sum(float(fee.replace(",", "")) for fee in fees), 2))
+        return 0.0
+
+
+class CashRegexExtraction(RegexExtraction):
+    """
+    Cash-game hands: same layout and index as tournament hands, but the hand ID
+    carries a table-type prefix (e.g. #RC123456789) and there are no antes to
+    derive positions from, so they come from the button and the small blind.
+    """
+
+    def extract_hand_id(self) -> str:
+        match = patterns.CASH_HAND_ID.search(self.header)
+        return match.group(1) if match else None
+
+    def assign_positions(self, players: List[Dict]) -> Dict[str, str]:
+        seats = sorted(self._seats)
+        if not seats:
+            return {}
+        names = [name for _, name, _ in seats]
+
+        small_blind = next((
+            name for name in names
+            for content in self._lines_for(SEATS_SECTION, name)
+            if content.startswith(" posts small blind")
+        ), None)
+        if small_blind is not None:
+            start = names.index(small_blind)
+        else:
+            # Dead small blind: the first seat after the button
+            start = next((i for i, (seat, _, _) in enumerate(seats) if seat > (self._button_seat or 0)), 0)
 
+        order = names[start:] + names[:start]
+        position_labels = self.get_positions_order(len(order))
+        return {player: pos for player, pos in zip(order, position_labels)}
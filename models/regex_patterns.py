@@ -0,0 +1,76 @@
+import re
+from functools import lru_cache
+from typing import Dict, Pattern
+
+
+# ----------- HAND SPLITTING -----------
+HAND_SEPARATOR = re.compile(r'\n\s*\n')
+SECTION_MARKER = re.compile(r'\*\*\* (.+?) \*\*\*(.*)')
+
+# ----------- HEADER -----------
+TOUR_HEADER = 'Poker Hand #tour_'
+TOUR_BLINDS = re.compile(r'\(([\d,]+)/([\d,]+)\)')
+CASH_BLINDS = re.compile(r'\(\$([\d,.]+)\/\$([\d,.]+)\)')
+MODALITY = re.compile(r'Tournament #\d+, (.+?) - Level')
+BUYIN = re.compile(r'\((\d+)\+(\d+)\+\d+\)')
+TOURNAMENT_ID = re.compile(r'Tournament (#\d+)')
+HAND_ID = re.compile(r'Poker Hand #tour_(\d+)')
+CASH_HAND_ID = re.compile(r'Poker Hand #(\w+):')
+LOCAL_TIME = re.compile(r' - (\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2})')
+LEVEL = re.compile(r'-( Level\d+)')
+
+# ----------- SEATS -----------
+# Amounts take an optional '$' and decimals, so cash hands share these patterns
+SEAT = re.compile(r'Seat (\d+): (.+?) \(\$?([\d,.]+) in chips\)')
+TABLE = re.compile(r'Table \'(.*?)\' (.+?) Seat #(\d+) is the button')
+ANTE = re.compile(r'posts the ante \$?(\d{1,3}(?:,\d{3})*(?:\.\d+)?)')
+POSTED_ANTE = re.compile(r'\s+posts the ante \$?([\d,.]+)')
+POSTED_BLIND = re.compile(r'\s+posts (small|big) blind \$?([\d,.]+)')
+
+# ----------- ACTIONS -----------
+AMOUNT_TO_AMOUNT = re.compile(r'\$?[\d,.]+\s+to\s+\$?[\d,.]+')
+TO_AMOUNT = re.compile(r'to\s+\$?([\d,.]+)')
+BETS_AMOUNT = re.compile(r'bets\s+\$?([\d,.]+)')
+CALLS_AMOUNT = re.compile(r'calls\s+\$?([\d,.]+)')
+# Lines that put chips in the pot; for raises the amount is the player's street total
+CHIPS_IN = re.compile(r'\s+(posts the ante|posts .+?|bets|calls|raises \$?[\d,.]+ to) \$?([\d,.]+)')
+
+# ----------- BOARD / SHOWDOWN / SUMMARY -----------
+FLOP_CARDS = re.compile(r' \[(.*?)\]')
+STREET_CARD = re.compile(r' \[.*?\] \[(.*?)\]')
+SHOWS = re.compile(r' shows \[(.*?)\]')
+COLLECTED = re.compile(r'(.+?)\s+collected\s+\$?([\d,.]+)')
+UNCALLED = re.compile(r'Uncalled bet \(\$?([\d,.]+)\) returned to (.+)')
+POT_FEES = re.compile(r'\| (?:Rake|Jackpot|Bingo|Fortune|Tax) \$?([\d,.]+)')
+SUMMARY_FOLD = re.compile(r'Seat \d+: (.+?)(?:\(\w+ blind\))?\s+folded (before Flop|on the Flop|on the Turn|on the River)')
+
+
+# ----------- PER-PLAYER PATTERNS -----------
+PLAYER_PATTERN_CACHE_SIZE = 2048
+
+
+@lru_cache(maxsize=PLAYER_PATTERN_CACHE_SIZE)
+def player_pattern(template: str, player: str) -> Pattern:
+    """
+    Compile a pattern for one player. The '{player}' placeholder in the template
+    is replaced with the escaped screen name, so names with regex metacharacters
+    match literally. Compiled patterns are kept in a bounded LRU cache.
+    """
+    return re.compile(template.replace("{player}", re.escape(player)))
+
+
+def pattern_cache_info() -> Dict[str, int]:
+    """
+    Hits, misses and current size of the per-player pattern cache.
+    """
+    info = player_pattern.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+    }
+
+
+def clear_pattern_cache() -> None:
+    player_pattern.cache_clear()
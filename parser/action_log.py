@@ -0,0 +1,89 @@
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from models.regex_extractor import STREET_SECTIONS, RegexExtraction
+from parser.compact import _compact_ids
+from utils.actions import ACTION_CODES
+
+
+ACTION_LOG_COLUMNS = ["HandID", "Street", "Seq", "Player", "Position", "Action", "Amount", "PotBefore", "AllIn"]
+# Street codes of the log, in the order of the hand
+STREET_NAMES = ("Preflop", "Flop", "Turn", "River")
+STREET_CODES = {street: code for code, street in enumerate(STREET_SECTIONS)}
+
+
+class HandActions(NamedTuple):
+    """The action log of one hand: extract_action_log plus each player's position."""
+    hand_id: Optional[str]
+    actions: List[Tuple[str, str, str, Optional[float], float, bool]]
+    positions: dict
+
+
+def hand_actions(parser: RegexExtraction) -> HandActions:
+    players = parser.sort_players_by_position(parser.extract_players_info())
+    positions = {p["Player"]: p["Position"] for p in players}
+    return HandActions(parser.extract_hand_id(), parser.extract_action_log(), positions)
+
+
+class ActionLogBuilder:
+    """
+    Accumulate the action logs of parsed hands and build the long-format
+    action table: one row per action, in the order the actions were taken.
+
+    - HandID: as in the player rows (int64 with compact=True, see parser.compact)
+    - Street: int8 index into STREET_NAMES
+    - Seq: int16, 0-based order of the action in its hand, across streets
+    - Player, Position: categorical
+    - Action: int8 code of utils.actions.ACTION_NAMES
+    - Amount, PotBefore: float64 (for raises, the amount raised to)
+    - AllIn: bool
+
+    Rows of a hand are contiguous and in order, so sequence questions are
+    shift/cumsum/groupby operations on the columns (see utils.filters).
+    """
+
+    def __init__(self, compact: bool = False):
+        self.compact = compact
+        self._hand_ids: List[Optional[str]] = []
+        self._lengths: List[int] = []
+        self._actions: List[Tuple] = []
+        self._positions: List[Optional[str]] = []
+
+    def add(self, hand: HandActions) -> None:
+        self._hand_ids.append(hand.hand_id)
+        self._lengths.append(len(hand.actions))
+        self._actions.extend(hand.actions)
+        self._positions.extend(hand.positions.get(action[1]) for action in hand.actions)
+
+    def collect(self, hands: Iterable[Tuple]) -> Iterator:
+        """
+        Record the log of every (rows, HandActions) pair of iter_tour_hands
+        with action_log=True and yield the rows on.
+        """
+        for rows, actions in hands:
+            self.add(actions)
+            yield rows
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def to_frame(self) -> pd.DataFrame:
+        lengths = np.asarray(self._lengths, dtype=np.int64)
+        hand_index = np.repeat(np.arange(len(lengths)), lengths)
+        hand_ids = _compact_ids(self._hand_ids) if self.compact else np.array(self._hand_ids, dtype=object)
+        starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+
+        streets, players, actions, amounts, pots, all_ins = zip(*self._actions) if self._actions else ((),) * 6
+        return pd.DataFrame({
+            "HandID": hand_ids.take(hand_index),
+            "Street": np.array([STREET_CODES[street] for street in streets], dtype=np.int8),
+            "Seq": (np.arange(len(hand_index)) - starts).astype(np.int16),
+            "Player": pd.Categorical(players),
+            "Position": pd.Categorical(self._positions),
+            "Action": np.array([ACTION_CODES[action] for action in actions], dtype=np.int8),
+            "Amount": np.array([np.nan if amount is None else amount for amount in amounts], dtype=np.float64),
+            "PotBefore": np.array(pots, dtype=np.float64),
+            "AllIn": np.array(all_ins, dtype=bool),
+        }, columns=ACTION_LOG_COLUMNS)
@@ -0,0 +1,54 @@
+from operator import methodcaller
+from typing import Collection, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from models.regex_extractor import CashRegexExtraction
+from parser.hands import HandField, board_field, player_rows
+from parser.reader import split_hand_texts
+
+
+CASH_FIELDS: Dict[str, HandField] = {
+    "TableName": methodcaller("extract_table_name"),
+    "TableSize": methodcaller("extract_table_size"),
+    "HandID": methodcaller("extract_hand_id"),
+    "LocalTime": methodcaller("extract_local_time"),
+    "Ante": methodcaller("extract_ante"),
+    "Blinds": methodcaller("extract_blinds"),
+    "BoardFlop": board_field(0),
+    "BoardTurn": board_field(1),
+    "BoardRiver": board_field(2),
+    "HeroHand": methodcaller("extract_hero_hand"),
+    "Rake": methodcaller("extract_rake"),
+}
+
+
+def parse_cash_hand_rows(
+    parser: CashRegexExtraction,
+    columns: Optional[Sequence[str]] = None,
+    players: Optional[Collection[str]] = None
+) -> List[Dict]:
+    """
+    Build the per-player rows of a single cash-game hand.
+    """
+    return player_rows(parser, CASH_FIELDS, columns=columns, players=players)
+
+
+def iter_cash_hands(hand_texts: Iterable[str], normalize: bool = True) -> Iterator[List[Dict]]:
+    """
+    Parse cash hand texts one at a time and yield the rows of each hand. Hands
+    that fail to parse are reported and skipped.
+    """
+    for hand_text in hand_texts:
+        try:
+            rows = parse_cash_hand_rows(CashRegexExtraction(hand_text, normalize=normalize))
+        except Exception as e:
+            print(f"Error parsing hand: {e}")
+            continue
+        yield rows
+
+
+def parse_cash(log_text: str, normalize: bool = True) -> List[Dict]:
+    """
+    Parse a cash-game log into per-player rows in chronological order.
+    Amounts are in big blinds when normalize is set.
+    """
+    return [row for rows in iter_cash_hands(split_hand_texts(log_text), normalize=normalize) for row in rows]
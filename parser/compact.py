@@ -0,0 +1,134 @@
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from parser.hands import HandColumns
+from utils.actions import ACTION_COLUMNS, actions_to_arrow
+from utils.cards import encode_cards
+
+
+# ----------- COMPACT DTYPES -----------
+CATEGORY_COLUMNS = {"Modality", "TableName", "TableSize", "Level", "Player", "Position", "Result"}
+ID_COLUMNS = {"TournID", "HandID"}
+FLOAT32_COLUMNS = {"Ante", "Stack", "PostedAnte", "PostedBlind", "Balance", "Invested", "Rake"}
+INT8_COLUMNS = {"Playing", "Seat"}
+BOOL_COLUMNS = {"AnteAllIn", "PreflopAllIn", "FlopAllIn", "TurnAllIn", "RiverAllIn"}
+CARD_COLUMNS = {"BoardFlop", "BoardTurn", "BoardRiver", "HeroHand", "ShowDown"}
+LIST_TYPES = {
+    "Blinds": pa.list_(pa.float32()),
+    "BuyIn": pa.list_(pa.int32()),
+}
+
+
+def compact_values(column: str, values: List):
+    """
+    Convert the values of one parsed column to its compact array:
+
+    - Modality, TableSize, Level, Player, Position, Result: categorical
+    - TournID, HandID: int64 ("#" prefix dropped); nullable Int64 if some are
+      missing, categorical if some are not numeric (e.g. cash hand IDs)
+    - LocalTime: datetime64
+    - Ante, Stack, PostedAnte, PostedBlind, Balance, Invested, Rake: float32
+    - Playing, Seat: int8
+    - board, hole and showdown cards: Arrow list<uint8> of card codes (see utils.cards)
+    - Blinds, BuyIn: Arrow list<float32> / list<int32>
+    - street actions: Arrow list<struct<action, amount>> (see utils.actions)
+
+    The result supports .take, so hand-level values can be converted once per
+    hand and then repeated for every player row.
+    """
+    if column in CATEGORY_COLUMNS:
+        return pd.Categorical(values)
+    if column in ID_COLUMNS:
+        return _compact_ids(values)
+    if column == "LocalTime":
+        return pd.to_datetime(pd.Series(values, dtype=object)).array
+    if column in FLOAT32_COLUMNS:
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float32)
+    if column in INT8_COLUMNS:
+        return np.asarray(values, dtype=np.int8)
+    if column in BOOL_COLUMNS:
+        return np.asarray(values, dtype=bool)
+    if column in CARD_COLUMNS:
+        return pd.arrays.ArrowExtensionArray(encode_cards(values))
+    if column in LIST_TYPES:
+        return pd.arrays.ArrowExtensionArray(pa.array(values, type=LIST_TYPES[column]))
+    if column in ACTION_COLUMNS:
+        return pd.arrays.ArrowExtensionArray(actions_to_arrow(values))
+
+    # Element by element, so equal-length lists don't become a 2-D array
+    array = np.empty(len(values), dtype=object)
+    for i, value in enumerate(values):
+        array[i] = value
+    return array
+
+
+def _compact_ids(values: List):
+    ids = pd.Series(values, dtype=object).str.lstrip("#")
+    numeric = pd.to_numeric(ids, errors="coerce")
+    if (numeric.isna() & ids.notna()).any():
+        return pd.Categorical(values)
+    if numeric.isna().any():
+        return numeric.astype("Int64").array
+    return numeric.to_numpy(dtype=np.int64)
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert a frame of parse_tour_clean rows to the compact dtypes.
+    """
+    return pd.DataFrame(
+        {col: compact_values(col, df[col].tolist()) for col in df.columns},
+        index=df.index,
+    )
+
+
+# ----------- COLUMNAR CONSTRUCTION -----------
+class CompactFrameBuilder:
+    """
+    Accumulate parsed hands column by column and build one compact DataFrame.
+
+    Hand-level values (IDs, blinds, board, ...) are stored and converted once
+    per hand, then repeated for the hand's player rows, instead of being
+    copied into a dict for every row.
+    """
+
+    def __init__(self):
+        self.columns: Optional[List[str]] = None
+        self._hand_values: Dict[str, List] = {}
+        self._player_values: Dict[str, List] = {}
+        self._rows_per_hand: List[int] = []
+
+    def add(self, hand: HandColumns) -> None:
+        if self.columns is None:
+            self.columns = hand.columns
+            self._hand_values = {col: [] for col in hand.hand_data}
+            self._player_values = {col: [] for col in hand.player_data}
+        for col, value in hand.hand_data.items():
+            self._hand_values[col].append(value)
+        for col, values in hand.player_data.items():
+            self._player_values[col].extend(values)
+        self._rows_per_hand.append(hand.num_rows)
+
+    def extend(self, hands: Iterable[HandColumns]) -> "CompactFrameBuilder":
+        for hand in hands:
+            self.add(hand)
+        return self
+
+    def __len__(self) -> int:
+        return len(self._rows_per_hand)
+
+    def to_frame(self) -> pd.DataFrame:
+        if self.columns is None:
+            return pd.DataFrame()
+
+        hand_index = np.repeat(np.arange(len(self._rows_per_hand)), self._rows_per_hand)
+        data = {}
+        for col in self.columns:
+            if col in self._hand_values:
+                data[col] = compact_values(col, self._hand_values[col]).take(hand_index)
+            else:
+                data[col] = compact_values(col, self._player_values[col])
+        return pd.DataFrame(data)
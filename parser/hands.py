@@ -0,0 +1,112 @@
+from typing import Any, Callable, Collection, Dict, List, NamedTuple, Optional, Sequence
+
+from models.regex_extractor import RegexExtraction
+
+
+HandField = Callable[[RegexExtraction], Any]
+# (parser, player, all players of the hand, position map) -> value
+PlayerField = Callable[[RegexExtraction, Dict, List[Dict], Dict[str, str]], Any]
+
+PLAYER_FIELDS: Dict[str, PlayerField] = {
+    "Playing": lambda parser, player, players, positions: len(players),
+    "Player": lambda parser, player, players, positions: player["Player"],
+    "Seat": lambda parser, player, players, positions: player["Seat"],
+    "PostedAnte": lambda parser, player, players, positions: parser.extract_posted_ante(player["Player"]),
+    "PostedBlind": lambda parser, player, players, positions: parser.extract_posted_blind(player["Player"]),
+    "Position": lambda parser, player, players, positions: positions.get(player["Player"]),
+    "Stack": lambda parser, player, players, positions: player["Stack"],
+    "PreflopAction": lambda parser, player, players, positions: parser.extract_street_action("HOLE CARDS", player["Player"]),
+    "FlopAction": lambda parser, player, players, positions: parser.extract_street_action("FLOP", player["Player"]),
+    "TurnAction": lambda parser, player, players, positions: parser.extract_street_action("TURN", player["Player"]),
+    "RiverAction": lambda parser, player, players, positions: parser.extract_street_action("RIVER", player["Player"]),
+    "AnteAllIn": lambda parser, player, players, positions: parser.extract_ante_allin(player["Player"], players),
+    "PreflopAllIn": lambda parser, player, players, positions: parser.extract_allin("HOLE CARDS", player["Player"]),
+    "FlopAllIn": lambda parser, player, players, positions: parser.extract_allin("FLOP", player["Player"]),
+    "TurnAllIn": lambda parser, player, players, positions: parser.extract_allin("TURN", player["Player"]),
+    "RiverAllIn": lambda parser, player, players, positions: parser.extract_allin("RIVER", player["Player"]),
+    "ShowDown": lambda parser, player, players, positions: parser.extract_showdown_cards(player["Player"]),
+    "Result": lambda parser, player, players, positions: parser.extract_result(player["Player"]),
+    "Balance": lambda parser, player, players, positions: parser.extract_balances().get(player["Player"]),
+    "Invested": lambda parser, player, players, positions: parser.extract_investments().get(player["Player"]),
+}
+
+
+def board_field(index: int) -> HandField:
+    return lambda parser: parser.extract_board_cards()[index]
+
+
+def check_columns(hand_fields: Dict[str, HandField], columns: Optional[Sequence[str]]) -> None:
+    """
+    Raise ValueError for requested columns that neither the hand fields nor
+    PLAYER_FIELDS provide.
+    """
+    if columns is None:
+        return
+    unknown = [col for col in columns if col not in hand_fields and col not in PLAYER_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown columns: {unknown}")
+
+
+class HandColumns(NamedTuple):
+    """One parsed hand in columnar form: hand-level values once, player values as lists."""
+    columns: List[str]
+    hand_data: Dict[str, Any]
+    player_data: Dict[str, List[Any]]
+    num_rows: int
+
+
+def hand_columns(
+    parser: RegexExtraction,
+    hand_fields: Dict[str, HandField],
+    columns: Optional[Sequence[str]] = None,
+    players: Optional[Collection[str]] = None
+) -> Optional[HandColumns]:
+    """
+    Extract the requested columns of a single hand (all of them by default):
+    the hand-level hand_fields once, and PLAYER_FIELDS once per player.
+
+    With players set, only those players are extracted; hands where none of
+    them sat return None without extracting anything else. "Playing" still
+    counts every player at the table.
+    """
+    columns = list(columns) if columns is not None else [*hand_fields, *PLAYER_FIELDS]
+
+    current_players = parser.extract_players_info()
+    current_players = parser.sort_players_by_position(current_players)
+    selected = current_players if players is None else [p for p in current_players if p["Player"] in players]
+    if not selected:
+        return None
+
+    positions = parser.assign_positions(current_players) if "Position" in columns else {}
+    hand_data = {col: hand_fields[col](parser) for col in columns if col in hand_fields}
+    player_data = {
+        col: [PLAYER_FIELDS[col](parser, player, current_players, positions) for player in selected]
+        for col in columns if col not in hand_data
+    }
+    return HandColumns(columns, hand_data, player_data, len(selected))
+
+
+def player_rows(
+    parser: RegexExtraction,
+    hand_fields: Dict[str, HandField],
+    columns: Optional[Sequence[str]] = None,
+    players: Optional[Collection[str]] = None
+) -> List[Dict]:
+    """
+    Build the per-player rows of a single hand: the hand-level hand_fields
+    followed by PLAYER_FIELDS, restricted to the requested columns (in that
+    order) and players. Shared by the tournament and cash parsers.
+    """
+    hand = hand_columns(parser, hand_fields, columns=columns, players=players)
+    if hand is None:
+        return []
+
+    rows = []
+    for i in range(hand.num_rows):
+        row = {
+            col: hand.hand_data[col] if col in hand.hand_data else hand.player_data[col][i]
+            for col in hand.columns
+        }
+        rows.append(row)
+
+    return rows
@@ -0,0 +1,267 @@
+import fnmatch
+import glob
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple, Union
+
+import pandas as pd
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
+from watchdog.observers import Observer
+
+from parser.reader import HandTail
+from parser.tour import iter_tour_rows
+from utils.hand_index import HandIndex
+
+
+PathLike = Union[str, os.PathLike]
+
+
+class LiveFrame:
+    """
+    Append-only DataFrame that can be read while a LiveTail writes to it.
+    Appended chunks are concatenated lazily, on the first read after an append.
+    A HandIndex of the rows is kept up to date on every append.
+    """
+
+    def __init__(self):
+        self._chunks: List[pd.DataFrame] = []
+        self._frame = pd.DataFrame()
+        self._index = HandIndex()
+        self._lock = threading.Lock()
+
+    def append(self, df: pd.DataFrame) -> None:
+        if df.empty:
+            return
+        with self._lock:
+            self._chunks.append(df)
+            self._index.append(df)
+
+    def append_new(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Append only the rows of hands the frame doesn't hold yet (rows without
+        a HandID are always appended). Returns the appended rows.
+        """
+        with self._lock:
+            key = self._index.keys.get("HandID")
+            if key is not None and "HandID" in df.columns:
+                df = df[~df["HandID"].isin(key.lookup)]
+            if not df.empty:
+                self._chunks.append(df)
+                self._index.append(df)
+            return df
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        return self.snapshot()[0]
+
+    def snapshot(self) -> Tuple[pd.DataFrame, HandIndex]:
+        """The frame and its index, consistent with each other."""
+        with self._lock:
+            if self._chunks:
+                self._frame = pd.concat([self._frame, *self._chunks], ignore_index=True)
+                self._chunks = []
+            return self._frame, self._index.copy()
+
+    @property
+    def index(self) -> HandIndex:
+        return self.snapshot()[1]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._frame) + sum(len(chunk) for chunk in self._chunks)
+
+
+class LiveTail:
+    """
+    Watch hand-history files while the GG client writes them and parse only
+    the newly appended hands.
+
+        tail = LiveTail("~/GGPoker/HandHistory", store=HandStore("~/gg_store"))
+        with tail:                      # starts / stops the watchdog observer
+            ...
+            df = tail.frame             # every row parsed so far
+
+    paths are files and/or directories; in directories every file matching
+    pattern is followed, including files created later. Each file keeps its
+    own byte offset (see parser.reader.HandTail), so the cost of an update
+    depends only on the appended hands. A hand that is still being written is
+    held back until it is complete. New rows are appended to the live frame,
+    ingested into store (anything with an ingest(df) method, e.g. HandStore)
+    and passed to on_update(df, path), in file order. Hands the live frame
+    already holds (e.g. re-read from a truncated or replaced file) are skipped.
+    store and on_update run outside the tail's lock, so on_update can read
+    offsets (e.g. to save them) without blocking updates of the other files.
+
+    from_start=False skips what the files already contain. offsets
+    ({path: byte offset}, e.g. a previous tail's offsets) resumes where an
+    earlier session stopped.
+    """
+
+    def __init__(
+        self,
+        paths: Union[PathLike, Iterable[PathLike]],
+        normalize: bool = True,
+        pattern: str = "*.txt",
+        store=None,
+        on_update: Optional[Callable[[pd.DataFrame, str], None]] = None,
+        from_start: bool = True,
+        offsets: Optional[Dict[str, int]] = None,
+    ):
+        if isinstance(paths, (str, os.PathLike)):
+            paths = [paths]
+        self.paths = [os.path.abspath(os.path.expanduser(os.fspath(p))) for p in paths]
+        self.normalize = normalize
+        self.pattern = pattern
+        self.store = store
+        self.on_update = on_update
+        self.from_start = from_start
+        self.live = LiveFrame()
+        self.last_update: Dict = {}
+
+        self._offsets = {os.path.abspath(p): o for p, o in (offsets or {}).items()}
+        self._tails: Dict[str, HandTail] = {}
+        self._lock = threading.Lock()
+        # New rows waiting for store / on_update, in the order they were read
+        self._pending: Deque[Tuple[pd.DataFrame, str]] = deque()
+        self._deliver_lock = threading.RLock()
+        self._observer: Optional[Observer] = None
+
+        for path in self._existing_files():
+            self._tail(path, new_file=False)
+
+    # ----------- FILES -----------
+    def _existing_files(self) -> List[str]:
+        files = []
+        for path in self.paths:
+            if os.path.isdir(path):
+                files.extend(sorted(glob.glob(os.path.join(path, self.pattern))))
+            else:
+                files.append(path)
+        return files
+
+    def _follows(self, path: str) -> bool:
+        if path in self.paths:
+            return True
+        return os.path.dirname(path) in self.paths and fnmatch.fnmatch(os.path.basename(path), self.pattern)
+
+    def _tail(self, path: str, new_file: bool) -> HandTail:
+        tail = self._tails.get(path)
+        if tail is None:
+            if path in self._offsets:
+                offset = self._offsets[path]
+            elif self.from_start or new_file or not os.path.exists(path):
+                offset = 0
+            else:
+                offset = os.path.getsize(path)
+            tail = self._tails[path] = HandTail(path, offset=offset)
+        return tail
+
+    @property
+    def offsets(self) -> Dict[str, int]:
+        """Per-file offsets to resume from (complete hands only)."""
+        with self._lock:
+            return {path: tail.resume_offset for path, tail in self._tails.items()}
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        return self.live.frame
+
+    # ----------- UPDATES -----------
+    def update(self, path: PathLike) -> int:
+        """
+        Parse the hands appended to one file since the last update. Returns
+        the number of new rows.
+        """
+        path = os.path.abspath(os.fspath(path))
+        with self._lock:
+            start = time.perf_counter()
+            hand_texts = self._tail(path, new_file=True).read_hands()
+            if not hand_texts:
+                return 0
+            df = pd.DataFrame(list(iter_tour_rows(hand_texts, normalize=self.normalize)))
+            df = self.live.append_new(df)
+            if not df.empty:
+                self._pending.append((df, path))
+            self.last_update = {
+                "path": path,
+                "hands": len(hand_texts),
+                "rows": len(df),
+                "seconds": time.perf_counter() - start,
+            }
+        self._deliver_pending()
+        return len(df)
+
+    def poll(self) -> int:
+        """Update every followed file (no observer needed). Returns the number of new rows."""
+        for path in self._existing_files():
+            self._tail(path, new_file=False)
+        return sum(self.update(path) for path in list(self._tails))
+
+    def _deliver_pending(self) -> None:
+        # One delivery at a time and in read order (store ingest isn't thread-safe);
+        # whoever holds the delivery lock also delivers rows queued meanwhile
+        with self._deliver_lock:
+            while True:
+                with self._lock:
+                    if not self._pending:
+                        return
+                    df, path = self._pending.popleft()
+                if self.store is not None:
+                    self.store.ingest(df)
+                if self.on_update is not None:
+                    self.on_update(df, path)
+
+    # ----------- WATCHDOG -----------
+    def start(self) -> "LiveTail":
+        """Catch up on the current file contents, then follow changes in the background."""
+        if self._observer is not None:
+            return self
+        self.poll()
+        handler = _TailHandler(self)
+        self._observer = Observer()
+        for directory in sorted({p if os.path.isdir(p) else os.path.dirname(p) for p in self.paths}):
+            self._observer.schedule(handler, directory, recursive=False)
+        self._observer.start()
+        return self
+
+    def stop(self) -> None:
+        if self._observer is None:
+            return
+        self._observer.stop()
+        self._observer.join()
+        self._observer = None
+        # Changes that raced with the shutdown
+        self.poll()
+
+    def __enter__(self) -> "LiveTail":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+class _TailHandler(FileSystemEventHandler):
+    def __init__(self, tail: LiveTail):
+        self.tail = tail
+
+    def _handle(self, path) -> None:
+        path = os.path.abspath(os.fsdecode(path))
+        if self.tail._follows(path):
+            try:
+                self.tail.update(path)
+            except Exception as e:
+                print(f"Error tailing {path}: {e}")
+
+    def on_created(self, event: FileSystemEvent) -> None:
+        if not event.is_directory:
+            self._handle(event.src_path)
+
+    def on_modified(self, event: FileSystemEvent) -> None:
+        if not event.is_directory:
+            self._handle(event.src_path)
+
+    def on_moved(self, event: FileSystemEvent) -> None:
+        if not event.is_directory:
+            self._handle(event.dest_path)
@@ -0,0 +1,231 @@
+import mmap
+import os
+import re
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from models.regex_extractor import CashRegexExtraction, RegexExtraction, detect_game_type
+from parser.reader import HAND_SEPARATOR_BYTES
+
+
+PathLike = Union[str, os.PathLike]
+
+INDEX_SUFFIX = ".hidx.npz"
+# Same IDs as extract_hand_id: digits of tournament hands, the full ID of cash hands
+HAND_ID_BYTES = re.compile(rb'Poker Hand #(?:tour_)?(\w+)')
+LEADING_BYTES = re.compile(rb'(?:\xef\xbb\xbf)?\s*')
+# Enough to hold the header line of any hand
+HEADER_BYTES = 512
+
+
+def scan_hand_offsets(buffer) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find every hand in a bytes-like object (bytes, mmap) without decoding it.
+
+    Returns (offsets, lengths, hand_ids) in file order: the byte range of
+    each hand (separators and leading whitespace excluded) and its HandID as
+    bytes (b"" if the block has no hand header).
+    """
+    offsets, lengths, hand_ids = [], [], []
+
+    def add(start: int, end: int) -> None:
+        start = LEADING_BYTES.match(buffer, start, end).end()
+        if start >= end:
+            return
+        match = HAND_ID_BYTES.match(buffer, start, end)
+        offsets.append(start)
+        lengths.append(end - start)
+        hand_ids.append(match.group(1) if match else b"")
+
+    pos = 0
+    for separator in HAND_SEPARATOR_BYTES.finditer(buffer):
+        add(pos, separator.start())
+        pos = separator.end()
+    end = len(buffer)
+    while end > pos and buffer[end - 1:end].isspace():
+        end -= 1
+    add(pos, end)
+
+    return (
+        np.asarray(offsets, dtype=np.int64),
+        np.asarray(lengths, dtype=np.int64),
+        np.asarray(hand_ids, dtype=bytes) if hand_ids else np.empty(0, dtype="S1"),
+    )
+
+
+class HandOffsetIndex:
+    """
+    HandID -> byte range of every hand of a hand-history file, over a
+    read-only memory map of the file.
+
+        with HandOffsetIndex.open("history.txt") as offsets:
+            text = offsets.hand_text("1000299")
+            parser = offsets.extraction("1000299")       # RegexExtraction of that hand
+            ranges = offsets.split(4)                    # byte ranges on hand boundaries
+
+    open() loads the index saved next to the file (history.txt.hidx.npz) and
+    rescans the file only if it changed since (size or modification time).
+    A lookup is a binary search over the sorted HandIDs; hand_buffer()
+    returns a memoryview of the mapped file, so nothing is copied until the
+    hand is decoded.
+    """
+
+    def __init__(
+        self,
+        path: PathLike,
+        offsets: np.ndarray,
+        lengths: np.ndarray,
+        hand_ids: np.ndarray,
+        size: int,
+        mtime_ns: int
+    ):
+        self.path = os.fspath(path)
+        self.offsets = offsets
+        self.lengths = lengths
+        self.hand_ids = hand_ids
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self._order = np.argsort(hand_ids, kind="stable")
+        self._sorted_ids = hand_ids[self._order]
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+
+    # ----------- BUILD / STORAGE -----------
+    @classmethod
+    def build(cls, path: PathLike) -> "HandOffsetIndex":
+        """Scan the file through a memory map."""
+        stat = os.stat(path)
+        if stat.st_size == 0:
+            empty = np.empty(0, dtype=np.int64)
+            return cls(path, empty, empty, np.empty(0, dtype="S1"), 0, stat.st_mtime_ns)
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            offsets, lengths, hand_ids = scan_hand_offsets(mapped)
+        return cls(path, offsets, lengths, hand_ids, stat.st_size, stat.st_mtime_ns)
+
+    @classmethod
+    def open(cls, path: PathLike, index_path: Optional[PathLike] = None, save: bool = True) -> "HandOffsetIndex":
+        """Load the saved index of the file, or build (and save) it if missing or stale."""
+        index_path = os.fspath(index_path) if index_path is not None else os.fspath(path) + INDEX_SUFFIX
+        stat = os.stat(path)
+        if os.path.exists(index_path):
+            with np.load(index_path, allow_pickle=False) as data:
+                if int(data["size"]) == stat.st_size and int(data["mtime_ns"]) == stat.st_mtime_ns:
+                    return cls(
+                        path, data["offsets"], data["lengths"], data["hand_ids"],
+                        int(data["size"]), int(data["mtime_ns"]),
+                    )
+        index = cls.build(path)
+        if save:
+            index.save(index_path)
+        return index
+
+    def save(self, index_path: Optional[PathLike] = None) -> None:
+        index_path = os.fspath(index_path) if index_path is not None else self.path + INDEX_SUFFIX
+        tmp = f"{index_path}.tmp.npz"
+        np.savez(
+            tmp,
+            offsets=self.offsets,
+            lengths=self.lengths.astype(np.int32) if self.lengths.size and self.lengths.max() < 2 ** 31 else self.lengths,
+            hand_ids=self.hand_ids,
+            size=np.array(self.size),
+            mtime_ns=np.array(self.mtime_ns),
+        )
+        os.replace(tmp, index_path)
+
+    # ----------- LOOKUP -----------
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __contains__(self, hand_id: str) -> bool:
+        return self._position(hand_id) is not None
+
+    def _position(self, hand_id: str) -> Optional[int]:
+        key = _hand_id_key(hand_id)
+        i = np.searchsorted(self._sorted_ids, key)
+        if i < len(self._sorted_ids) and self._sorted_ids[i] == key:
+            return int(self._order[i])
+        return None
+
+    def locate(self, hand_id: str) -> Tuple[int, int]:
+        """(byte offset, length) of a hand; KeyError if it isn't in the file."""
+        position = self._position(hand_id)
+        if position is None:
+            raise KeyError(hand_id)
+        return int(self.offsets[position]), int(self.lengths[position])
+
+    def hand_buffer(self, hand_id: str) -> memoryview:
+        """Zero-copy view of the raw bytes of a hand. Release it before close()."""
+        offset, length = self.locate(hand_id)
+        return memoryview(self._mapped())[offset:offset + length]
+
+    def hand_text(self, hand_id: str) -> str:
+        with self.hand_buffer(hand_id) as buffer:
+            return _decode_buffer(buffer)
+
+    def extraction(self, hand_id: str, normalize: bool = True) -> RegexExtraction:
+        """Extractor of a single hand (CashRegexExtraction for cash hands)."""
+        with self.hand_buffer(hand_id) as buffer:
+            header = _decode_buffer(buffer[:HEADER_BYTES]).partition("\n")[0]
+            extractor = CashRegexExtraction if detect_game_type(header) == "cash" else RegexExtraction
+            return extractor.from_buffer(buffer, normalize=normalize)
+
+    # ----------- PARALLEL SPLITS -----------
+    def split(self, parts: int) -> List[Tuple[int, int]]:
+        """
+        Split the file into at most parts (start, end) byte ranges of about
+        the same size, in file order, each holding only whole hands.
+        """
+        if not len(self):
+            return []
+        ends = self.offsets + self.lengths
+        targets = np.linspace(0, ends[-1], parts + 1)[1:-1]
+        cuts = np.unique(np.searchsorted(self.offsets, targets).clip(1, len(self)))
+        starts = np.concatenate([[0], cuts])
+        stops = np.concatenate([cuts, [len(self)]])
+        return [
+            (int(self.offsets[a]), int(ends[b - 1]))
+            for a, b in zip(starts, stops) if b > a
+        ]
+
+    # ----------- MEMORY MAP -----------
+    def _mapped(self) -> mmap.mmap:
+        if self._map is None:
+            self._file = open(self.path, "rb")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = self._file = None
+
+    def __enter__(self) -> "HandOffsetIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def read_hand_range(path: PathLike, start: int, end: int) -> List[str]:
+    """Hand texts of a byte range from HandOffsetIndex.split, in file order."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return [
+        _decode_buffer(part)
+        for part in HAND_SEPARATOR_BYTES.split(data)
+        if part.strip()
+    ]
+
+
+def _hand_id_key(hand_id: str) -> bytes:
+    hand_id = str(hand_id).lstrip("#")
+    if hand_id.startswith("tour_"):
+        hand_id = hand_id[len("tour_"):]
+    return hand_id.encode()
+
+
+def _decode_buffer(buffer) -> str:
+    return str(buffer, "utf-8-sig", errors="replace").strip()
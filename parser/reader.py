@@ -0,0 +1,149 @@
+import io
+import os
+import re
+from typing import IO, Iterator, List, Union
+
+from models import regex_patterns as patterns
+
+
+HandSource = Union[str, os.PathLike, IO]
+
+HAND_SEPARATOR_BYTES = re.compile(rb'\n\s*\n')
+DEFAULT_BLOCK_SIZE = 1 << 20
+
+
+def iter_hand_texts(source: HandSource, reverse: bool = True, block_size: int = DEFAULT_BLOCK_SIZE) -> Iterator[str]:
+    """
+    Yield the raw text of every hand in a hand-history file, one at a time.
+
+    Parameters:
+    - source: path or open file object (text or binary).
+    - reverse: GG writes the newest hand first, so by default hands are yielded
+      from the end of the file to the start (chronological order), reading the
+      file backwards in blocks.
+    - block_size: number of bytes read per block.
+
+    Only one block plus the hand currently being assembled is held in memory.
+    Non-seekable streams can't be read backwards, so with reverse=True their
+    hands are buffered before being yielded.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            yield from iter_hand_texts(f, reverse=reverse, block_size=block_size)
+        return
+
+    binary = _binary_stream(source)
+    if not reverse:
+        yield from _iter_forward(source)
+    elif binary is not None and binary.seekable():
+        yield from _iter_backward(binary, block_size)
+    else:
+        yield from reversed(list(_iter_forward(source)))
+
+
+def split_hand_texts(log_text: str, reverse: bool = True) -> List[str]:
+    """
+    Split an in-memory log into hand texts, in chronological order by default.
+    """
+    hands = [h.strip() for h in patterns.HAND_SEPARATOR.split(log_text.strip()) if h.strip()]
+    return list(reversed(hands)) if reverse else hands
+
+
+def _binary_stream(f: IO):
+    if isinstance(f, io.TextIOBase):
+        return getattr(f, "buffer", None)
+    return f
+
+
+def _decode(raw: bytes) -> str:
+    return raw.decode("utf-8-sig", errors="replace")
+
+
+def _iter_forward(f: IO) -> Iterator[str]:
+    current = []
+    for line in f:
+        if isinstance(line, bytes):
+            line = _decode(line)
+        if line.strip():
+            current.append(line)
+        elif current:
+            yield "".join(current).strip()
+            current = []
+    if current:
+        yield "".join(current).strip()
+
+
+def _iter_backward(f: IO, block_size: int) -> Iterator[str]:
+    start = f.tell()
+    end = f.seek(0, os.SEEK_END)
+    pos = end
+    tail = b""
+    while pos > start:
+        size = min(block_size, pos - start)
+        pos -= size
+        f.seek(pos)
+        parts = HAND_SEPARATOR_BYTES.split(f.read(size) + tail)
+        # The first part may continue in the previous block
+        tail = parts[0]
+        for part in reversed(parts[1:]):
+            if part.strip():
+                yield _decode(part).strip()
+    if tail.strip():
+        yield _decode(tail).strip()
+
+
+class HandTail:
+    """
+    Incremental reader of a hand-history file that is still being written.
+
+    Remembers a byte offset; every read_hands() call reads only the bytes
+    appended since the previous call and returns the hands completed by them,
+    in file order. A hand counts as complete once the blank line that
+    separates it from the next one has been written, so a partially written
+    trailing hand is kept back until it is finished (or flush() is called).
+    A file that shrinks is assumed to have been replaced and is read again
+    from the start.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], offset: int = 0):
+        self.path = os.fspath(path)
+        self.offset = offset
+        self._pending = b""
+
+    def read_hands(self) -> List[str]:
+        try:
+            with open(self.path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size < self.offset:
+                    self.offset, self._pending = 0, b""
+                f.seek(self.offset)
+                data = f.read(size - self.offset)
+        except FileNotFoundError:
+            return []
+        if not data:
+            return []
+        self.offset += len(data)
+
+        buffer = self._pending + data
+        last = None
+        for last in HAND_SEPARATOR_BYTES.finditer(buffer):
+            pass
+        if last is None:
+            self._pending = buffer
+            return []
+        self._pending = buffer[last.end():]
+        return [
+            _decode(part).strip()
+            for part in HAND_SEPARATOR_BYTES.split(buffer[:last.start()])
+            if part.strip()
+        ]
+
+    @property
+    def resume_offset(self) -> int:
+        """Offset to persist: where the first hand not yet returned starts."""
+        return self.offset - len(self._pending)
+
+    def flush(self) -> List[str]:
+        """Return the pending trailing hand as complete (e.g. when the file is closed)."""
+        pending, self._pending = self._pending, b""
+        return [_decode(pending).strip()] if pending.strip() else []
@@ -1,87 +1,453 @@
+from __future__ import annotations
 
+from models.regex_extractor import CashRegexExtraction, RegexExtraction, detect_game_type
+from parser.cash import parse_cash_hand_rows
+from parser.hands import HandColumns, HandField, board_field, check_columns, hand_columns, player_rows
+from parser.reader import HandSource, iter_hand_texts, split_hand_texts
+from collections import deque
+from itertools import islice
+from operator import methodcaller
+import os
+from typing import TYPE_CHECKING, Collection, List, Dict, Iterable, Iterator, Optional, Sequence, Tuple, Literal, Union
 
-from models.regex_extractor import RegexExtraction
-import pandas as pd
-import numpy as np
-import uuid
-import re
-from typing import List, Dict, Optional, Tuple, Literal
-from datetime import datetime
+# pandas, numpy and pyarrow (and the modules built on them) are imported by
+# the functions that need them: parsing to rows must start fast (see cli.py)
+if TYPE_CHECKING:
+    import pandas as pd
+    from utils.profiling import ParseProfile
 
 
-def parse_tour_clean(log_text: str, normalize: bool = True) -> list[dict]:
-    from models.regex_extractor import RegexExtraction  
+TOUR_FIELDS: Dict[str, HandField] = {
+    "Modality": methodcaller("extract_modality"),
+    "TableSize": methodcaller("extract_table_size"),
+    "BuyIn": methodcaller("extract_buyin"),
+    "TournID": methodcaller("extract_tournament_id"),
+    "HandID": methodcaller("extract_hand_id"),
+    "LocalTime": methodcaller("extract_local_time"),
+    "Level": methodcaller("extract_level"),
+    "Ante": methodcaller("extract_ante"),
+    "Blinds": methodcaller("extract_blinds"),
+    "BoardFlop": board_field(0),
+    "BoardTurn": board_field(1),
+    "BoardRiver": board_field(2),
+    "HeroHand": methodcaller("extract_hero_hand"),
+}
 
-    hands = re.split(r'\n\s*\n', log_text.strip())
-    hands = list(reversed([h for h in hands if h.strip()]))  
 
-    parsed_hands = [RegexExtraction(h, normalize=normalize) for h in hands]
-    all_rows = []
+def parse_hand_rows(
+    parser: RegexExtraction,
+    columns: Optional[Sequence[str]] = None,
+    players: Optional[Collection[str]] = None
+) -> List[Dict]:
+    """
+    Build the per-player rows of a single hand, restricted to the given
+    columns and players (see parser.hands.player_rows).
+    """
+    return player_rows(parser, TOUR_FIELDS, columns=columns, players=players)
 
-    for i in range(len(parsed_hands) - 1):
-        current_parser = parsed_hands[i]
 
+def parse_hand_columns(
+    parser: RegexExtraction,
+    columns: Optional[Sequence[str]] = None,
+    players: Optional[Collection[str]] = None
+) -> Optional[HandColumns]:
+    """
+    Columnar version of parse_hand_rows (see parser.hands.hand_columns).
+    """
+    return hand_columns(parser, TOUR_FIELDS, columns=columns, players=players)
+
+
+def iter_tour_hands(
+    hand_texts: Iterable[str],
+    normalize: bool = True,
+    columns: Optional[Sequence[str]] = None,
+    players: Optional[Collection[str]] = None,
+    profile: Optional[ParseProfile] = None,
+    as_columns: bool = False,
+    action_log: bool = False
+) -> Iterator[Union[List[Dict], HandColumns]]:
+    """
+    Parse hand texts one at a time and yield the rows of each hand (or its
+    HandColumns with as_columns=True). Hands that fail to parse are reported
+    and skipped, as are hands without any of the requested players. With a
+    profile, hands and extractors are timed into it.
+
+    action_log=True yields (rows, HandActions) pairs instead, the hand's
+    action log taken from the same extractor (see parser.action_log).
+    """
+    check_columns(TOUR_FIELDS, columns)
+    players = _player_set(players)
+    build = parse_hand_columns if as_columns else parse_hand_rows
+    if action_log:
+        build = _with_action_log(build)
+    if profile is not None:
+        parse_hand = lambda text: build(RegexExtraction(text, normalize=normalize), columns=columns, players=players)
+        yield from profile.iter_hands(hand_texts, parse_hand)
+        return
+    for hand_text in hand_texts:
         try:
-            general_data = {
-                "Modality": current_parser.extract_modality(),
-                "TableSize": current_parser.extract_table_size(),
-                "BuyIn": current_parser.extract_buyin(),
-                "TournID": current_parser.extract_tournament_id(),
-                "HandID": current_parser.extract_hand_id(),
-                "LocalTime": current_parser.extract_local_time(),
-                "Level": current_parser.extract_level(),
-                "Ante": current_parser.extract_ante(),
-                "Blinds": current_parser.extract_blinds(),
-                "BoardFlop": current_parser.extract_board_cards()[0],
-                "BoardTurn": current_parser.extract_board_cards()[1],
-                "BoardRiver": current_parser.extract_board_cards()[2],
-                "HeroHand": current_parser.extract_hero_hand()
-            }
-
-            current_players = current_parser.extract_players_info()
-            current_players = current_parser.sort_players_by_position(current_players)
-            positions = current_parser.assign_positions(current_players)
-
-            for player in current_players:
-                name = player["Player"]
-                current_stack = player["Stack"]
-
-                row = {
-                    **general_data,
-                    "Playing": len(current_players),
-                    "Player": name,
-                    "Seat": player["Seat"],
-                    "PostedAnte": current_parser.extract_posted_ante(name),
-                    "PostedBlind": current_parser.extract_posted_blind(name),
-                    "Position": positions.get(name),
-                    "Stack": current_stack,
-                    "PreflopAction": current_parser.extract_street_action("HOLE CARDS", name),
-                    "FlopAction": current_parser.extract_street_action("FLOP", name),
-                    "TurnAction": current_parser.extract_street_action("TURN", name),
-                    "RiverAction": current_parser.extract_street_action("RIVER", name),
-                    "AnteAllIn": current_parser.extract_ante_allin(name, current_players),
-                    "PreflopAllIn": current_parser.extract_allin("HOLE CARDS", name),
-                    "FlopAllIn": current_parser.extract_allin("FLOP", name),
-                    "TurnAllIn": current_parser.extract_allin("TURN", name),
-                    "RiverAllIn": current_parser.extract_allin("RIVER", name),
-                    "ShowDown": current_parser.extract_showdown_cards(name),
-                    "Result": current_parser.extract_result(name)
-                }
-                all_rows.append(row)
+            rows = build(RegexExtraction(hand_text, normalize=normalize), columns=columns, players=players)
+        except Exception as e:
+            print(f"Error parsing hand: {e}")
+            continue
+        if rows:
+            yield rows
+
+
+def _with_action_log(build):
+    from parser.action_log import hand_actions
+
+    def build_with_log(parser: RegexExtraction, columns=None, players=None):
+        rows = build(parser, columns=columns, players=players)
+        return (rows, hand_actions(parser)) if rows else None
+    return build_with_log
+
+
+def iter_tour_rows(
+    hand_texts: Iterable[str],
+    normalize: bool = True,
+    columns: Optional[Sequence[str]] = None,
+    players: Optional[Collection[str]] = None,
+    profile: Optional[ParseProfile] = None
+) -> Iterator[Dict]:
+    for rows in iter_tour_hands(hand_texts, normalize=normalize, columns=columns, players=players, profile=profile):
+        yield from rows
+
+
+def _player_set(players: Optional[Collection[str]]) -> Optional[frozenset]:
+    if players is None or isinstance(players, frozenset):
+        return players
+    return frozenset([players] if isinstance(players, str) else players)
+
+
+PARALLEL_MIN_HANDS = 2_000
+MIN_CHUNK_HANDS = 250
+MAX_CHUNK_HANDS = 5_000
+STREAM_CHUNK_HANDS = 1_000
+
+
+def _parse_chunk(
+    hand_texts: List[str],
+    normalize: bool,
+    columns: Optional[Sequence[str]] = None,
+    players: Optional[Collection[str]] = None,
+    as_columns: bool = False,
+    action_log: bool = False
+) -> List[Union[List[Dict], HandColumns]]:
+    return list(iter_tour_hands(
+        hand_texts, normalize=normalize, columns=columns, players=players, as_columns=as_columns, action_log=action_log
+    ))
+
+
+def _chunk_size_for(num_hands: int, workers: int) -> int:
+    # ~4 chunks per worker balances the load without paying pickling costs on tiny chunks
+    return max(MIN_CHUNK_HANDS, min(MAX_CHUNK_HANDS, num_hands // (workers * 4) or 1))
+
+
+def iter_tour_hands_parallel(
+    hand_texts: Iterable[str],
+    normalize: bool = True,
+    workers: int = 2,
+    chunk_size: int = STREAM_CHUNK_HANDS,
+    columns: Optional[Sequence[str]] = None,
+    players: Optional[Collection[str]] = None,
+    as_columns: bool = False,
+    action_log: bool = False
+) -> Iterator[Union[List[Dict], HandColumns]]:
+    """
+    Parse hands in a process pool, chunk_size hands per task, yielding the rows
+    of each hand in input order. At most two chunks per worker are in flight,
+    so the input may be a lazy stream.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    check_columns(TOUR_FIELDS, columns)
+    players = _player_set(players)
+    hand_texts = iter(hand_texts)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        while True:
+            while len(pending) < workers * 2:
+                chunk = list(islice(hand_texts, chunk_size))
+                if not chunk:
+                    break
+                pending.append(executor.submit(_parse_chunk, chunk, normalize, columns, players, as_columns, action_log))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+
+def _parse_file_range(
+    path: str,
+    start: int,
+    end: int,
+    normalize: bool,
+    columns: Optional[Sequence[str]] = None,
+    players: Optional[Collection[str]] = None,
+    as_columns: bool = False
+) -> List[Union[List[Dict], HandColumns]]:
+    from parser.offsets import read_hand_range
+
+    # Newest hand first in the file, so reversed for chronological order
+    hand_texts = read_hand_range(path, start, end)[::-1]
+    return _parse_chunk(hand_texts, normalize, columns, players, as_columns)
+
+
+def iter_tour_file_parallel(
+    path: Union[str, os.PathLike],
+    normalize: bool = True,
+    workers: int = 2,
+    chunk_size: int = STREAM_CHUNK_HANDS,
+    columns: Optional[Sequence[str]] = None,
+    players: Optional[Collection[str]] = None,
+    as_columns: bool = False
+) -> Iterator[Union[List[Dict], HandColumns]]:
+    """
+    Parse a hand-history file in a process pool, yielding the rows of each
+    hand in chronological order (same output as iter_tour_hands_parallel over
+    iter_hand_texts). The file is split into byte ranges of about chunk_size
+    hands on hand boundaries (see parser.offsets.HandOffsetIndex); workers
+    read their own range, so no hand text is sent to them.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from parser.offsets import HandOffsetIndex
+
+    check_columns(TOUR_FIELDS, columns)
+    players = _player_set(players)
+    path = os.fspath(path)
+    offsets = HandOffsetIndex.open(path, save=False)
+    ranges = offsets.split(max(1, -(-len(offsets) // chunk_size)))[::-1]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        ranges = iter(ranges)
+        while True:
+            while len(pending) < workers * 2:
+                byte_range = next(ranges, None)
+                if byte_range is None:
+                    break
+                pending.append(executor.submit(_parse_file_range, path, *byte_range, normalize, columns, players, as_columns))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+
+def _parallel_hands(
+    source: HandSource,
+    normalize: bool,
+    workers: int,
+    **options
+) -> Iterator[Union[List[Dict], HandColumns]]:
+    # Paths are split on hand boundaries by byte offset; other sources are streamed
+    if isinstance(source, (str, os.PathLike)):
+        return iter_tour_file_parallel(source, normalize=normalize, workers=workers, **options)
+    return iter_tour_hands_parallel(iter_hand_texts(source), normalize=normalize, workers=workers, **options)
+
+
+def parse_tour_clean(
+    log_text: str,
+    normalize: bool = True,
+    workers: Optional[int] = None,
+    action_format: Literal["list", "arrow"] = "list",
+    columns: Optional[Sequence[str]] = None,
+    players: Optional[Collection[str]] = None,
+    profile: Optional[ParseProfile] = None,
+    compact: bool = False,
+    action_log: bool = False
+) -> Union[list[dict], pd.DataFrame, Tuple[Union[list[dict], pd.DataFrame], pd.DataFrame]]:
+    """
+    Parse a full log into per-player rows in chronological order, every hand
+    included (the original loop skipped the newest hand of the log).
 
+    workers=N parses the hands in N processes. The output is identical to the
+    serial path; logs shorter than PARALLEL_MIN_HANDS are always parsed serially.
+
+    action_format="arrow" returns a DataFrame whose street action columns are
+    Arrow-backed list<struct<action, amount>> columns (see utils.actions)
+    instead of the list of row dicts.
+
+    columns=[...] keeps only those columns, in that order, and players=[...]
+    only the rows of those players. Fields that are not requested are never
+    extracted, so e.g. columns=["HandID", "Player", "PreflopAction"],
+    players=["Hero"] skips the result, all-in and showdown scans entirely.
+
+    profile=ParseProfile() (see utils.profiling) records per-extractor and
+    per-hand timings and the hands that failed to parse. Profiled parses
+    always run serially.
+
+    compact=True builds the DataFrame column by column with compact dtypes
+    (categoricals, integer IDs, float32 amounts, card codes, Arrow actions;
+    see parser.compact.compact_values) instead of returning row dicts.
+
+    action_log=True also builds the long-format action table, one row per
+    action in the order they were taken (see parser.action_log), from the
+    same pass over every hand, and returns (rows, action_log). It covers all
+    players of the hands that were kept, whatever columns and players select.
+    """
+    hand_texts = split_hand_texts(log_text)
+    options = {"columns": columns, "players": players, "as_columns": compact, "action_log": action_log}
+    if profile is not None or not workers or workers <= 1 or len(hand_texts) < PARALLEL_MIN_HANDS:
+        hands = iter_tour_hands(hand_texts, normalize=normalize, profile=profile, **options)
+    else:
+        chunk_size = _chunk_size_for(len(hand_texts), workers)
+        hands = iter_tour_hands_parallel(hand_texts, normalize=normalize, workers=workers, chunk_size=chunk_size, **options)
+
+    if action_log:
+        from parser.action_log import ActionLogBuilder
+
+        log = ActionLogBuilder(compact=compact)
+        result = _collect_rows(log.collect(hands), action_format, compact)
+        return result, log.to_frame()
+    return _collect_rows(hands, action_format, compact)
+
+
+def _collect_rows(
+    hands: Iterable[Union[List[Dict], HandColumns]],
+    action_format: Literal["list", "arrow"],
+    compact: bool
+) -> Union[list[dict], pd.DataFrame]:
+    if compact:
+        from parser.compact import CompactFrameBuilder
+
+        return CompactFrameBuilder().extend(hands).to_frame()
+    rows = [row for rows in hands for row in rows]
+
+    if action_format == "arrow":
+        return _arrow_frame(rows)
+    return rows
+
+
+def stream_tour_clean(
+    source: HandSource,
+    normalize: bool = True,
+    workers: Optional[int] = None,
+    columns: Optional[Sequence[str]] = None,
+    players: Optional[Collection[str]] = None
+) -> Iterator[Dict]:
+    """
+    Streaming version of parse_tour_clean: reads a hand-history file (path or
+    file object) hand by hand and yields rows in chronological order, so memory
+    stays flat regardless of the file size. workers=N parses in N processes.
+    """
+    if not workers or workers <= 1:
+        return iter_tour_rows(iter_hand_texts(source), normalize=normalize, columns=columns, players=players)
+    hands = _parallel_hands(source, normalize=normalize, workers=workers, columns=columns, players=players)
+    return (row for rows in hands for row in rows)
+
+
+def stream_tour_frames(
+    source: HandSource,
+    normalize: bool = True,
+    chunk_size: int = 10_000,
+    workers: Optional[int] = None,
+    action_format: Literal["list", "arrow"] = "list",
+    columns: Optional[Sequence[str]] = None,
+    players: Optional[Collection[str]] = None,
+    compact: bool = False
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a hand-history file as DataFrame chunks of up to chunk_size hands.
+    A hand is never split across two chunks. compact=True yields compact
+    frames (see parse_tour_clean); categories differ from chunk to chunk.
+    """
+    options = {"columns": columns, "players": players, "as_columns": compact}
+    if workers and workers > 1:
+        hands = _parallel_hands(source, normalize=normalize, workers=workers, **options)
+    else:
+        hands = iter_tour_hands(iter_hand_texts(source), normalize=normalize, **options)
+
+    import pandas as pd
+    from parser.compact import CompactFrameBuilder
+
+    if compact:
+        for chunk in iter(lambda: list(islice(hands, chunk_size)), []):
+            yield CompactFrameBuilder().extend(chunk).to_frame()
+        return
+
+    to_frame = _arrow_frame if action_format == "arrow" else pd.DataFrame
+    rows = []
+    hands_in_chunk = 0
+    for hand_rows in hands:
+        rows.extend(hand_rows)
+        hands_in_chunk += 1
+        if hands_in_chunk == chunk_size:
+            yield to_frame(rows)
+            rows, hands_in_chunk = [], 0
+    if rows:
+        yield to_frame(rows)
+
+
+def _arrow_frame(rows: List[Dict]) -> pd.DataFrame:
+    import pandas as pd
+    from utils.actions import encode_action_columns
+
+    return encode_action_columns(pd.DataFrame(rows))
+
+
+
+# ----------- MIXED LOGS -----------
+GAME_TYPES = ("tour", "cash")
+
+_HAND_PARSERS = {
+    "tour": (RegexExtraction, parse_hand_rows),
+    "cash": (CashRegexExtraction, parse_cash_hand_rows),
+}
+
+
+def iter_mixed_hands(hand_texts: Iterable[str], normalize: bool = True) -> Iterator[Tuple[str, List[Dict]]]:
+    """
+    Detect the game type of every hand from its header and parse it with the
+    matching extractor, yielding (game_type, rows). Hands with an unknown
+    header or that fail to parse are reported and skipped.
+    """
+    for hand_text in hand_texts:
+        header = hand_text.partition("\n")[0]
+        game_type = detect_game_type(header)
+        if game_type is None:
+            print(f"Unknown game type: {header[:80]}")
+            continue
+        extractor, build_rows = _HAND_PARSERS[game_type]
+        try:
+            rows = build_rows(extractor(hand_text, normalize=normalize))
         except Exception as e:
             print(f"Error parsing hand: {e}")
             continue
+        yield game_type, rows
+
+
+def parse_mixed_log(source: Union[str, HandSource], normalize: bool = True) -> Dict[str, pd.DataFrame]:
+    """
+    Parse a log that mixes tournament and cash hands in a single read, returning
+    {"tour": DataFrame, "cash": DataFrame} (chronological order in each).
 
-    return all_rows
+    source is the log text itself (anything containing a newline), or a path /
+    file object which is then streamed hand by hand.
+    """
+    if isinstance(source, str) and "\n" in source:
+        hand_texts = split_hand_texts(source)
+    else:
+        hand_texts = iter_hand_texts(source)
 
+    import pandas as pd
 
+    rows = {game_type: [] for game_type in GAME_TYPES}
+    for game_type, hand_rows in iter_mixed_hands(hand_texts, normalize=normalize):
+        rows[game_type].extend(hand_rows)
+    return {game_type: pd.DataFrame(game_rows) for game_type, game_rows in rows.items()}
 
 
-def parse_full_log_to_dataframe(log_text: str, game_type:str, normalize: bool = True) -> pd.DataFrame:
-  if game_type == 'tour':
-    return pd.DataFrame(parse_tour(log_text, normalize=normalize))
-  elif game_type == 'cash':
-    return pd.DataFrame(parse_cash(log_text, normalize=normalize))
-  else:
-    print('Game type is not exists')
\ No newline at end of file
+def parse_full_log_to_dataframe(
+    log_text: str,
+    game_type: str = "mixed",
+    normalize: bool = True
+) -> Union[pd.DataFrame, Dict[str, pd.DataFrame]]:
+    """
+    Parse a log into a DataFrame of the requested game type ('tour' or 'cash');
+    hands of the other type are skipped instead of being misparsed.
+    game_type='mixed' returns both frames, {"tour": ..., "cash": ...}, from the
+    same pass over the log.
+    """
+    if game_type not in GAME_TYPES and game_type != "mixed":
+        print('Game type is not exists')
+        return None
+    frames = parse_mixed_log(log_text, normalize=normalize)
+    return frames if game_type == "mixed" else frames[game_type]
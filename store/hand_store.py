@@ -0,0 +1,288 @@
+import json
+import os
+import uuid
+import warnings
+from typing import Dict, Iterable, List, Literal, Optional, Sequence, Set, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from parser.reader import HandSource
+from parser.tour import stream_tour_frames
+from utils.actions import (
+    ACTION_COLUMNS,
+    ACTION_LIST_TYPE,
+    arrow_actions_mapper,
+    decode_action_columns,
+    encode_action_columns,
+)
+from utils.hand_index import KEY_COLUMNS, HandIndex
+from utils.validation import balance_errors
+
+
+# Arrow types of the parse_tour_clean columns; other columns are inferred
+COLUMN_TYPES = {
+    "Modality": pa.string(),
+    "TableSize": pa.string(),
+    "BuyIn": pa.list_(pa.int64()),
+    "TournID": pa.string(),
+    "HandID": pa.string(),
+    "LocalTime": pa.timestamp("s"),
+    "Level": pa.string(),
+    "Ante": pa.float64(),
+    "Blinds": pa.list_(pa.float64()),
+    "BoardFlop": pa.list_(pa.string()),
+    "BoardTurn": pa.list_(pa.string()),
+    "BoardRiver": pa.list_(pa.string()),
+    "HeroHand": pa.list_(pa.string()),
+    "Playing": pa.int64(),
+    "Player": pa.string(),
+    "Seat": pa.int64(),
+    "PostedAnte": pa.float64(),
+    "PostedBlind": pa.float64(),
+    "Position": pa.string(),
+    "Stack": pa.float64(),
+    **{col: ACTION_LIST_TYPE for col in ACTION_COLUMNS},
+    "AnteAllIn": pa.bool_(),
+    "PreflopAllIn": pa.bool_(),
+    "FlopAllIn": pa.bool_(),
+    "TurnAllIn": pa.bool_(),
+    "RiverAllIn": pa.bool_(),
+    "ShowDown": pa.list_(pa.string()),
+    "Result": pa.string(),
+    "Balance": pa.float64(),
+    "Invested": pa.float64(),
+    "Date": pa.string(),
+}
+
+PARTITION_COLUMNS = ("Date", "TournID")
+METADATA_FILE = "_store.json"
+INDEX_DIR = "_index"
+
+Filters = Union[ds.Expression, List]
+
+
+class HandStore:
+    """
+    Persistent, deduplicated store of parsed hands: a hive-partitioned Parquet
+    dataset on local disk.
+
+        store = HandStore("~/gg_store")
+        store.ingest_file("history.txt")      # only hands not stored yet are written
+        df = store.load(columns=["HandID", "Player", "PreflopAction"],
+                        filters=[("TournID", "==", "#555")])
+
+    Hands are keyed by HandID. Action columns are stored Arrow-encoded
+    (see utils.actions) and decoded back to lists on load. Every data file
+    gets a HandIndex under _index/, written when the file is; index()
+    combines them for the rows of load().
+    """
+
+    def __init__(self, root: Union[str, os.PathLike], partition_by: Sequence[str] = ("Date",)):
+        self.root = os.path.expanduser(os.fspath(root))
+        os.makedirs(self.root, exist_ok=True)
+
+        metadata_path = os.path.join(self.root, METADATA_FILE)
+        if os.path.exists(metadata_path):
+            with open(metadata_path) as f:
+                partition_by = json.load(f)["partition_by"]
+        else:
+            unknown = set(partition_by) - set(PARTITION_COLUMNS)
+            if unknown:
+                raise ValueError(f"Can only partition by {PARTITION_COLUMNS}, got {sorted(unknown)}")
+            with open(metadata_path, "w") as f:
+                json.dump({"partition_by": list(partition_by)}, f)
+
+        self.partition_by = list(partition_by)
+        self._hand_ids: Optional[Set[str]] = None
+        # Stores only grow, so once a data file is seen the store is never empty again
+        self._has_data = False
+
+    # ----------- DATASET -----------
+    @property
+    def partitioning(self) -> ds.Partitioning:
+        return ds.partitioning(pa.schema([(col, pa.string()) for col in self.partition_by]), flavor="hive")
+
+    def dataset(self) -> ds.Dataset:
+        return ds.dataset(
+            self.root,
+            format="parquet",
+            partitioning=self.partitioning,
+            exclude_invalid_files=True,
+            ignore_prefixes=[".", "_"],
+        )
+
+    @property
+    def hand_ids(self) -> Set[str]:
+        """HandIDs already in the store (read once, then kept up to date by ingest)."""
+        if self._hand_ids is None:
+            self._hand_ids = set()
+            if not self._is_empty():
+                table = self.dataset().to_table(columns=["HandID"])
+                self._hand_ids.update(pc.unique(table.column("HandID")).to_pylist())
+                self._hand_ids.discard(None)
+        return self._hand_ids
+
+    def __contains__(self, hand_id: str) -> bool:
+        return hand_id in self.hand_ids
+
+    def __len__(self) -> int:
+        return len(self.hand_ids)
+
+    # ----------- INGEST -----------
+    def ingest(self, data: Union[pd.DataFrame, List[Dict]], validate: bool = True) -> int:
+        """
+        Append the hands of a parsed frame (or parse_tour_clean rows) that are
+        not in the store yet. Returns the number of new hands written.
+
+        With validate (and a Balance column), hands whose balances don't sum
+        to zero are not written, with a warning (see utils.validation). Only
+        hands with a row for every player (Playing) are checked, so frames
+        projected on some players (parse_tour_clean(players=...)) are stored
+        as they are.
+
+        Compact frames (parse_tour_clean(compact=True)) are rejected: their
+        integer HandIDs and card codes don't match the stored columns.
+        """
+        df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+        if df.empty:
+            return 0
+        if pd.api.types.is_integer_dtype(df["HandID"]):
+            raise ValueError("HandStore can't ingest compact frames (integer HandID); parse without compact=True")
+
+        df = df[df["HandID"].notna() & ~df["HandID"].isin(self.hand_ids)]
+        df = df.drop_duplicates(subset=["HandID", "Player"])
+        if validate and "Balance" in df.columns:
+            errors = balance_errors(df[_complete_hands(df)])
+            if not errors.empty:
+                warnings.warn(
+                    f"Skipping {len(errors)} hands that don't balance: {errors.index[:10].tolist()}",
+                    stacklevel=2,
+                )
+                df = df[~df["HandID"].isin(errors.index)]
+        if df.empty:
+            return 0
+
+        df = encode_action_columns(df)
+        if "LocalTime" in df.columns:
+            df = df.assign(Date=pd.to_datetime(df["LocalTime"]).dt.strftime("%Y-%m-%d"))
+
+        # Drop the pandas metadata: columns are rebuilt from the Arrow types on load
+        table = pa.Table.from_pandas(df, schema=self._schema_for(df), preserve_index=False).replace_schema_metadata()
+        written = []
+        pq.write_to_dataset(
+            table,
+            self.root,
+            partition_cols=self.partition_by,
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            file_visitor=lambda written_file: written.append(written_file.path),
+        )
+        for path in written:
+            self._file_index(path)
+        self._has_data = True
+
+        new_hands = set(df["HandID"].unique())
+        self.hand_ids.update(new_hands)
+        return len(new_hands)
+
+    def ingest_file(
+        self,
+        source: HandSource,
+        normalize: bool = True,
+        chunk_size: int = 50_000,
+        validate: bool = True
+    ) -> int:
+        """
+        Stream a hand-history file into the store, chunk by chunk.
+        """
+        return sum(
+            self.ingest(frame, validate=validate)
+            for frame in stream_tour_frames(source, normalize=normalize, chunk_size=chunk_size)
+        )
+
+    def ingest_files(self, sources: Iterable[HandSource], normalize: bool = True, validate: bool = True) -> int:
+        return sum(self.ingest_file(source, normalize=normalize, validate=validate) for source in sources)
+
+    # ----------- LOAD -----------
+    def load(
+        self,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Filters] = None,
+        action_format: Literal["list", "arrow"] = "list"
+    ) -> pd.DataFrame:
+        """
+        Load stored rows. Only the requested columns are read and filters are
+        pushed down into the Parquet scan (partition pruning and row-group
+        statistics). Filters are a pyarrow expression or pandas-style
+        [("col", "op", value), ...] tuples.
+        """
+        if self._is_empty():
+            return pd.DataFrame(columns=columns)
+
+        if filters is not None and not isinstance(filters, ds.Expression):
+            filters = pq.filters_to_expression(filters)
+
+        table = self.dataset().to_table(columns=columns, filter=filters)
+        df = table.to_pandas(types_mapper=arrow_actions_mapper)
+        return df if action_format == "arrow" else decode_action_columns(df)
+
+    # ----------- INDEX -----------
+    def index(self) -> HandIndex:
+        """
+        HandIndex of the whole store, with row positions matching load()
+        without filters. Combined from the per-file indexes; files without
+        one (stores written before indexes existed) are indexed once.
+        """
+        if self._is_empty():
+            return HandIndex()
+        indexes = []
+        for fragment in self.dataset().get_fragments():
+            index = self._file_index(fragment.path)
+            # Partition columns live in the directory names, not in the files
+            for column, value in ds.get_partition_keys(fragment.partition_expression).items():
+                if column in KEY_COLUMNS:
+                    index.fill(column, value)
+            indexes.append(index)
+        return HandIndex.concat(indexes)
+
+    def _index_path(self, path: str) -> str:
+        relative = os.path.relpath(path, self.root)
+        return os.path.join(self.root, INDEX_DIR, f"{relative}.npz")
+
+    def _file_index(self, path: str) -> HandIndex:
+        index_path = self._index_path(path)
+        if os.path.exists(index_path):
+            return HandIndex.load(index_path)
+        columns = [col for col in (*KEY_COLUMNS, *ACTION_COLUMNS) if col in pq.read_schema(path).names]
+        index = HandIndex.build(pq.read_table(path, columns=columns).to_pandas(types_mapper=arrow_actions_mapper))
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        index.save(index_path)
+        return index
+
+    def _is_empty(self) -> bool:
+        if not self._has_data:
+            self._has_data = any(
+                name.endswith(".parquet")
+                for _, _, files in os.walk(self.root)
+                for name in files
+            )
+        return not self._has_data
+
+    def _schema_for(self, df: pd.DataFrame) -> pa.Schema:
+        inferred = pa.Schema.from_pandas(df, preserve_index=False)
+        return pa.schema([
+            pa.field(name, COLUMN_TYPES.get(name, inferred.field(name).type))
+            for name in df.columns
+        ])
+
+
+def _complete_hands(df: pd.DataFrame) -> pd.Series:
+    """Rows of the hands that have a row for every player (all rows without a Playing column)."""
+    if "Playing" not in df.columns:
+        return pd.Series(True, index=df.index)
+    rows = df.groupby("HandID", sort=False)["HandID"].transform("size")
+    return rows == df["Playing"]
@@ -0,0 +1,25 @@
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_log, write_log
+from parser.tour import parse_tour_clean
+
+
+# Small enough for the whole suite to run in seconds, large enough to hit every table size and street
+LOG_HANDS = 300
+
+
+@pytest.fixture(scope="session")
+def log_text() -> str:
+    return generate_log(LOG_HANDS, seed=1, table_size=None)
+
+
+@pytest.fixture(scope="session")
+def log_path(tmp_path_factory) -> str:
+    return write_log(str(tmp_path_factory.mktemp("logs") / "log.txt"), LOG_HANDS, seed=1, table_size=None)
+
+
+@pytest.fixture(scope="session")
+def frame(log_text) -> pd.DataFrame:
+    """parse_tour_clean rows of log_text; tests must not modify it."""
+    return pd.DataFrame(parse_tour_clean(log_text))
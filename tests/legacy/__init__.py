@@ -0,0 +1,4 @@
+"""
+The baseline implementations, kept verbatim (imports aside) as references
+for the parity tests: the optimized code must give the same results.
+"""
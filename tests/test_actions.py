@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from parser.tour import parse_tour_clean
+from utils.actions import (
+    ACTION_COLUMNS,
+    ACTION_DTYPE,
+    actions_to_arrow,
+    arrow_actions_mapper,
+    arrow_to_actions,
+    decode_action_columns,
+    encode_action_columns,
+)
+
+
+def test_round_trip_keeps_placeholders_and_missing_values():
+    values = [
+        [["raise", 2.5], ["call", 1.0]],
+        [[None]],
+        [["fold", None]],
+        [["check", None], ["bet", 0.75], ["raise", 3.0]],
+        None,
+        [],
+    ]
+    assert arrow_to_actions(actions_to_arrow(values)) == values
+    # NaN (e.g. from a reindexed frame) is a missing list, like None
+    assert arrow_to_actions(actions_to_arrow([np.nan])) == [None]
+
+
+def test_arrow_parse_matches_list_parse(log_text):
+    rows = pd.DataFrame(parse_tour_clean(log_text))
+    arrow = parse_tour_clean(log_text, action_format="arrow")
+
+    assert all(arrow[col].dtype == ACTION_DTYPE for col in ACTION_COLUMNS)
+    pd.testing.assert_frame_equal(decode_action_columns(arrow), rows)
+    pd.testing.assert_frame_equal(encode_action_columns(rows), arrow)
+
+
+def test_parquet_round_trip(log_text, tmp_path):
+    arrow = parse_tour_clean(log_text, action_format="arrow")[["HandID", "Player", *ACTION_COLUMNS]]
+    path = str(tmp_path / "actions.parquet")
+    pq.write_table(pa.Table.from_pandas(arrow, preserve_index=False).replace_schema_metadata(), path)
+
+    loaded = pq.read_table(path).to_pandas(types_mapper=arrow_actions_mapper)
+    pd.testing.assert_frame_equal(loaded, arrow)
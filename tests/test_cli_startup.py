@@ -0,0 +1,73 @@
+"""
+The light CLI commands (--help, validate, parse to JSON lines) must start
+without pandas, numpy or pyarrow and within STARTUP_BUDGET_SECONDS of a bare
+interpreter start (see cli.py and the startup suite of benchmarks.suite).
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.suite import (
+    CLI_PATH,
+    HEAVY_MODULES,
+    IMPORT_PROBE,
+    STARTUP_BUDGET_SECONDS,
+    STARTUP_HANDS,
+    STARTUP_REPEAT,
+    timed,
+)
+from benchmarks.synthetic import write_log
+
+
+LIGHT_COMMANDS = {
+    "--help": lambda path: ["--help"],
+    "validate": lambda path: ["-q", "validate", path],
+    "parse jsonl": lambda path: ["-q", "parse", path, "--out", "-"],
+}
+
+
+@pytest.fixture(scope="module")
+def small_log(tmp_path_factory) -> str:
+    return write_log(str(tmp_path_factory.mktemp("startup") / "log.txt"), STARTUP_HANDS, seed=1)
+
+
+def _run(command):
+    return subprocess.run(command, capture_output=True, text=True)
+
+
+def _cli(args):
+    return [sys.executable, CLI_PATH, *args]
+
+
+@pytest.mark.parametrize("case", LIGHT_COMMANDS)
+def test_light_command_skips_heavy_imports(case, small_log):
+    probe = IMPORT_PROBE.format(cli=CLI_PATH, root=os.path.dirname(CLI_PATH), heavy=HEAVY_MODULES)
+    result = _run([sys.executable, "-c", probe, *LIGHT_COMMANDS[case](small_log)])
+    # validate exits with 1 when a hand doesn't balance; anything else is a crash
+    assert result.returncode in (0, 1), result.stderr
+    imported = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else ""
+    assert not imported, f"cli.py {case} imported {imported}"
+
+
+@pytest.mark.parametrize("case", LIGHT_COMMANDS)
+def test_light_command_starts_within_budget(case, small_log):
+    baseline = timed(lambda: _run([sys.executable, "-c", "pass"]), repeat=STARTUP_REPEAT)
+    seconds = timed(lambda: _run(_cli(LIGHT_COMMANDS[case](small_log))), repeat=STARTUP_REPEAT)
+    assert seconds - baseline <= STARTUP_BUDGET_SECONDS, (
+        f"cli.py {case} took {seconds - baseline:.3f}s over a bare start (budget {STARTUP_BUDGET_SECONDS}s)"
+    )
+
+
+def test_parse_jsonl_output(small_log):
+    result = _run(_cli(["-q", "parse", small_log, "--out", "-"]))
+    assert result.returncode == 0, result.stderr
+    assert len(result.stdout.splitlines()) > STARTUP_HANDS
+
+
+def test_unknown_column_is_usage_error(small_log):
+    result = _run(_cli(["parse", small_log, "--columns", "Bogus"]))
+    assert result.returncode == 2
+    assert "Unknown columns: ['Bogus']" in result.stderr
+    assert "Traceback" not in result.stderr and not result.stdout
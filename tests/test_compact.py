@@ -0,0 +1,50 @@
+"""
+Compact parse output (parse_tour_clean(compact=True)) against the row
+output: same values in compact dtypes.
+"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from parser.compact import CARD_COLUMNS, CATEGORY_COLUMNS, FLOAT32_COLUMNS, ID_COLUMNS, compact_frame
+from parser.tour import parse_tour_clean
+from utils.actions import ACTION_COLUMNS, decode_action_columns
+from utils.cards import decode_cards
+
+
+@pytest.fixture(scope="module")
+def compact(log_text) -> pd.DataFrame:
+    return parse_tour_clean(log_text, compact=True)
+
+
+def test_matches_converted_rows(frame, compact):
+    pd.testing.assert_frame_equal(compact, compact_frame(frame))
+
+
+def test_values_round_trip(frame, compact):
+    assert list(compact.columns) == list(frame.columns)
+    for col in frame.columns:
+        if col in CATEGORY_COLUMNS:
+            assert compact[col].astype(object).tolist() == frame[col].tolist(), col
+        elif col in ID_COLUMNS:
+            assert compact[col].tolist() == [int(v.lstrip("#")) for v in frame[col]], col
+        elif col in FLOAT32_COLUMNS:
+            np.testing.assert_allclose(compact[col], frame[col].astype(float), rtol=1e-6, err_msg=col)
+        elif col in CARD_COLUMNS:
+            assert decode_cards(pa.array(compact[col]).to_pylist()) == frame[col].tolist(), col
+        elif col in ACTION_COLUMNS:
+            assert decode_action_columns(compact[[col]])[col].tolist() == frame[col].tolist(), col
+        elif col == "LocalTime":
+            assert compact[col].tolist() == pd.to_datetime(frame[col]).tolist()
+        else:
+            # Playing, Seat, the all-in flags, Blinds and BuyIn
+            assert pa.array(compact[col]).to_pylist() == frame[col].tolist(), col
+
+
+def test_projection(log_text, frame):
+    columns = ["HandID", "Player", "Position", "HeroHand", "PreflopAction", "Balance"]
+    players = frame["Player"].value_counts().index[:3].tolist()
+    projected = parse_tour_clean(log_text, compact=True, columns=columns, players=players)
+    rows = pd.DataFrame(parse_tour_clean(log_text, columns=columns, players=players))
+    pd.testing.assert_frame_equal(projected, compact_frame(rows))
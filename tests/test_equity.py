@@ -0,0 +1,147 @@
+"""
+The vectorized hand evaluator and all-in equity against a brute-force
+reference: every five-card subset scored with a plain Python ranking.
+"""
+import itertools
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.cards import CARD_CODES, NO_CARD
+from utils.equity import AllInSpots, equity_columns, spot_equities
+from utils.evaluator import HAND_CATEGORIES, NO_RANK, category_names, evaluate_hands
+
+
+def _five_card_rank(cards):
+    ranks = sorted((c // 4 for c in cards), reverse=True)
+    flush = len({c % 4 for c in cards}) == 1
+    groups = sorted(Counter(ranks).items(), key=lambda item: (-item[1], -item[0]))
+    distinct = sorted(set(ranks), reverse=True)
+    straight = None
+    if len(distinct) == 5:
+        if distinct[0] - distinct[4] == 4:
+            straight = distinct[0]
+        elif distinct == [12, 3, 2, 1, 0]:
+            straight = 3  # the wheel, five-high
+    counts = [count for _, count in groups]
+    kickers = tuple(rank for rank, _ in groups)
+    if straight is not None and flush:
+        return (8, straight)
+    if counts[0] == 4:
+        return (7, *kickers)
+    if counts[:2] == [3, 2]:
+        return (6, *kickers)
+    if flush:
+        return (5, *ranks)
+    if straight is not None:
+        return (4, straight)
+    if counts[0] == 3:
+        return (3, *kickers)
+    if counts[:2] == [2, 2]:
+        return (2, *kickers)
+    if counts[0] == 2:
+        return (1, *kickers)
+    return (0, *ranks)
+
+
+def reference_rank(cards):
+    return max(_five_card_rank(five) for five in itertools.combinations(cards, 5))
+
+
+def _cards(*names):
+    return [CARD_CODES[name] for name in names]
+
+
+@pytest.mark.parametrize("num_cards", [5, 6, 7])
+def test_scores_order_hands_like_the_reference(num_cards):
+    rng = np.random.default_rng(num_cards)
+    hands = np.array([rng.choice(52, num_cards, replace=False) for _ in range(3_000)], dtype=np.uint8)
+    scores = evaluate_hands(hands)
+    reference = [reference_rank(hand.tolist()) for hand in hands]
+
+    # Same order and same ties: the dense ranks of both must be identical
+    distinct = sorted(set(reference))
+    reference_order = np.array([distinct.index(r) for r in reference])
+    score_order = np.unique(scores, return_inverse=True)[1]
+    np.testing.assert_array_equal(score_order, reference_order)
+    assert category_names(scores).tolist() == [HAND_CATEGORIES[r[0]] for r in reference]
+
+
+def test_named_hands():
+    hands = np.array([
+        _cards("Ah", "2h", "3h", "4h", "5h", "Kd", "Kc"),  # steel wheel
+        _cards("Ah", "2d", "3h", "4h", "5c", "Kd", "Kc"),  # wheel beats the pair of kings
+        _cards("As", "Ad", "Ac", "Ah", "Kh", "Kd", "Kc"),
+        _cards("Ts", "Td", "Tc", "9h", "9d", "9c", "2s"),
+        _cards("Ts", "Td", "2c", "2h", "9d", "9c", "Ks"),
+    ], dtype=np.uint8)
+    assert category_names(evaluate_hands(hands)).tolist() == [
+        "Straight Flush", "Straight", "Four Of A Kind", "Full House", "Two Pair",
+    ]
+
+
+def test_fewer_than_five_cards_is_no_rank():
+    hand = np.array([_cards("Ah", "Kh", "Qh") + [NO_CARD] * 4], dtype=np.uint8)
+    assert evaluate_hands(hand).tolist() == [NO_RANK]
+
+
+def _reference_equity(holes, board, pots):
+    """Exact (equity, expected winnings) of one spot over every runout."""
+    dead = set(board) | {c for hole in holes for c in hole}
+    deck = [c for c in range(52) if c not in dead]
+    n = len(holes)
+    equity, winnings, runouts = np.zeros(n), np.zeros(n), 0
+    for runout in itertools.combinations(deck, 5 - len(board)):
+        final = list(board) + list(runout)
+        ranks = [reference_rank(list(hole) + final) for hole in holes]
+        for layer, pot in enumerate(pots):
+            # Side pot `layer` is contested by the players with at least the layer-th smallest stake
+            eligible = list(range(layer, n))
+            best = max(ranks[p] for p in eligible)
+            winners = [p for p in eligible if ranks[p] == best]
+            for p in winners:
+                winnings[p] += pot / len(winners)
+                if layer == 0:
+                    equity[p] += 1 / len(winners)
+        runouts += 1
+    return equity / runouts, winnings / runouts
+
+
+@pytest.mark.parametrize("holes, board, stakes, pots", [
+    # Heads-up on the flop: 990 runouts, enumerated exactly
+    ([_cards("Ah", "As"), _cards("Kd", "Kc")], _cards("2c", "7d", "Ks"), [10.0, 10.0], [20.0, 0.0]),
+    # Three-way on the turn with a short stack: main pot and one side pot
+    ([_cards("Ah", "As"), _cards("Kd", "Kc"), _cards("Qh", "Qd")], _cards("2c", "7d", "9s", "3h"),
+     [5.0, 10.0, 10.0], [15.0, 10.0, 0.0]),
+])
+def test_spot_equity_matches_enumeration(holes, board, stakes, pots):
+    spots = AllInSpots(
+        rows=np.arange(len(holes))[None, :],
+        holes=np.array([holes], dtype=np.uint8),
+        board=np.array([board], dtype=np.uint8),
+        stakes=np.array([stakes]),
+        pots=np.array([pots]),
+    )
+    [(equity, winnings)] = spot_equities([spots], seed=0)
+    expected_equity, expected_winnings = _reference_equity(holes, board, pots)
+    np.testing.assert_allclose(equity[0], expected_equity)
+    np.testing.assert_allclose(winnings[0], expected_winnings)
+
+
+def test_equity_columns_conserve_chips(frame):
+    equity = equity_columns(frame, seed=1)
+    spots = equity["AllInEquity"].notna()
+    assert spots.any()
+
+    per_hand = frame[spots].assign(**equity[spots]).groupby("HandID")[["AllInEquity", "AllInEV", "Balance"]].sum()
+    np.testing.assert_allclose(per_hand["AllInEquity"], 1.0)
+    # Expected winnings share out the same pots as the actual results
+    np.testing.assert_allclose(per_hand["AllInEV"], per_hand["Balance"], atol=1e-9)
+    # Outside all-in spots AllInEV is the Balance
+    pd.testing.assert_series_equal(equity.loc[~spots, "AllInEV"], frame.loc[~spots, "Balance"].astype(float), check_names=False)
+
+
+def test_equity_columns_workers_give_identical_results(frame):
+    pd.testing.assert_frame_equal(equity_columns(frame, seed=1, workers=2), equity_columns(frame, seed=1))
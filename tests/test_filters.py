@@ -0,0 +1,95 @@
+"""
+The vectorized filters against the baseline per-row implementations
+(tests.legacy.filters), on parsed hands and on random action lists.
+"""
+import pandas as pd
+import pytest
+
+from benchmarks.bench_filters import build_frame
+from tests.legacy import filters as legacy
+from utils import filters
+from utils.actions import ACTION_COLUMNS, encode_action_columns
+
+
+ACTIONS = ["fold", "check", "call", "bet", "raise"]
+COMPARISONS = ["gte", "lte", "gt", "lt", "eq"]
+
+
+@pytest.fixture(scope="module")
+def random_frame() -> pd.DataFrame:
+    return build_frame(5_000, seed=7)
+
+
+@pytest.fixture(scope="module", params=["parsed", "random"])
+def frames(request, frame, random_frame):
+    """(list-format frame, the same frame with Arrow action columns)."""
+    df = frame if request.param == "parsed" else random_frame
+    return df, encode_action_columns(df)
+
+
+@pytest.mark.parametrize("column", ACTION_COLUMNS)
+@pytest.mark.parametrize("action", ACTIONS)
+@pytest.mark.parametrize("street", [None, 1, 2, 4])
+def test_filter_action(frames, column, action, street):
+    df, arrow = frames
+    expected = legacy.FilterAction(df, column, action, street)
+    pd.testing.assert_frame_equal(filters.FilterAction(df, column, action, street), expected)
+    assert filters.FilterAction(arrow, column, action, street).index.equals(expected.index)
+
+
+@pytest.mark.parametrize("column", ["PreflopAction", "FlopAction"])
+@pytest.mark.parametrize("comparison", COMPARISONS)
+@pytest.mark.parametrize("amount", [0.0, 2.5, 10])
+@pytest.mark.parametrize("street", [None, 1, 3])
+def test_filter_action_amount(frames, column, comparison, amount, street):
+    df, arrow = frames
+    expected = legacy.FilterActionAmount(df, column, comparison, amount, street)
+    pd.testing.assert_frame_equal(filters.FilterActionAmount(df, column, comparison, amount, street), expected)
+    assert filters.FilterActionAmount(arrow, column, comparison, amount, street).index.equals(expected.index)
+
+
+def test_filter_action_amount_unknown_comparison_keeps_nothing(frame):
+    # As in the baseline, which compared against none of the known operators
+    assert legacy.FilterActionAmount(frame, "PreflopAction", "ne", 1.0).empty
+    assert filters.FilterActionAmount(frame, "PreflopAction", "ne", 1.0).empty
+
+
+# ----------- HAND-LEVEL FILTERS -----------
+STREETS = ["Flop", "Turn", "River"]
+POSITION_SETS = [["small blind", "big blind"], ["button", "big blind", "cutoff"], ["big blind"]]
+
+
+@pytest.mark.parametrize("street", STREETS)
+def test_detect_check_raises(frame, street):
+    expected = legacy.detect_check_raises(frame, street)
+    assert not expected.empty
+    pd.testing.assert_frame_equal(filters.detect_check_raises(frame, street, include_flags=True), expected)
+    pd.testing.assert_frame_equal(filters.detect_check_raises(frame, street), frame.loc[expected.index])
+
+
+@pytest.mark.parametrize("street", STREETS)
+@pytest.mark.parametrize("positions", POSITION_SETS)
+@pytest.mark.parametrize("players", [0, 1, 2])
+def test_filter_postflop_players_by_position(frame, street, positions, players):
+    if players > len(positions):
+        pytest.skip("more players than positions")
+    expected = legacy.filter_postflop_players_by_position(frame, positions, players, street)
+    pd.testing.assert_frame_equal(filters.filter_postflop_players_by_position(frame, positions, players, street), expected)
+
+
+@pytest.mark.parametrize("street", STREETS)
+def test_filter_all_checked_on_street(frame, street):
+    expected = legacy.filter_all_checked_on_street(frame, street)
+    assert not expected.empty
+    pd.testing.assert_frame_equal(
+        filters.filter_all_checked_on_street(frame, street, include_flags=True), expected
+    )
+
+
+@pytest.mark.parametrize("street", STREETS)
+def test_hand_filters_with_arrow_actions(frame, street):
+    arrow = encode_action_columns(frame)
+    assert filters.detect_check_raises(arrow, street).index.equals(filters.detect_check_raises(frame, street).index)
+    assert filters.filter_all_checked_on_street(arrow, street).index.equals(
+        filters.filter_all_checked_on_street(frame, street).index
+    )
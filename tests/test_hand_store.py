@@ -0,0 +1,47 @@
+import warnings
+
+import pandas as pd
+import pytest
+
+from parser.tour import parse_tour_clean
+from store.hand_store import HandStore
+from utils.actions import ACTION_COLUMNS
+
+
+@pytest.fixture
+def store(tmp_path):
+    return HandStore(tmp_path / "store")
+
+
+def _sorted(df):
+    return df.sort_values(["HandID", "Player"]).reset_index(drop=True)
+
+
+def test_round_trip_and_dedup(store, frame):
+    assert store.ingest(frame) == frame["HandID"].nunique()
+    assert store.ingest(frame) == 0
+
+    columns = ["HandID", "Player", "Position", "Balance", *ACTION_COLUMNS]
+    pd.testing.assert_frame_equal(_sorted(store.load(columns=columns)), _sorted(frame[columns]))
+    assert len(store.index()) == len(frame)
+
+
+def test_player_projection_is_stored(store, log_text, frame):
+    player = frame["Player"].value_counts().index[0]
+    projected = pd.DataFrame(parse_tour_clean(log_text, players=[player]))
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert store.ingest(projected) == projected["HandID"].nunique()
+
+
+def test_unbalanced_hands_are_skipped_with_a_warning(store, frame):
+    broken = frame["HandID"].iloc[0]
+    df = frame.assign(Balance=frame["Balance"].where(frame["HandID"] != broken, frame["Balance"] + 1))
+    with pytest.warns(UserWarning, match="don't balance"):
+        assert store.ingest(df) == frame["HandID"].nunique() - 1
+    assert broken not in store
+
+
+def test_compact_frames_are_rejected(store, log_text):
+    with pytest.raises(ValueError, match="compact"):
+        store.ingest(parse_tour_clean(log_text, compact=True))
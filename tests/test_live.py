@@ -0,0 +1,48 @@
+import threading
+
+import pytest
+
+from parser.live import LiveTail
+from parser.reader import split_hand_texts
+
+
+@pytest.fixture
+def hands(log_text):
+    return split_hand_texts(log_text)
+
+
+def _write(path, hands, mode="w"):
+    with open(path, mode) as f:
+        f.write("\n\n".join(hands) + "\n\n")
+
+
+def test_on_update_can_read_offsets(tmp_path, hands):
+    _write(tmp_path / "a.txt", hands[:20])
+    saved = []
+    tail = LiveTail(tmp_path, on_update=lambda df, path: saved.append(tail.offsets))
+
+    poll = threading.Thread(target=tail.poll)
+    poll.start()
+    poll.join(10)
+    assert not poll.is_alive(), "on_update reading offsets deadlocked the tail"
+    assert saved == [tail.offsets]
+    assert tail.frame["HandID"].nunique() == 20
+
+
+def test_rewritten_file_adds_only_new_hands(tmp_path, hands):
+    path = tmp_path / "a.txt"
+    _write(path, hands[:20])
+    updates = []
+    tail = LiveTail(tmp_path, on_update=lambda df, path: updates.append(df["HandID"].nunique()))
+    tail.poll()
+
+    # Replaced by a shorter file holding some of the same hands, then appended to
+    _write(path, hands[10:15])
+    assert tail.poll() == 0
+    _write(path, hands[15:30], mode="a")
+    tail.poll()
+
+    frame = tail.frame
+    assert not frame.duplicated(["HandID", "Player"]).any()
+    assert frame["HandID"].nunique() == 30
+    assert updates == [20, 10]
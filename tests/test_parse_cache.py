@@ -0,0 +1,91 @@
+import threading
+import time
+
+import pytest
+
+import utils.background_parse as background_parse
+import utils.parse_cache as parse_cache
+from utils.background_parse import BackgroundParse
+from utils.parse_cache import clear_parse_cache, log_digest, parse_cache_info, parse_log_cached
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_parse_cache()
+    yield
+    clear_parse_cache()
+
+
+def _counting(monkeypatch, module, name, delay=0.2):
+    """Replace module.name with a wrapper that records its calls and is slow enough to overlap."""
+    calls = []
+    original = getattr(module, name)
+
+    def wrapper(*args, **kwargs):
+        calls.append(threading.get_ident())
+        time.sleep(delay)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(module, name, wrapper)
+    return calls
+
+
+def test_concurrent_callers_share_one_parse(monkeypatch, log_text):
+    calls = _counting(monkeypatch, parse_cache, "parse_tour_clean")
+    results = [None] * 4
+
+    def parse(i):
+        results[i] = parse_log_cached(log_text)
+
+    threads = [threading.Thread(target=parse, args=(i,)) for i in range(len(results))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(df.equals(results[0]) for df in results)
+    assert parse_cache_info()["misses"] == 1
+    assert parse_cache_info()["hits"] == len(results) - 1
+    assert not parse_cache._key_locks
+
+
+def test_failed_parse_releases_lock(monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("bad log")
+
+    monkeypatch.setattr(parse_cache, "parse_tour_clean", fail)
+    for i in range(3):
+        with pytest.raises(RuntimeError):
+            parse_log_cached(f"log {i}")
+    assert not parse_cache._key_locks
+
+
+def test_background_jobs_share_one_parse(monkeypatch, log_text):
+    calls = _counting(monkeypatch, background_parse, "iter_tour_hands")
+    data = log_text.encode()
+    digest = log_digest(data)
+
+    jobs = [BackgroundParse(data, digest=digest).start() for _ in range(3)]
+    for job in jobs:
+        assert job.join(30)
+
+    assert len(calls) == 1
+    assert [job.status for job in jobs] == ["done"] * len(jobs)
+    assert all(job.frame.equals(jobs[0].frame) for job in jobs)
+    # The synchronous API finds the background parse in the cache
+    assert parse_log_cached(data, digest=digest).equals(jobs[0].frame)
+
+
+def test_waiting_job_can_be_cancelled(monkeypatch, log_text):
+    _counting(monkeypatch, background_parse, "iter_tour_hands", delay=1.0)
+    data = log_text.encode()
+    digest = log_digest(data)
+
+    first = BackgroundParse(data, digest=digest).start()
+    time.sleep(0.1)
+    waiting = BackgroundParse(data, digest=digest).start()
+    waiting.cancel()
+    assert waiting.join(0.5)
+    assert waiting.status == "cancelled"
+    assert first.join(30) and first.status == "done"
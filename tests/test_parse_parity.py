@@ -0,0 +1,20 @@
+import pytest
+
+from parser.tour import parse_tour_clean, stream_tour_clean
+from tests.legacy import tour as legacy_tour
+
+
+@pytest.mark.parametrize("normalize", [True, False])
+def test_rows_match_baseline_parser(log_text, normalize):
+    legacy = legacy_tour.parse_tour_clean(log_text, normalize=normalize)
+    rows = parse_tour_clean(log_text, normalize=normalize)
+
+    # The baseline loop skipped the newest hand of the log (the last one in chronological order)
+    newest = rows[-1]["HandID"]
+    assert newest not in {row["HandID"] for row in legacy}
+    kept = [{col: row[col] for col in legacy[0]} for row in rows if row["HandID"] != newest]
+    assert kept == legacy
+
+
+def test_stream_matches_parse(log_text, log_path):
+    assert list(stream_tour_clean(log_path)) == parse_tour_clean(log_text)
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from utils.player_stats import PlayerStats
+
+
+def _by_key(counters):
+    return counters.sort_index()
+
+
+def test_incremental_adds_match_one_pass(frame):
+    whole = PlayerStats.from_frame(frame)
+    incremental = PlayerStats()
+    for hand_ids in np.array_split(frame["HandID"].unique(), 17):
+        incremental.add(frame[frame["HandID"].isin(hand_ids)])
+
+    assert len(incremental) == len(whole)
+    pd.testing.assert_frame_equal(_by_key(incremental.counters), _by_key(whole.counters))
+    pd.testing.assert_frame_equal(incremental.stats().sort_index(), whole.stats().sort_index())
+
+
+def test_merge_matches_one_pass(frame):
+    hand_ids = frame["HandID"].unique()
+    first = frame["HandID"].isin(hand_ids[: len(hand_ids) // 2])
+    merged = PlayerStats.from_frame(frame[first]) + PlayerStats.from_frame(frame[~first])
+    pd.testing.assert_frame_equal(_by_key(merged.counters), _by_key(PlayerStats.from_frame(frame).counters))
+
+
+def test_counters_rebuilt_after_add(frame):
+    hand_ids = frame["HandID"].unique()
+    first = frame["HandID"].isin(hand_ids[: len(hand_ids) // 2])
+    stats = PlayerStats.from_frame(frame[first])
+    before = stats.counters["Hands"].sum()
+    stats.add(frame[~first])
+    assert before == first.sum()
+    assert stats.counters["Hands"].sum() == len(frame)
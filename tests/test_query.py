@@ -0,0 +1,115 @@
+"""
+FilterPlan against chaining the baseline filters (tests.legacy.filters), in
+memory, with a HandIndex and on disk (HandStore and Parquet pushdown).
+"""
+import operator
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pytest
+
+from store.hand_store import HandStore
+from tests.legacy import filters as legacy
+from utils.hand_index import HandIndex
+from utils.query import FilterPlan
+
+
+BLINDS = ["small blind", "big blind"]
+
+
+def _where(column, op, value):
+    compare = {"==": operator.eq, "!=": operator.ne, ">=": operator.ge}
+    if op == "in":
+        return lambda df: df[df[column].isin(value)]
+    return lambda df: df[compare[op](df[column], value)]
+
+
+# (plan, the same filters chained one after the other)
+CASES = {
+    "docstring": (
+        FilterPlan()
+        .where("Position", "in", BLINDS)
+        .action("PreflopAction", "raise")
+        .postflop_players_by_position(BLINDS, 2, "Flop")
+        .all_checked_on_street("Flop"),
+        [
+            _where("Position", "in", BLINDS),
+            lambda df: legacy.FilterAction(df, "PreflopAction", "raise"),
+            lambda df: legacy.filter_postflop_players_by_position(df, BLINDS, 2, "Flop"),
+            lambda df: legacy.filter_all_checked_on_street(df, "Flop").drop(columns=["Flop_Checks", "Flop_Active"]),
+        ],
+    ),
+    "row steps only": (
+        FilterPlan()
+        .where("Stack", ">=", 20)
+        .where("Position", "!=", "button")
+        .action("PreflopAction", "call", 1)
+        .action_amount("PreflopAction", "gte", 2, 1),
+        [
+            _where("Stack", ">=", 20),
+            _where("Position", "!=", "button"),
+            lambda df: legacy.FilterAction(df, "PreflopAction", "call", 1),
+            lambda df: legacy.FilterActionAmount(df, "PreflopAction", "gte", 2, 1),
+        ],
+    ),
+    "hand steps first": (
+        FilterPlan()
+        .check_raises("Flop")
+        .where("Player", "!=", "Hero")
+        .action("FlopAction", "check"),
+        [
+            lambda df: legacy.detect_check_raises(df, "Flop").drop(columns=["Flop_CheckRaiser"]),
+            _where("Player", "!=", "Hero"),
+            lambda df: legacy.FilterAction(df, "FlopAction", "check"),
+        ],
+    ),
+}
+
+
+def _chain(df, filters):
+    for step in filters:
+        df = step(df)
+    return df
+
+
+def _keys(df):
+    return sorted(zip(df["HandID"], df["Player"]))
+
+
+@pytest.fixture(scope="module")
+def store(frame, tmp_path_factory):
+    store = HandStore(tmp_path_factory.mktemp("store"))
+    store.ingest(frame)
+    return store
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_run_matches_chained_filters(frame, case):
+    plan, chain = CASES[case]
+    expected = _chain(frame, chain)
+    assert not expected.empty
+    pd.testing.assert_frame_equal(plan.run(frame), expected)
+    pd.testing.assert_frame_equal(plan.run(frame, index=HandIndex.build(frame)), expected)
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_scan_matches_run(frame, store, case):
+    plan, _ = CASES[case]
+    assert _keys(plan.scan(store)) == _keys(plan.run(frame))
+
+
+@pytest.mark.parametrize("op, value", [("!=", 1.0), ("==", 1.0), ("!=", "u"), ("in", ["u"]), ("not in", ["u"])])
+def test_pushdown_and_memory_agree_on_missing_values(tmp_path, op, value):
+    column = "Amount" if isinstance(value, float) else "Name"
+    df = pd.DataFrame({
+        "HandID": ["a", "b", "c", "d"],
+        "Amount": [1.0, np.nan, 2.0, 3.0],
+        "Name": ["u", None, "v", "w"],
+    })
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), str(tmp_path / "part.parquet"))
+
+    plan = FilterPlan().where(column, op, value)
+    assert list(plan.scan(ds.dataset(str(tmp_path)))["HandID"]) == list(plan.run(df)["HandID"])
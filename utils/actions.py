@@ -0,0 +1,191 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from functools import cached_property
+from itertools import chain
+from typing import List, Optional, Sequence, Tuple
+
+
+ACTION_COLUMNS = ["PreflopAction", "FlopAction", "TurnAction", "RiverAction"]
+
+# Codes of the flat representation; -1 marks the [None] "no action" placeholder
+ACTION_NAMES = ("fold", "check", "call", "bet", "raise")
+ACTION_CODES = {name: code for code, name in enumerate(ACTION_NAMES)}
+NO_ACTION = -1
+
+ACTION_STRUCT = pa.struct([
+    ("action", pa.dictionary(pa.int8(), pa.string())),
+    ("amount", pa.float64()),
+])
+ACTION_LIST_TYPE = pa.list_(ACTION_STRUCT)
+ACTION_DTYPE = pd.ArrowDtype(ACTION_LIST_TYPE)
+
+
+# ----------- LIST FORMAT <-> ARROW -----------
+def actions_to_arrow(values: Sequence) -> pa.ListArray:
+    """
+    Encode a sequence of action lists (e.g. [["raise", 2.5], ["call", 1.0]])
+    as a pyarrow list<struct<action, amount>> array.
+
+    The [None] placeholder becomes a struct with a null action, and anything
+    that isn't a list (None/NaN) becomes a null list, so decoding is lossless.
+    """
+    is_list = [isinstance(actions, list) for actions in values]
+    lengths = [len(actions) if ok else 0 for actions, ok in zip(values, is_list)]
+    flat = list(chain.from_iterable(actions for actions, ok in zip(values, is_list) if ok))
+
+    names = [a[0] if isinstance(a, list) and a else None for a in flat]
+    amounts = [a[1] if isinstance(a, list) and len(a) > 1 else None for a in flat]
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int32)
+    np.cumsum(lengths, out=offsets[1:])
+
+    action = pa.array(names, type=pa.string()).dictionary_encode().cast(ACTION_STRUCT.field("action").type)
+    struct = pa.StructArray.from_arrays([action, pa.array(amounts, type=pa.float64())], fields=list(ACTION_STRUCT))
+    return pa.ListArray.from_arrays(
+        pa.array(offsets),
+        struct,
+        type=ACTION_LIST_TYPE,
+        mask=pa.array(np.logical_not(is_list)),
+    )
+
+
+def arrow_to_actions(array) -> List[Optional[List[List]]]:
+    """
+    Decode a list<struct<action, amount>> array back to the list format.
+    """
+    decoded = []
+    for actions in array.to_pylist():
+        if actions is None:
+            decoded.append(None)
+            continue
+        decoded.append([
+            [a["action"], a["amount"]] if a["action"] is not None else [None]
+            for a in actions
+        ])
+    return decoded
+
+
+def encode_action_columns(df: pd.DataFrame, columns: Sequence[str] = ACTION_COLUMNS) -> pd.DataFrame:
+    """
+    Return a frame whose action columns are Arrow-backed list<struct> columns.
+    """
+    encoded = {
+        col: pd.Series(actions_to_arrow(df[col].tolist()), index=df.index, dtype=ACTION_DTYPE)
+        for col in columns if col in df.columns and not is_arrow_actions(df[col])
+    }
+    return df.assign(**encoded) if encoded else df
+
+
+def decode_action_columns(df: pd.DataFrame, columns: Sequence[str] = ACTION_COLUMNS) -> pd.DataFrame:
+    """
+    Return a frame whose action columns are back in the list-of-lists format.
+    """
+    decoded = {
+        col: pd.Series(arrow_to_actions(pa.array(df[col])), index=df.index, dtype=object)
+        for col in columns if col in df.columns and is_arrow_actions(df[col])
+    }
+    return df.assign(**decoded) if decoded else df
+
+
+def is_arrow_actions(series: pd.Series) -> bool:
+    return isinstance(series.dtype, pd.ArrowDtype) and pa.types.is_list(series.dtype.pyarrow_dtype)
+
+
+def arrow_actions_mapper(arrow_type: pa.DataType) -> Optional[pd.ArrowDtype]:
+    """types_mapper for Table.to_pandas: keep action columns as ACTION_DTYPE."""
+    return ACTION_DTYPE if arrow_type == ACTION_LIST_TYPE else None
+
+
+# ----------- FLAT REPRESENTATION -----------
+def flatten_actions(series: pd.Series) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Tuple[str, ...]]:
+    """
+    Flatten an action column into NumPy arrays.
+
+    Returns (offsets, codes, amounts, vocab): the actions of row i are
+    codes[offsets[i]:offsets[i + 1]], codes index into vocab (-1 for the
+    [None] placeholder) and missing amounts are NaN.
+    """
+    array = pa.array(series) if is_arrow_actions(series) else actions_to_arrow(series.tolist())
+    if isinstance(array, pa.ChunkedArray):
+        array = array.combine_chunks()
+
+    lengths = pc.fill_null(pc.list_value_length(array), 0).to_numpy(zero_copy_only=False)
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    flat = pc.list_flatten(array)
+    action = flat.field("action")
+    # Map the (small) dictionary to global codes once, then gather by index
+    dictionary = action.dictionary.to_pylist()
+    vocab = ACTION_NAMES + tuple(name for name in dictionary if name not in ACTION_CODES)
+    lookup = np.array([vocab.index(name) for name in dictionary] + [NO_ACTION], dtype=np.int8)
+    indices = pc.fill_null(action.indices, len(dictionary)).to_numpy(zero_copy_only=False)
+    codes = lookup[indices]
+    amounts = flat.field("amount").to_numpy(zero_copy_only=False).astype(np.float64)
+
+    return offsets, codes, amounts, vocab
+
+
+@pd.api.extensions.register_series_accessor("actions")
+class ActionsAccessor:
+    """
+    Flat NumPy view of an action column, for both the list format and the
+    Arrow-backed format:
+
+        df["PreflopAction"].actions.codes
+        df["PreflopAction"].actions.row_index
+    """
+
+    def __init__(self, series: pd.Series):
+        self._series = series
+        self._flat = None
+
+    def _flatten(self):
+        if self._flat is None:
+            self._flat = flatten_actions(self._series)
+        return self._flat
+
+    @property
+    def offsets(self) -> np.ndarray:
+        return self._flatten()[0]
+
+    @property
+    def codes(self) -> np.ndarray:
+        return self._flatten()[1]
+
+    @property
+    def amounts(self) -> np.ndarray:
+        return self._flatten()[2]
+
+    @property
+    def vocab(self) -> Tuple[str, ...]:
+        return self._flatten()[3]
+
+    @cached_property
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    @cached_property
+    def row_index(self) -> np.ndarray:
+        """Row position (0..len-1) of every flat action."""
+        return np.repeat(np.arange(len(self._series)), self.lengths)
+
+    @cached_property
+    def position(self) -> np.ndarray:
+        """0-based index of every flat action inside its row's list."""
+        return np.arange(len(self.codes)) - np.repeat(self.offsets[:-1], self.lengths)
+
+    def code(self, action: str) -> int:
+        """Code of an action name, or -2 if it never occurs in this column."""
+        return self.vocab.index(action) if action in self.vocab else -2
+
+    def to_arrow(self) -> pa.ListArray:
+        if is_arrow_actions(self._series):
+            return pa.array(self._series)
+        return actions_to_arrow(self._series.tolist())
+
+    def to_lists(self) -> List[Optional[List[List]]]:
+        if is_arrow_actions(self._series):
+            return arrow_to_actions(pa.array(self._series))
+        return self._series.tolist()
@@ -0,0 +1,207 @@
+import io
+import threading
+import time
+from itertools import islice
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from parser.live import LiveFrame
+from parser.reader import iter_hand_texts
+from parser.tour import MAX_CHUNK_HANDS, iter_tour_hands, iter_tour_hands_parallel
+from utils.hand_index import HandIndex
+from utils.parse_cache import cached_parse, parse_lock, store_parse
+from utils.player_stats import PlayerStats
+
+
+# The first chunk is small so results show up right away; chunks then double up to MAX_CHUNK_HANDS
+FIRST_CHUNK_HANDS = 100
+HAND_HEADER_BYTES = b"Poker Hand #"
+
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+
+class BackgroundParse:
+    """
+    Parse a log in a background thread, publishing the rows chunk by chunk
+    so they can be shown while the rest of the log is parsed.
+
+        job = BackgroundParse(data, normalize=True).start()
+        job.wait_first(0.5)             # until the first chunk is in (or the parse ends)
+        df, index = job.snapshot()      # rows parsed so far, in chronological order
+        job.player_stats().stats()      # PlayerStats of those rows
+        job.progress()                  # hands read / total, hands per second, status
+        job.cancel()                    # e.g. when another log is uploaded
+
+    Hands are read from the end of the log (the oldest hand), so the first
+    chunk is available after parsing FIRST_CHUNK_HANDS hands whatever the size
+    of the log. Cancelling stops the parse before the next hand.
+
+    With a digest (see utils.parse_cache.log_digest), a log that is already in
+    the parse cache is published at once, and a completed parse is stored in it.
+    Jobs started on the same log while it is being parsed wait for that parse
+    (see utils.parse_cache.parse_lock) instead of parsing it again.
+    workers=N parses in N processes (see iter_tour_hands_parallel).
+    """
+
+    def __init__(
+        self,
+        data: bytes,
+        normalize: bool = True,
+        digest: Optional[str] = None,
+        workers: Optional[int] = None,
+        first_chunk: int = FIRST_CHUNK_HANDS,
+        max_chunk: int = MAX_CHUNK_HANDS
+    ):
+        self.data = data
+        self.normalize = normalize
+        self.digest = digest
+        self.workers = workers
+        self.first_chunk = first_chunk
+        self.max_chunk = max_chunk
+        self.status = RUNNING
+        self.error: Optional[Exception] = None
+        self.total_hands = data.count(HAND_HEADER_BYTES)
+        self.hands_read = 0
+        self._frame = LiveFrame()
+        self._stats = PlayerStats()
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._published = threading.Event()
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # ----------- CONTROL -----------
+    def start(self) -> "BackgroundParse":
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="background-parse", daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the parse to end; True if it did within timeout."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return not self.running
+
+    def wait_first(self, timeout: Optional[float] = None) -> bool:
+        """Wait until some rows are published or the parse ends."""
+        return self._published.wait(timeout)
+
+    @property
+    def running(self) -> bool:
+        return self.status == RUNNING
+
+    # ----------- RESULTS -----------
+    def snapshot(self) -> Tuple[pd.DataFrame, HandIndex]:
+        """Rows published so far and their HandIndex (see LiveFrame.snapshot)."""
+        return self._frame.snapshot()
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        return self.snapshot()[0]
+
+    def player_stats(self) -> PlayerStats:
+        with self._lock:
+            return PlayerStats(self._stats.counters)
+
+    def progress(self) -> Dict:
+        end = self._finished or time.perf_counter()
+        seconds = end - self._started if self._started is not None else 0.0
+        return {
+            "status": self.status,
+            "hands": self.hands_read,
+            "total": self.total_hands,
+            "fraction": min(1.0, self.hands_read / self.total_hands) if self.total_hands else 1.0,
+            "rows": len(self._frame),
+            "seconds": seconds,
+            "hands_per_second": self.hands_read / seconds if seconds > 0 else 0.0,
+        }
+
+    # ----------- WORKER -----------
+    def _run(self) -> None:
+        try:
+            if not self.digest:
+                self._publish_all(self._parsed_chunks())
+            elif not self._publish_cached():
+                # Single parse per log: a job already parsing it (e.g. in another session) is waited for
+                with parse_lock(self.digest, self.normalize, cancel=self._cancel) as locked:
+                    if locked and not self._publish_cached():
+                        self._publish_all(self._parsed_chunks())
+                        if not self._cancel.is_set():
+                            store_parse(self.digest, self.frame, self.normalize)
+            self.status = CANCELLED if self._cancel.is_set() else DONE
+        except Exception as e:
+            print(f"Error parsing log: {e}")
+            self.error = e
+            self.status = FAILED
+        finally:
+            self._finished = time.perf_counter()
+            self._published.set()
+
+    def _publish_cached(self) -> bool:
+        cached = cached_parse(self.digest, self.normalize)
+        if cached is None:
+            return False
+        self._publish_all(self._cached_chunks(cached))
+        return True
+
+    def _publish_all(self, chunks: Iterable[pd.DataFrame]) -> None:
+        for df in chunks:
+            self._publish(df)
+
+    def _chunk_sizes(self) -> Iterator[int]:
+        size = self.first_chunk
+        while True:
+            yield size
+            size = min(size * 2, self.max_chunk)
+
+    def _parsed_chunks(self) -> Iterator[pd.DataFrame]:
+        hand_texts = self._count(iter_hand_texts(io.BytesIO(self.data)))
+        if self.workers and self.workers > 1:
+            hands = iter_tour_hands_parallel(hand_texts, normalize=self.normalize, workers=self.workers)
+        else:
+            hands = iter_tour_hands(hand_texts, normalize=self.normalize)
+
+        for size in self._chunk_sizes():
+            chunk = list(islice(hands, size))
+            if not chunk:
+                return
+            yield pd.DataFrame([row for rows in chunk for row in rows])
+
+    def _cached_chunks(self, df: pd.DataFrame) -> Iterator[pd.DataFrame]:
+        # Same chunks as a parse, so a large cached log doesn't delay the first result
+        hand_ids = df["HandID"]
+        starts = np.append(np.flatnonzero((hand_ids != hand_ids.shift()).to_numpy()), len(df))
+        first = 0
+        for size in self._chunk_sizes():
+            if first >= len(starts) - 1 or self._cancel.is_set():
+                return
+            last = min(first + size, len(starts) - 1)
+            self.hands_read += last - first
+            yield df.iloc[starts[first]:starts[last]]
+            first = last
+
+    def _count(self, hand_texts: Iterable[str]) -> Iterator[str]:
+        # Counts every hand read (including the ones that fail to parse); stops on cancel
+        for hand_text in hand_texts:
+            if self._cancel.is_set():
+                return
+            self.hands_read += 1
+            yield hand_text
+
+    def _publish(self, df: pd.DataFrame) -> None:
+        if df.empty:
+            return
+        self._frame.append(df)
+        self._published.set()
+        with self._lock:
+            self._stats.add(df)
@@ -0,0 +1,93 @@
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+
+RANKS = "23456789TJQKA"
+SUITS = "cdhs"
+
+# Card code = rank index * 4 + suit index: 0 is 2c, 51 is As
+CARD_NAMES = [rank + suit for rank in RANKS for suit in SUITS]
+CARD_CODES = {name: code for code, name in enumerate(CARD_NAMES)}
+NO_CARD = 255
+
+CARDS_TYPE = pa.list_(pa.uint8())
+
+
+def card_code(card: str) -> int:
+    """Code of a card such as 'Ah' (NO_CARD if it is not a valid card)."""
+    return CARD_CODES.get(card, NO_CARD)
+
+
+def card_rank(codes: np.ndarray) -> np.ndarray:
+    """Rank index (0 = deuce, 12 = ace) of card codes."""
+    return np.asarray(codes) // 4
+
+
+def card_suit(codes: np.ndarray) -> np.ndarray:
+    """Suit index (see SUITS) of card codes."""
+    return np.asarray(codes) % 4
+
+
+def encode_cards(card_lists: Sequence[Optional[List[str]]]) -> pa.ListArray:
+    """
+    Encode lists of card names (e.g. [['Ah', 'Kd'], [], None]) as an Arrow
+    list<uint8> array of card codes. One byte per card instead of a Python
+    string object.
+    """
+    offsets = np.zeros(len(card_lists) + 1, dtype=np.int32)
+    codes = []
+    valid = np.ones(len(card_lists), dtype=bool)
+    for i, cards in enumerate(card_lists):
+        if cards is None:
+            valid[i] = False
+        else:
+            codes.extend(CARD_CODES.get(card, NO_CARD) for card in cards)
+        offsets[i + 1] = len(codes)
+
+    values = pa.array(np.asarray(codes, dtype=np.uint8), type=pa.uint8())
+    mask = None if valid.all() else pa.array(~valid)
+    return pa.ListArray.from_arrays(pa.array(offsets), values, mask=mask)
+
+
+def decode_cards(codes: Sequence[Optional[Sequence[int]]]) -> List[Optional[List[str]]]:
+    """Card codes back to card names."""
+    return [
+        None if hand is None else [CARD_NAMES[code] if code < len(CARD_NAMES) else None for code in hand]
+        for hand in codes
+    ]
+
+
+def card_matrix(values, width: int) -> np.ndarray:
+    """
+    Cards of every row as an (N, width) uint8 array of card codes, padded
+    (or cut) to width with NO_CARD. values is a sequence or Series of card
+    name sequences (lists, or the arrays HandStore.load returns; None/NaN for
+    no cards) or an Arrow list<uint8> of codes (see encode_cards), so parsed,
+    stored and compact frames can all be evaluated.
+    """
+    array = getattr(values, "array", values)
+    if isinstance(array, pd.arrays.ArrowExtensionArray):
+        cards = pa.array(array)
+        if isinstance(cards, pa.ChunkedArray):
+            cards = cards.combine_chunks()
+    else:
+        cards = encode_cards([v if isinstance(v, (list, tuple, np.ndarray)) else None for v in values])
+
+    offsets = cards.offsets.to_numpy()
+    lengths = np.diff(offsets)
+    if cards.null_count:
+        lengths[np.asarray(cards.is_null())] = 0
+    codes = cards.values.to_numpy(zero_copy_only=False)
+
+    # Position of every card within its row, and in the flat codes
+    rows = np.repeat(np.arange(len(lengths)), lengths)
+    slots = np.arange(len(rows)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    keep = slots < width
+    flat = np.repeat(offsets[:-1], lengths) + slots
+
+    matrix = np.full((len(lengths), width), NO_CARD, dtype=np.uint8)
+    matrix[rows[keep], slots[keep]] = codes[flat[keep]]
+    return matrix
@@ -0,0 +1,330 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from math import comb
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.actions import ACTION_COLUMNS, NO_ACTION
+from utils.cards import NO_CARD, card_matrix
+from utils.evaluator import NO_RANK, evaluate_hands, fold_cards, score_masks
+
+
+# GG names the player whose history it is "Hero"; their hole cards are always known
+HERO = "Hero"
+
+# Street of every all-in flag; an all-in on the ante is a preflop all-in
+ALLIN_STREETS = {"AnteAllIn": 0, "PreflopAllIn": 0, "FlopAllIn": 1, "TurnAllIn": 2, "RiverAllIn": 3}
+# Board cards known when the betting ends on each street
+KNOWN_BOARD = (0, 3, 4, 5)
+NO_STREET = len(KNOWN_BOARD)
+
+# Runouts are enumerated when there are at most EXACT_BOARDS of them (every
+# all-in from the flop on), otherwise SAMPLES boards are drawn
+EXACT_BOARDS = 2_000
+SAMPLES = 10_000
+# Cards held in memory per evaluation batch (spots x boards x players x 7)
+BATCH_CARDS = 1 << 23
+
+
+class AllInSpots(NamedTuple):
+    """All-in spots of one shape: S hands, n players with known cards, k board cards known."""
+    rows: np.ndarray        # (S, n) frame positions of the players
+    holes: np.ndarray       # (S, n, 2) hole card codes
+    board: np.ndarray       # (S, k) board card codes known at the all-in
+    stakes: np.ndarray      # (S, n) chips each player put in the pot
+    pots: np.ndarray        # (S, n) side pots, smallest stake first (NaN if stakes are unknown)
+
+
+# ----------- FRAME -----------
+def equity_columns(
+    df: pd.DataFrame,
+    samples: int = SAMPLES,
+    exact_boards: int = EXACT_BOARDS,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Hand strength and all-in equity of every row of a frame of
+    parse_tour_clean rows (list-format or compact), aligned to its index:
+
+    - HandRank: score of the player's best hand on the final board (see
+      utils.evaluator; higher is better), NO_RANK when their cards are unknown
+      (not shown, not Hero) or fewer than three board cards were dealt
+    - AllInEquity: share of the main pot the player was expected to win
+      (ties split) when the chips went in, NaN outside all-in spots
+    - AllInEV: all-in adjusted result. For players in an all-in spot, the
+      chips they were expected to get back from every pot they were eligible
+      for, minus what they put in; the Balance otherwise
+
+    An all-in spot is a hand where a player was all-in, every player left
+    at showdown has known cards and nobody acted on a later street. The
+    runout is enumerated exactly when it has at most exact_boards boards and
+    sampled (samples boards, seeded by seed) otherwise. Spots of the same
+    shape are evaluated together; workers=N evaluates them in N processes
+    with identical results.
+
+    Pots come from the Invested column, before rake; without it AllInEV is
+    NaN in all-in spots.
+    """
+    hole = _hole_cards(df)
+    board = card_matrix(df["BoardRiver"], 5) if "BoardRiver" in df.columns else np.full((len(df), 5), NO_CARD, np.uint8)
+    final_board = _final_board(df, board)
+
+    hand_rank = evaluate_hands(np.concatenate([hole, final_board], axis=1))
+    hand_rank[(hole == NO_CARD).any(axis=1) | ((final_board != NO_CARD).sum(axis=1) < 3)] = NO_RANK
+
+    equity = np.full(len(df), np.nan)
+    ev = pd.to_numeric(df["Balance"], errors="coerce").to_numpy(dtype=np.float64, copy=True) \
+        if "Balance" in df.columns else np.full(len(df), np.nan)
+
+    groups = find_allin_spots(df, hole, board)
+    results = spot_equities(groups, samples=samples, exact_boards=exact_boards, workers=workers, seed=seed)
+    for spots, (spot_equity, winnings) in zip(groups, results):
+        equity[spots.rows] = spot_equity
+        ev[spots.rows] = winnings - spots.stakes
+
+    return pd.DataFrame({"HandRank": hand_rank, "AllInEquity": equity, "AllInEV": ev}, index=df.index)
+
+
+def join_equity_columns(df: pd.DataFrame, **options) -> pd.DataFrame:
+    """Attach HandRank, AllInEquity and AllInEV (see equity_columns) to the frame."""
+    return df.join(equity_columns(df, **options))
+
+
+def _hole_cards(df: pd.DataFrame) -> np.ndarray:
+    # Shown cards, or Hero's own hand when not shown
+    hole = card_matrix(df["ShowDown"], 2) if "ShowDown" in df.columns else np.full((len(df), 2), NO_CARD, np.uint8)
+    if "HeroHand" in df.columns and "Player" in df.columns:
+        hero = (df["Player"] == HERO).to_numpy() & (hole == NO_CARD).any(axis=1)
+        hole[hero] = card_matrix(df["HeroHand"][hero], 2)
+    return hole
+
+
+def _final_board(df: pd.DataFrame, board: np.ndarray) -> np.ndarray:
+    # The river board is empty when the hand ended earlier: fall back to the turn, then the flop
+    final = board.copy()
+    for column, width in (("BoardTurn", 4), ("BoardFlop", 3)):
+        missing = final[:, 0] == NO_CARD
+        if column in df.columns and missing.any():
+            final[missing, :width] = card_matrix(df[column][missing], width)
+    return final
+
+
+def find_allin_spots(df: pd.DataFrame, hole: np.ndarray, board: np.ndarray) -> List[AllInSpots]:
+    """
+    The all-in spots of the frame (see equity_columns), grouped by shape.
+    Every player of a hand must be in the frame (no player projection).
+    """
+    hand_codes, hands = pd.factorize(df["HandID"])
+    num_hands = len(hands)
+    if not num_hands:
+        return []
+    has_hand = hand_codes >= 0
+    codes = np.where(has_hand, hand_codes, num_hands)
+
+    def per_hand(flags: np.ndarray) -> np.ndarray:
+        return np.bincount(codes, weights=flags, minlength=num_hands + 1)[:num_hands]
+
+    # Street the betting ended on: the first all-in of the hand
+    allin_street = np.full(num_hands + 1, NO_STREET)
+    for column, street in ALLIN_STREETS.items():
+        if column in df.columns:
+            flagged = codes[df[column].fillna(False).to_numpy(dtype=bool)]
+            np.minimum.at(allin_street, flagged, street)
+    allin_street[num_hands] = NO_STREET
+
+    folded = np.zeros(len(df), dtype=bool)
+    acted_after = np.zeros(num_hands)
+    for street, column in enumerate(ACTION_COLUMNS):
+        if column not in df.columns:
+            continue
+        actions = df[column].actions
+        real = actions.codes != NO_ACTION
+        folded[actions.row_index[real & (actions.codes == actions.code("fold"))]] = True
+        acted = np.bincount(actions.row_index[real], minlength=len(df)) > 0
+        acted_after += per_hand(acted) * (street > allin_street[:num_hands])
+
+    contender = has_hand & ~folded
+    known = (hole != NO_CARD).all(axis=1)
+    contenders = per_hand(contender)
+    spot = (
+        (allin_street[:num_hands] < NO_STREET)
+        & (contenders >= 2)
+        & (per_hand(contender & known) == contenders)
+        & (acted_after == 0)
+    )
+    street = allin_street[codes]
+    in_spot = contender & np.append(spot, False)[codes]
+    # The whole runout must be known to compare with the result
+    in_spot &= (board != NO_CARD).all(axis=1)
+
+    invested = pd.to_numeric(df["Invested"], errors="coerce").to_numpy(dtype=np.float64) \
+        if "Invested" in df.columns else np.full(len(df), np.nan)
+
+    groups = []
+    spot_rows = np.flatnonzero(in_spot)
+    spot_rows = spot_rows[np.argsort(codes[spot_rows], kind="stable")]
+    players = per_hand(in_spot).astype(np.int64)[codes[spot_rows]]
+    known_board = np.array(KNOWN_BOARD)[street[spot_rows]]
+    for n, k in sorted(set(zip(players.tolist(), known_board.tolist()))):
+        rows = spot_rows[(players == n) & (known_board == k)].reshape(-1, n)
+        stakes = invested[rows]
+        groups.append(AllInSpots(
+            rows=rows,
+            holes=hole[rows],
+            board=board[rows[:, 0], :k],
+            stakes=stakes,
+            pots=_side_pots(stakes, codes[rows[:, 0]], codes, invested),
+        ))
+    return groups
+
+
+def _side_pots(stakes: np.ndarray, spot_hands: np.ndarray, codes: np.ndarray, invested: np.ndarray) -> np.ndarray:
+    """
+    Pot layers of every spot: layer j holds what every player of the hand
+    (folded ones included) put in between the j-th and (j+1)-th smallest
+    stake of the players left; only players who put in at least that much
+    are eligible for it.
+    """
+    levels = np.sort(stakes, axis=1)
+    floors = np.concatenate([np.zeros((len(levels), 1)), levels[:, :-1]], axis=1)
+    spot_of_hand = np.full(codes.max() + 1, -1)
+    spot_of_hand[spot_hands] = np.arange(len(spot_hands))
+    rows = np.flatnonzero(spot_of_hand[codes] >= 0)
+    spots = spot_of_hand[codes[rows]]
+
+    layers = np.clip(invested[rows, None] - floors[spots], 0, levels[spots] - floors[spots])
+    pots = np.zeros_like(levels)
+    np.add.at(pots, spots, layers)
+    return pots
+
+
+# ----------- EQUITY -----------
+def spot_equities(
+    groups: List[AllInSpots],
+    samples: int = SAMPLES,
+    exact_boards: int = EXACT_BOARDS,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None
+) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    (equity, expected winnings) of every player of every group of spots,
+    each (S, n). The spots are cut into batches the same way whatever the
+    number of workers, and every batch gets its own seed, so the results
+    only depend on seed.
+    """
+    tasks, owners = [], []
+    for g, spots in enumerate(groups):
+        n, k = spots.holes.shape[1], spots.board.shape[1]
+        boards = _num_boards(n, k, samples, exact_boards)
+        size = max(1, BATCH_CARDS // (boards * n * 7))
+        for start in range(0, len(spots.rows), size):
+            part = slice(start, start + size)
+            tasks.append((spots.holes[part], spots.board[part], spots.stakes[part], spots.pots[part], samples, exact_boards))
+            owners.append(g)
+    seeds = np.random.SeedSequence(seed).spawn(len(tasks))
+    tasks = [task + (task_seed,) for task, task_seed in zip(tasks, seeds)]
+
+    if workers and workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            outputs = list(executor.map(_batch_equity, *zip(*tasks)))
+    else:
+        outputs = [_batch_equity(*task) for task in tasks]
+
+    results = []
+    for g in range(len(groups)):
+        parts = [output for owner, output in zip(owners, outputs) if owner == g]
+        results.append((np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])))
+    return results
+
+
+def _num_boards(n: int, k: int, samples: int, exact_boards: int) -> int:
+    runouts = comb(52 - 2 * n - k, 5 - k)
+    return runouts if runouts <= exact_boards else samples
+
+
+def _batch_equity(
+    holes: np.ndarray,
+    board: np.ndarray,
+    stakes: np.ndarray,
+    pots: np.ndarray,
+    samples: int,
+    exact_boards: int,
+    seed: np.random.SeedSequence
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Equity and expected winnings of S spots of the same shape. Every runout
+    of every spot is folded once (see fold_cards), each player's hole cards
+    are added to it and scored, then every pot is awarded per runout and
+    the shares averaged.
+    """
+    num_spots, n = holes.shape[:2]
+    k = board.shape[1]
+    draw = 5 - k
+
+    # Cards left in the deck of every spot, in code order
+    used = np.zeros((num_spots, 52), dtype=bool)
+    np.put_along_axis(used, holes.reshape(num_spots, -1).astype(np.int64), True, axis=1)
+    np.put_along_axis(used, board.astype(np.int64), True, axis=1)
+    deck = np.argsort(used, axis=1, kind="stable")[:, :52 - 2 * n - k].astype(np.uint8)
+
+    runouts = comb(deck.shape[1], draw)
+    if runouts <= exact_boards:
+        picks = np.array(list(combinations(range(deck.shape[1]), draw)), dtype=np.int64).reshape(runouts, draw)
+        drawn = deck[:, picks]                                              # (S, B, draw)
+    else:
+        drawn = _sample_cards(deck, draw, samples, np.random.default_rng(seed))
+    num_boards = drawn.shape[1]
+
+    boards = fold_cards(np.concatenate([
+        np.broadcast_to(board[:, None, :], (num_spots, num_boards, k)), drawn,
+    ], axis=2).reshape(-1, 5))
+    # Per player, so the reductions below run over whole (S, B) arrays
+    scores = [
+        score_masks(fold_cards(np.repeat(holes[:, player], num_boards, axis=0), boards)).reshape(num_spots, num_boards)
+        for player in range(n)
+    ]
+
+    # Pot j is contested by the players whose stake reaches the j-th smallest stake
+    levels = np.sort(stakes, axis=1)
+    eligible = stakes[:, :, None] >= levels[:, None, :] - 1e-9             # (S, n, pots)
+    eligible[np.isnan(stakes).any(axis=1)] = True
+    equity = np.zeros((num_spots, n))
+    winnings = np.zeros((num_spots, n))
+    for j in range(n):
+        if j and not np.any(pots[:, j]):
+            continue
+        contest = [np.where(eligible[:, player, j, None], scores[player], NO_RANK) for player in range(n)]
+        best = np.maximum.reduce(contest)
+        winners = [score == best for score in contest]
+        num_winners = np.add.reduce(winners, dtype=np.int8)
+        for player in range(n):
+            share = (winners[player] / num_winners).mean(axis=1)
+            if j == 0:
+                equity[:, player] = share
+            winnings[:, player] += share * pots[:, j]
+    return equity, winnings
+
+
+def _sample_cards(deck: np.ndarray, draw: int, samples: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    samples draws of draw distinct cards from the deck of every spot: the
+    i-th card is a uniform pick among the positions not taken yet, found by
+    skipping over the taken ones in increasing order.
+    """
+    num_spots, size = deck.shape
+    positions = []
+    taken = []  # positions drawn so far, kept sorted slot by slot
+    for i in range(draw):
+        position = rng.integers(0, size - i, size=(num_spots, samples))
+        for slot in taken:
+            position += position >= slot
+        positions.append(position)
+        # Insert into the sorted slots by compare-and-swap
+        carry = position
+        for t, slot in enumerate(taken):
+            taken[t], carry = np.minimum(slot, carry), np.maximum(slot, carry)
+        taken.append(carry)
+    return np.take_along_axis(deck[:, None, :], np.stack(positions, axis=2), axis=2)
@@ -0,0 +1,186 @@
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+
+HAND_CATEGORIES = (
+    "High Card",
+    "Pair",
+    "Two Pair",
+    "Three Of A Kind",
+    "Straight",
+    "Flush",
+    "Full House",
+    "Four Of A Kind",
+    "Straight Flush",
+)
+HIGH_CARD, PAIR, TWO_PAIR, TRIPS, STRAIGHT, FLUSH, FULL_HOUSE, QUADS, STRAIGHT_FLUSH = range(len(HAND_CATEGORIES))
+
+# A score is the category in bits 20+ and up to five ranks, a nibble each, below it
+CATEGORY_SHIFT = 20
+NO_RANK = -1
+
+NUM_RANKS = 13
+NUM_MASKS = 1 << NUM_RANKS
+
+
+# ----------- LOOKUP TABLES -----------
+# Indexed by a 13-bit rank mask (bit r set = rank r present)
+def _build_tables():
+    masks = np.arange(NUM_MASKS)
+    bits = (masks[:, None] >> np.arange(NUM_RANKS)) & 1
+
+    popcount = bits.sum(axis=1).astype(np.int8)
+    highest = np.where(masks > 0, np.floor(np.log2(np.maximum(masks, 1))), NO_RANK).astype(np.int8)
+
+    # Highest card of the best straight: five consecutive ranks, or A-2-3-4-5 (five high)
+    straight_high = np.full(NUM_MASKS, NO_RANK, dtype=np.int8)
+    wheel = (1 << 12) | 0b1111
+    straight_high[(masks & wheel) == wheel] = 3
+    for high in range(4, NUM_RANKS):
+        run = 0b11111 << (high - 4)
+        straight_high[(masks & run) == run] = high
+
+    # The five highest ranks packed high to low into the nibbles below the category
+    top5 = np.zeros(NUM_MASKS, dtype=np.int32)
+    remaining = masks.copy()
+    for slot in range(5):
+        rank = np.where(remaining > 0, np.floor(np.log2(np.maximum(remaining, 1))), 0).astype(np.int32)
+        present = remaining > 0
+        top5 |= np.where(present, rank << (16 - 4 * slot), 0)
+        remaining = np.where(present, remaining & ~(1 << rank), 0)
+
+    return popcount, highest, straight_high, top5
+
+
+POPCOUNT, HIGHEST, STRAIGHT_HIGH, TOP5 = _build_tables()
+# Bit of a rank; the extra last entry makes NO_RANK (-1) map to no bit
+RANK_BIT = np.array([1 << r for r in range(NUM_RANKS)] + [0], dtype=np.int16)
+# Indexed by card code (NO_CARD and other invalid codes map to no bit): the rank
+# bit of the card, and that bit in the 16-bit block of its suit
+CARD_RANK_BIT = np.zeros(256, dtype=np.int16)
+CARD_SUIT_BIT = np.zeros(256, dtype=np.uint64)
+CARD_RANK_BIT[:52] = 1 << (np.arange(52) // 4)
+CARD_SUIT_BIT[:52] = np.left_shift(1, (np.arange(52) % 4) * 16 + np.arange(52) // 4).astype(np.uint64)
+# TOP5 restricted to its k highest ranks
+TOP_MASKS = [sum(0xF << (16 - 4 * slot) for slot in range(k)) for k in range(6)]
+
+
+def _top(masks: np.ndarray, k: int) -> np.ndarray:
+    return TOP5[masks] & TOP_MASKS[k]
+
+
+# ----------- EVALUATION -----------
+class HandMasks(NamedTuple):
+    """Cards folded into rank masks, one entry per hand (see fold_cards)."""
+    ones: np.ndarray        # ranks seen at least once
+    pairs: np.ndarray       # ... at least twice
+    trips: np.ndarray       # ... three times
+    quads: np.ndarray       # ... four times
+    suits: np.ndarray       # rank mask of every suit, 16 bits each
+    num_cards: np.ndarray
+
+
+def fold_cards(cards: np.ndarray, masks: Optional[HandMasks] = None) -> HandMasks:
+    """
+    Fold an (N, k) array of card codes (NO_CARD ignored) into rank masks,
+    column by column. Given masks (e.g. of the boards), the cards are added
+    to a copy of them, so a board shared by several hands is folded once.
+    """
+    cards = np.asarray(cards, dtype=np.uint8)
+    n = len(cards)
+    if masks is None:
+        seen = [np.zeros(n, dtype=np.int16) for _ in range(4)]
+        suits = np.zeros(n, dtype=np.uint64)
+        num_cards = np.zeros(n, dtype=np.int8)
+    else:
+        seen = [masks.ones.copy(), masks.pairs.copy(), masks.trips.copy(), masks.quads.copy()]
+        suits, num_cards = masks.suits.copy(), masks.num_cards.copy()
+
+    for column in cards.T:
+        bit = CARD_RANK_BIT[column]
+        for times in (3, 2, 1):
+            seen[times] |= seen[times - 1] & bit
+        seen[0] |= bit
+        suits |= CARD_SUIT_BIT[column]
+        num_cards += column < 52
+    return HandMasks(*seen, suits, num_cards)
+
+
+def score_masks(masks: HandMasks) -> np.ndarray:
+    """Scores of folded hands (see evaluate_hands)."""
+    ones, pairs, trips, quads = masks.ones, masks.pairs, masks.trips, masks.quads
+
+    # At most one suit can hold five of seven cards
+    flush_mask = np.zeros(len(ones), dtype=np.int16)
+    for suit in range(4):
+        suit_mask = ((masks.suits >> np.uint64(16 * suit)) & np.uint64(NUM_MASKS - 1)).astype(np.int16)
+        flush_mask |= np.where(POPCOUNT[suit_mask] >= 5, suit_mask, 0).astype(np.int16)
+
+    straight_flush = STRAIGHT_HIGH[flush_mask]
+    straight = STRAIGHT_HIGH[ones]
+    quad = HIGHEST[quads]
+    trip = HIGHEST[trips]
+    pair = HIGHEST[pairs]
+    # Pairs other than the best trips (a second set of trips counts as a pair)
+    full_house_pair = HIGHEST[pairs & ~RANK_BIT[trip]]
+    second_pair = HIGHEST[pairs & ~RANK_BIT[pair]]
+
+    def score(category: int, ranks: np.ndarray) -> np.ndarray:
+        return (category << CATEGORY_SHIFT) | ranks
+
+    scores = np.select(
+        [
+            straight_flush >= 0,
+            quad >= 0,
+            (trip >= 0) & (full_house_pair >= 0),
+            flush_mask > 0,
+            straight >= 0,
+            trip >= 0,
+            second_pair >= 0,
+            pair >= 0,
+        ],
+        [
+            score(STRAIGHT_FLUSH, straight_flush.astype(np.int32) << 16),
+            score(QUADS, (quad.astype(np.int32) << 16) | (_top(ones & ~RANK_BIT[quad], 1) >> 4)),
+            score(FULL_HOUSE, (trip.astype(np.int32) << 16) | (full_house_pair.astype(np.int32) << 12)),
+            score(FLUSH, _top(flush_mask, 5)),
+            score(STRAIGHT, straight.astype(np.int32) << 16),
+            score(TRIPS, (trip.astype(np.int32) << 16) | (_top(ones & ~RANK_BIT[trip], 2) >> 4)),
+            score(TWO_PAIR, _top(pairs, 2) | (_top(ones & ~RANK_BIT[pair] & ~RANK_BIT[second_pair], 1) >> 8)),
+            score(PAIR, (pair.astype(np.int32) << 16) | (_top(ones & ~RANK_BIT[pair], 3) >> 4)),
+        ],
+        default=score(HIGH_CARD, _top(ones, 5)),
+    ).astype(np.int32)
+    scores[masks.num_cards < 5] = NO_RANK
+    return scores
+
+
+def evaluate_hands(cards: np.ndarray) -> np.ndarray:
+    """
+    Score hands of 5 to 7 cards given as an (N, k) array of card codes (see
+    utils.cards; NO_CARD pads shorter hands). The score of the best five-card
+    hand is returned as int32: higher is better, equal scores tie. Rows with
+    fewer than five cards get NO_RANK.
+
+    Every row is scored at once: the cards are folded into 13-bit rank masks
+    (ranks seen once, twice, three and four times, and per suit) column by
+    column, and categories and kickers are read from 8192-entry lookup tables
+    indexed by those masks.
+    """
+    cards = np.asarray(cards, dtype=np.uint8)
+    if cards.ndim == 1:
+        cards = cards[None, :]
+    return score_masks(fold_cards(cards))
+
+
+def hand_category(scores: np.ndarray) -> np.ndarray:
+    """Category index (see HAND_CATEGORIES) of scores; NO_RANK stays NO_RANK."""
+    scores = np.asarray(scores)
+    return np.where(scores >= 0, scores >> CATEGORY_SHIFT, NO_RANK)
+
+
+def category_names(scores: np.ndarray) -> np.ndarray:
+    """Category name of every score (None for NO_RANK)."""
+    names = np.array(list(HAND_CATEGORIES) + [None], dtype=object)
+    return names[hand_category(scores)]
@@ -1,14 +1,47 @@
-
-from models.regex_extraction import RegexExtraction
+from utils.actions import ACTION_CODES, NO_ACTION
 import pandas as pd
 import numpy as np
-import uuid
-import re
-from typing import List, Dict, Optional, Tuple, Literal
-from datetime import datetime
-import re
+from typing import List, Tuple
+
+
+COMPARISONS = {
+    'gte': np.greater_equal,
+    'lte': np.less_equal,
+    'gt': np.greater,
+    'lt': np.less,
+    'eq': np.equal,
+}
+
+
+def _rows_mask(num_rows: int, row_index: np.ndarray) -> np.ndarray:
+    mask = np.zeros(num_rows, dtype=bool)
+    mask[row_index] = True
+    return mask
+
+
+def _row_counts(num_rows: int, row_index: np.ndarray) -> np.ndarray:
+    return np.bincount(row_index, minlength=num_rows)
+
+
+def _hand_totals(df: pd.DataFrame, values: np.ndarray, dropna: bool = True) -> np.ndarray:
+    """
+    Per-HandID sum of a row-level array, broadcast back to every row of the hand
+    (the vectorized equivalent of groupby('HandID').transform('sum')). With
+    dropna, rows without a HandID get NaN.
+    """
+    hand_codes, hands = pd.factorize(df['HandID'], use_na_sentinel=dropna)
+    has_hand = hand_codes >= 0
+    totals = np.bincount(hand_codes[has_hand], weights=values[has_hand], minlength=len(hands))
+    out = np.full(len(df), np.nan)
+    out[has_hand] = totals[hand_codes[has_hand]]
+    return out
 
 
+def _active_counts(actions) -> np.ndarray:
+    # Same rule as is_active: any action other than fold or the [None] placeholder
+    active = (actions.codes != NO_ACTION) & (actions.codes != actions.code('fold'))
+    return _row_counts(len(actions.offsets) - 1, actions.row_index[active])
+
 
 def FilterAction(df: pd.DataFrame, column: str, action: str, street: int = None) -> pd.DataFrame:
     """
@@ -23,19 +56,25 @@ def FilterAction(df: pd.DataFrame, column: str, action: str, street: int = None)
     Returns:
         pd.DataFrame: Filtered DataFrame
     """
-    def match(actions):
-        if not isinstance(actions, list) or not actions:
-            return False
-        if street is None:
-            return any(a[0] == action for a in actions if isinstance(a, list) and a[0] is not None)
-        elif 1 <= street <= len(actions):
-            a = actions[street - 1]
-            return isinstance(a, list) and a[0] == action
-        return False
+    return df[action_mask(df, column, action, street)]
 
-    return df[df[column].apply(match)]
-    
 
+def action_mask(df: pd.DataFrame, column: str, action: str, street: int = None) -> np.ndarray:
+    """
+    Boolean row mask behind FilterAction, computed on the flat action arrays.
+    """
+    actions = df[column].actions
+    if action is None:
+        if street is None:
+            return np.zeros(len(df), dtype=bool)
+        code = NO_ACTION
+    else:
+        code = actions.code(action)
+
+    hit = actions.codes == code
+    if street is not None:
+        hit &= actions.position == street - 1
+    return _rows_mask(len(df), actions.row_index[hit])
 
 
 def FilterActionAmount(df: pd.DataFrame, column: str, comparison: str, amount: float, street: int = None) -> pd.DataFrame:
@@ -52,29 +91,27 @@ def FilterActionAmount(df: pd.DataFrame, column: str, comparison: str, amount: f
     Returns:
         pd.DataFrame: Filtered DataFrame
     """
-    def compare_value(val):
-        if not isinstance(val, list) or not val:
-            return False
-        actions = [val[street - 1]] if street is not None and 1 <= street <= len(val) else val
+    return df[action_amount_mask(df, column, comparison, amount, street)]
 
-        for action in actions:
-            if not isinstance(action, list) or len(action) < 2:
-                continue
-            action_amt = action[1]
-            if isinstance(action_amt, (int, float)):
-                if comparison == 'gte' and action_amt >= amount:
-                    return True
-                elif comparison == 'lte' and action_amt <= amount:
-                    return True
-                elif comparison == 'gt' and action_amt > amount:
-                    return True
-                elif comparison == 'lt' and action_amt < amount:
-                    return True
-                elif comparison == 'eq' and action_amt == amount:
-                    return True
-        return False
 
-    return df[df[column].apply(compare_value)]
+def action_amount_mask(df: pd.DataFrame, column: str, comparison: str, amount: float, street: int = None) -> np.ndarray:
+    """
+    Boolean row mask behind FilterActionAmount, computed on the flat action arrays.
+    """
+    compare = COMPARISONS.get(comparison)
+    if compare is None:
+        return np.zeros(len(df), dtype=bool)
+
+    actions = df[column].actions
+    with np.errstate(invalid='ignore'):
+        hit = compare(actions.amounts, amount)
+
+    if street is not None:
+        # When the row has no action at that index, every action of the row is checked
+        row_length = np.repeat(actions.lengths, actions.lengths)
+        in_range = (street >= 1) & (street <= row_length)
+        hit &= ~in_range | (actions.position == street - 1)
+    return _rows_mask(len(df), actions.row_index[hit])
 
 
 def count_checks(actions):
@@ -95,13 +132,14 @@ def is_active(actions):
     return any(isinstance(action, list) and action[0] not in [None, 'fold'] for action in actions)
 
 
-def detect_check_raises(df: pd.DataFrame, street: str) -> pd.DataFrame:
+def detect_check_raises(df: pd.DataFrame, street: str, include_flags: bool = False) -> pd.DataFrame:
     """
     Filters hands where a player performed a check-raise on a given postflop street.
 
     Parameters:
     - df: DataFrame with hand data
     - street: One of 'Flop', 'Turn', 'River'
+    - include_flags: add the per-row '{street}_CheckRaiser' column to the result
 
     Returns:
     - Filtered DataFrame containing only hands with a check-raise.
@@ -109,27 +147,34 @@ def detect_check_raises(df: pd.DataFrame, street: str) -> pd.DataFrame:
     if street not in ['Flop', 'Turn', 'River']:
         raise ValueError("Street must be one of: 'Flop', 'Turn', or 'River'")
 
-    street_col = f"{street}Action"
     check_raiser_col = f"{street}_CheckRaiser"
+    check_raiser = _check_raisers(df, f"{street}Action")
+    hand_has_cr = _hand_totals(df, check_raiser.astype(np.float64), dropna=False) > 0
+    result = df[hand_has_cr]
+    if include_flags:
+        result = result.assign(**{check_raiser_col: check_raiser[hand_has_cr]})
+    return result
 
-    def player_check_raised(actions):
-        if not isinstance(actions, list):
-            return False
-        found_check = False
-        for action in actions:
-            if not isinstance(action, list) or not action:
-                continue
-            if action[0] == 'check':
-                found_check = True
-            elif found_check and action[0] in {'raise', 'bet'}:
-                return True
-        return False
 
-    df = df.copy()
-    df[check_raiser_col] = df[street_col].apply(player_check_raised)
+def check_raise_mask(df: pd.DataFrame, street: str) -> np.ndarray:
+    """
+    Boolean row mask behind detect_check_raises.
+    """
+    if street not in ['Flop', 'Turn', 'River']:
+        raise ValueError("Street must be one of: 'Flop', 'Turn', or 'River'")
+    check_raiser = _check_raisers(df, f"{street}Action")
+    return _hand_totals(df, check_raiser.astype(np.float64), dropna=False) > 0
+
 
-    hands_with_cr = df[df[check_raiser_col]].HandID.unique()
-    return df[df['HandID'].isin(hands_with_cr)]
+def _check_raisers(df: pd.DataFrame, street_col: str) -> np.ndarray:
+    # A row check-raised when a bet/raise follows one of its own checks
+    actions = df[street_col].actions
+    is_check = (actions.codes == actions.code('check')).astype(np.int64)
+    checks_before = np.cumsum(is_check) - is_check
+    checks_before -= checks_before[actions.offsets[actions.row_index]]
+    aggressive = (actions.codes == actions.code('raise')) | (actions.codes == actions.code('bet'))
+    check_raised = aggressive & (checks_before > 0)
+    return _row_counts(len(df), actions.row_index[check_raised]) > 0
 
 
 def filter_postflop_players_by_position(
@@ -147,6 +192,18 @@ def filter_postflop_players_by_position(
     - number_of_players: exact number of players from req_positions that must act postflop.
     - street: street to analyze ('Flop', 'Turn', 'River').
     """
+    return df[postflop_players_mask(df, req_positions, number_of_players, street)]
+
+
+def postflop_players_mask(
+    df: pd.DataFrame,
+    req_positions: List[str],
+    number_of_players: int,
+    street: str
+) -> np.ndarray:
+    """
+    Boolean row mask behind filter_postflop_players_by_position.
+    """
     if street not in ['Flop', 'Turn', 'River']:
         raise ValueError("Street must be one of: 'Flop', 'Turn', or 'River'")
 
@@ -154,15 +211,15 @@ def filter_postflop_players_by_position(
         raise ValueError("Cannot require more players than positions provided")
 
     street_col = f"{street}Action"
-    played_col = f"{street_col}_played"
 
-    df_filtered = df[df['Position'].isin(req_positions)].copy()
-    df_filtered[played_col] = df_filtered[street_col].apply(is_active)
+    in_positions = df['Position'].isin(req_positions).to_numpy()
+    played = (_active_counts(df[street_col].actions) > 0) & in_positions
 
-    grouped = df_filtered.groupby('HandID')[played_col].sum().reset_index()
-    valid_hand_ids = grouped[grouped[played_col] == number_of_players]['HandID'].tolist()
+    # Hands without any row in req_positions never qualify, even for 0 players
+    hand_in_positions = _hand_totals(df, in_positions.astype(np.float64)) > 0
+    hand_played = _hand_totals(df, played.astype(np.float64))
 
-    return df[df['HandID'].isin(valid_hand_ids)]
+    return hand_in_positions & (hand_played == number_of_players)
 
 
 def identify_single_raise_pot_preflop(group):
@@ -250,27 +307,150 @@ def aggressor_bet_and_call_on_streets(
 
 
 # Third street - both players (check-check)
-def filter_all_checked_on_street(df: pd.DataFrame, street: str) -> pd.DataFrame:
+def filter_all_checked_on_street(df: pd.DataFrame, street: str, include_flags: bool = False) -> pd.DataFrame:
     """
     Filters hands where all active players checked on the given street.
 
     Parameters:
     - df: DataFrame with parsed hand histories.
     - street: One of 'Flop', 'Turn', or 'River'.
+    - include_flags: add the per-row '{street}_Checks' and '{street}_Active' columns to the result.
 
     Returns:
     - Filtered DataFrame where all active players checked on the street.
     """
     street = street.capitalize()
-    street_col = f"{street}Action"
     check_col = f"{street}_Checks"
     active_col = f"{street}_Active"
 
-    df = df.copy()
-    df[check_col] = df[street_col].apply(count_checks)
-    df[active_col] = df[street_col].apply(lambda x: 1 if is_active(x) else 0)
+    checks, active = _street_checks_active(df, f"{street}Action")
+    all_checked = _all_checked(df, checks, active)
+
+    result = df[all_checked]
+    if include_flags:
+        result = result.assign(**{check_col: checks[all_checked], active_col: active[all_checked]})
+    return result
+
+
+def all_checked_mask(df: pd.DataFrame, street: str) -> np.ndarray:
+    """
+    Boolean row mask behind filter_all_checked_on_street.
+    """
+    checks, active = _street_checks_active(df, f"{street.capitalize()}Action")
+    return _all_checked(df, checks, active)
+
+
+def _street_checks_active(df: pd.DataFrame, street_col: str) -> Tuple[np.ndarray, np.ndarray]:
+    actions = df[street_col].actions
+    checks = _row_counts(len(df), actions.row_index[actions.codes == actions.code('check')])
+    active = (_active_counts(actions) > 0).astype(np.int64)
+    return checks, active
+
+
+def _all_checked(df: pd.DataFrame, checks: np.ndarray, active: np.ndarray) -> np.ndarray:
+    hand_checks = _hand_totals(df, checks.astype(np.float64))
+    hand_active = _hand_totals(df, active.astype(np.float64))
+    return hand_checks == hand_active
+
+
+# ----------- ACTION LOG SEQUENCES -----------
+# Queries on the long-format action log (parser.action_log): one row per action,
+# hands contiguous and in action order. Every mask is per action row of the log.
+LOG_STREETS = ['Preflop', 'Flop', 'Turn', 'River']
+
+
+def _log_arrays(log: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    hand = pd.factorize(log['HandID'])[0]
+    player = pd.factorize(log['Player'])[0]
+    return hand, log['Street'].to_numpy(), player, log['Action'].to_numpy()
+
+
+def _count_before(keys: List[np.ndarray], flags: np.ndarray) -> np.ndarray:
+    # Number of earlier rows of the same group with the flag set
+    flags = flags.astype(np.int64)
+    return pd.Series(flags).groupby(keys, sort=False).cumsum().to_numpy() - flags
+
+
+def _street_aggressor(hand: np.ndarray, street: np.ndarray, player: np.ndarray, action: np.ndarray, street_code: int) -> np.ndarray:
+    """Player code of the last bettor/raiser on a street of each row's hand, -1 if none."""
+    aggressive = (street == street_code) & ((action == ACTION_CODES['bet']) | (action == ACTION_CODES['raise']))
+    num_hands = hand.max() + 1 if len(hand) else 0
+    # Position of the last aggressive row of every hand (-1 if none)
+    last_row = np.full(num_hands, -1)
+    np.maximum.at(last_row, hand[aggressive], np.flatnonzero(aggressive))
+    aggressor = np.where(last_row >= 0, player[np.maximum(last_row, 0)], -1)
+    return aggressor[hand]
+
 
-    grouped = df.groupby("HandID")[[check_col, active_col]].sum().reset_index()
-    valid_hand_ids = grouped[grouped[check_col] == grouped[active_col]]['HandID'].tolist()
+def _log_street(street: str, postflop: bool = False) -> int:
+    streets = LOG_STREETS[1:] if postflop else LOG_STREETS
+    if street not in streets:
+        raise ValueError(f"Street must be one of: {', '.join(repr(s) for s in streets)}")
+    return LOG_STREETS.index(street)
 
-    return df[df['HandID'].isin(valid_hand_ids)]
+
+def log_check_raise_mask(log: pd.DataFrame, street: str) -> np.ndarray:
+    """
+    Bets/raises on a postflop street by a player who checked earlier on it.
+    """
+    street_code = _log_street(street, postflop=True)
+    hand, streets, player, action = _log_arrays(log)
+    checks_before = _count_before([hand, streets, player], action == ACTION_CODES['check'])
+    return (streets == street_code) & (action == ACTION_CODES['raise']) & (checks_before > 0)
+
+
+def log_raise_number(log: pd.DataFrame) -> np.ndarray:
+    """
+    Preflop raises numbered in order (1 = open raise, 2 = 3-bet, 3 = 4-bet, ...);
+    0 for every other action.
+    """
+    hand, streets, _, action = _log_arrays(log)
+    raises = (streets == 0) & (action == ACTION_CODES['raise'])
+    return np.where(raises, _count_before([hand], raises) + 1, 0)
+
+
+def log_three_bet_mask(log: pd.DataFrame) -> np.ndarray:
+    """
+    Preflop 3-bets: the second raise of the hand.
+    """
+    return log_raise_number(log) == 2
+
+
+def log_donk_bet_mask(log: pd.DataFrame, street: str) -> np.ndarray:
+    """
+    Donk bets: a bet leading into the last aggressor of the previous street
+    from a player who acts before them on this street.
+    """
+    street_code = _log_street(street, postflop=True)
+    hand, streets, player, action = _log_arrays(log)
+    aggressor = _street_aggressor(hand, streets, player, action, street_code - 1)
+    on_street = streets == street_code
+    aggressor_acted = _count_before([hand], on_street & (player == aggressor)) > 0
+    return (
+        on_street & (action == ACTION_CODES['bet'])
+        & (aggressor >= 0) & (player != aggressor) & ~aggressor_acted
+    )
+
+
+def log_cbet_mask(log: pd.DataFrame, street: str) -> np.ndarray:
+    """
+    Continuation bets: the bet of a street made by the last aggressor of the
+    previous street.
+    """
+    street_code = _log_street(street, postflop=True)
+    hand, streets, player, action = _log_arrays(log)
+    aggressor = _street_aggressor(hand, streets, player, action, street_code - 1)
+    return (streets == street_code) & (action == ACTION_CODES['bet']) & (player == aggressor)
+
+
+def log_facing_cbet_mask(log: pd.DataFrame, street: str) -> np.ndarray:
+    """
+    Actions facing a continuation bet: every action after the c-bet of the
+    street, before anyone raises it.
+    """
+    street_code = _log_street(street, postflop=True)
+    hand, streets, _, action = _log_arrays(log)
+    on_street = streets == street_code
+    cbets_before = _count_before([hand], log_cbet_mask(log, street))
+    raises_before = _count_before([hand], on_street & (action == ACTION_CODES['raise']))
+    return on_street & (cbets_before > 0) & (raises_before == 0)
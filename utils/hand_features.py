@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+from typing import List
+
+from utils.actions import NO_ACTION
+
+
+POSTFLOP_STREETS = ['Flop', 'Turn', 'River']
+
+
+def _row_flags(actions, names: List[str]) -> np.ndarray:
+    """True for every row with at least one action in names."""
+    hit = np.isin(actions.codes, [actions.code(name) for name in names])
+    flags = np.zeros(len(actions.offsets) - 1, dtype=bool)
+    flags[actions.row_index[hit & (actions.codes != NO_ACTION)]] = True
+    return flags
+
+
+def build_hand_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Build a one-row-per-HandID table of hand-level features in a single
+    vectorized pass over the player-hand frame.
+
+    Columns:
+    - PreflopAggressor: first player (in frame order) who bet or raised preflop.
+      Same as get_preflop_aggresor.
+    - PreflopRaisers / PreflopCallers: players who bet/raised and who called preflop.
+    - SingleRaisedPot: exactly one raiser and one caller preflop.
+      Same as identify_single_raise_pot_preflop.
+    - {Street}AggressorBet: the preflop aggressor bet or raised on the street.
+    - {Street}AggressorCalled: another player called on the street.
+
+    Rows without a HandID are ignored. The index is HandID, in order of first
+    appearance.
+    """
+    hand_codes, hands = pd.factorize(df['HandID'])
+    num_hands = len(hands)
+    has_hand = hand_codes >= 0
+    rows = np.flatnonzero(has_hand)
+    codes = hand_codes[has_hand]
+
+    def per_hand_count(flags: np.ndarray) -> np.ndarray:
+        return np.bincount(codes, weights=flags[has_hand], minlength=num_hands).astype(np.int64)
+
+    preflop = df['PreflopAction'].actions
+    raised = _row_flags(preflop, ['raise', 'bet'])
+    called = _row_flags(preflop, ['call'])
+
+    # First raising row of each hand
+    raising_rows = rows[raised[has_hand]]
+    raising_hands, first = np.unique(hand_codes[raising_rows], return_index=True)
+    aggressor_row = np.full(num_hands, -1)
+    aggressor_row[raising_hands] = raising_rows[first]
+
+    players = df['Player'].to_numpy()
+    aggressor = np.full(num_hands, None, dtype=object)
+    aggressor[raising_hands] = players[raising_rows[first]]
+
+    is_aggressor = np.zeros(len(df), dtype=bool)
+    is_aggressor[aggressor_row[aggressor_row >= 0]] = True
+
+    raisers = per_hand_count(raised)
+    callers = per_hand_count(called)
+    features = {
+        'PreflopAggressor': aggressor,
+        'PreflopRaisers': raisers,
+        'PreflopCallers': callers,
+        'SingleRaisedPot': (raisers == 1) & (callers == 1),
+    }
+
+    for street in POSTFLOP_STREETS:
+        column = f"{street}Action"
+        if column not in df.columns:
+            continue
+        actions = df[column].actions
+        aggressor_bet = _row_flags(actions, ['bet', 'raise']) & is_aggressor
+        other_called = _row_flags(actions, ['call']) & ~is_aggressor
+        features[f"{street}AggressorBet"] = per_hand_count(aggressor_bet) > 0
+        features[f"{street}AggressorCalled"] = per_hand_count(other_called) > 0
+
+    return pd.DataFrame(features, index=pd.Index(hands, name='HandID'))
+
+
+def aggressor_bet_and_call_mask(
+    features: pd.DataFrame,
+    streets: List[str],
+    get_at_least_one_call: bool = True
+) -> pd.Series:
+    """
+    Per-hand version of aggressor_bet_and_call_on_streets on the feature table,
+    using the preflop aggressor.
+    """
+    mask = features['PreflopAggressor'].notna()
+    for street in streets:
+        mask &= features[f"{street}AggressorBet"]
+        if get_at_least_one_call:
+            mask &= features[f"{street}AggressorCalled"]
+    return mask
+
+
+def join_hand_features(df: pd.DataFrame, features: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Attach the hand-level features to every player row of the frame.
+    """
+    if features is None:
+        features = build_hand_features(df)
+    return df.join(features, on='HandID')
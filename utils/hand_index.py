@@ -0,0 +1,304 @@
+import os
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from utils.actions import ACTION_COLUMNS, ACTION_NAMES, NO_ACTION
+
+
+KEY_COLUMNS = ("Player", "TournID", "HandID")
+MIN_CAPACITY = 1024
+
+
+class _GrowableArray:
+    """
+    Array appended to in place, with capacity doubling, so appending n values
+    costs O(n) amortized instead of a copy of everything before them.
+
+    Copies share the buffer: the rows before a copy are never written again,
+    and whoever appends first past the shared length keeps writing in place
+    while the other side moves to a buffer of its own on its next append.
+    """
+
+    def __init__(self, values: Optional[np.ndarray] = None, dtype=None):
+        values = np.asarray(values if values is not None else [], dtype=dtype)
+        self._buffer = values
+        self._length = len(values)
+        self._filled = [self._length]  # rows written to the buffer, shared with copies
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._buffer[:self._length]
+
+    def __len__(self) -> int:
+        return self._length
+
+    def extend(self, values: np.ndarray) -> None:
+        end = self._length + len(values)
+        if self._filled[0] != self._length or end > len(self._buffer):
+            buffer = np.empty(max(MIN_CAPACITY, 2 * end), dtype=self._buffer.dtype)
+            buffer[:self._length] = self.values
+            self._buffer, self._filled = buffer, [self._length]
+        self._buffer[self._length:end] = values
+        self._length = self._filled[0] = end
+
+    def copy(self) -> "_GrowableArray":
+        array = _GrowableArray.__new__(_GrowableArray)
+        array._buffer, array._length, array._filled = self._buffer, self._length, self._filled
+        return array
+
+
+class _KeyIndex:
+    """
+    Value -> row positions for one column: a code per row (-1 for missing
+    values) and the distinct values; the rows of every value are grouped
+    lazily, on the first lookup after an append.
+    """
+
+    def __init__(self, values: Optional[List] = None, codes: Optional[np.ndarray] = None):
+        self.values: List = values if values is not None else []
+        self._codes = _GrowableArray(codes, dtype=np.int32)
+        self._lookup: Optional[Dict] = None
+        self._order: Optional[np.ndarray] = None
+        self._offsets: Optional[np.ndarray] = None
+
+    @property
+    def codes(self) -> np.ndarray:
+        return self._codes.values
+
+    @property
+    def lookup(self) -> Dict:
+        if self._lookup is None:
+            self._lookup = {value: code for code, value in enumerate(self.values)}
+        return self._lookup
+
+    def append(self, column: pd.Series) -> None:
+        inverse, uniques = pd.factorize(column)
+        self.extend_codes(inverse, uniques)
+
+    def extend_codes(self, codes: np.ndarray, values: Sequence) -> None:
+        """Append rows given as codes (-1 = missing) into their own values."""
+        self._codes.extend(self.code_map(values)[codes])
+        self._order = self._offsets = None
+
+    def code_map(self, values: Sequence) -> np.ndarray:
+        """
+        Codes of values in this index, adding the new ones; the extra last
+        entry maps the missing code -1 to itself.
+        """
+        lookup = self.lookup
+        mapping = np.empty(len(values) + 1, dtype=np.int32)
+        mapping[-1] = -1
+        for i, value in enumerate(values):
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(self.values)
+                self.values.append(value)
+            mapping[i] = code
+        return mapping
+
+    def copy(self) -> "_KeyIndex":
+        # Rows before the copy are never rewritten, so the codes buffer can be shared
+        key = _KeyIndex(values=list(self.values))
+        key._codes = self._codes.copy()
+        key._order, key._offsets = self._order, self._offsets
+        return key
+
+    def _group(self) -> None:
+        if self._order is None:
+            valid = self.codes >= 0
+            self._order = np.flatnonzero(valid)[np.argsort(self.codes[valid], kind="stable")]
+            self._offsets = np.zeros(len(self.values) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.codes[valid], minlength=len(self.values)), out=self._offsets[1:])
+
+    def rows(self, values: Iterable) -> np.ndarray:
+        self._group()
+        codes = sorted({self.lookup[v] for v in values if v in self.lookup})
+        parts = [self._order[self._offsets[c]:self._offsets[c + 1]] for c in codes]
+        return np.sort(np.concatenate(parts)) if len(parts) > 1 else (parts[0] if parts else np.empty(0, dtype=np.int64))
+
+
+class HandIndex:
+    """
+    Inverted indexes over a frame of parse_tour_clean rows:
+
+    - Player, TournID and HandID -> row positions
+    - one bitmap (a bool per row) per action column and action type, e.g.
+      "raise in PreflopAction" or "check in FlopAction"
+
+        index = HandIndex.build(df)
+        rows = index.rows("Player", "Hero")
+        mask = index.mask("Player", "Hero") & index.action_mask("PreflopAction", "raise")
+        df.take(np.flatnonzero(index.hand_mask(mask)))   # every row of those hands
+
+    Row positions refer to the frame the index was built on (0..len-1).
+    append(df) indexes rows added at the end of that frame, in O(new rows)
+    amortized (codes and bitmaps grow in place, see _GrowableArray).
+    save() / load() keep the index next to the data, so loading doesn't
+    rebuild it (HandStore keeps one per data file, LiveFrame keeps one up to
+    date as rows arrive).
+    """
+
+    def __init__(self):
+        self.num_rows = 0
+        self.keys: Dict[str, _KeyIndex] = {}
+        self._bitmaps: Dict[str, _GrowableArray] = {}
+
+    @classmethod
+    def build(cls, df: pd.DataFrame) -> "HandIndex":
+        index = cls()
+        index.append(df)
+        return index
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def copy(self) -> "HandIndex":
+        """Snapshot that later appends to this index don't change."""
+        index = HandIndex()
+        index.num_rows = self.num_rows
+        index.keys = {column: key.copy() for column, key in self.keys.items()}
+        index._bitmaps = {name: bitmap.copy() for name, bitmap in self._bitmaps.items()}
+        return index
+
+    @property
+    def bitmaps(self) -> Dict[str, np.ndarray]:
+        return {name: bitmap.values for name, bitmap in self._bitmaps.items()}
+
+    def _extend_bitmap(self, name: str, flags: np.ndarray) -> None:
+        bitmap = self._bitmaps.get(name)
+        if bitmap is None:
+            bitmap = self._bitmaps[name] = _GrowableArray(np.zeros(self.num_rows, dtype=bool))
+        bitmap.extend(flags)
+
+    # ----------- APPEND -----------
+    def append(self, df: pd.DataFrame) -> None:
+        if df.empty:
+            return
+        for column in KEY_COLUMNS:
+            if column in df.columns and column not in self.keys:
+                self.keys[column] = _KeyIndex(codes=np.full(self.num_rows, -1, dtype=np.int32))
+        for column, key in self.keys.items():
+            key.append(df[column] if column in df.columns else pd.Series([None] * len(df)))
+
+        for column in ACTION_COLUMNS:
+            if column not in df.columns:
+                continue
+            actions = df[column].actions
+            for name in ACTION_NAMES:
+                flags = np.zeros(len(df), dtype=bool)
+                hit = (actions.codes == actions.code(name)) & (actions.codes != NO_ACTION)
+                flags[actions.row_index[hit]] = True
+                self._extend_bitmap(_bitmap_name(column, name), flags)
+        # Bitmaps of actions that don't occur in df (nor columns it lacks) still cover its rows
+        for bitmap in self._bitmaps.values():
+            if len(bitmap) < self.num_rows + len(df):
+                bitmap.extend(np.zeros(self.num_rows + len(df) - len(bitmap), dtype=bool))
+        self.num_rows += len(df)
+
+    def fill(self, column: str, value) -> None:
+        """Index column as holding value on every row (e.g. a partition column of a data file)."""
+        self.keys[column] = _KeyIndex(values=[value], codes=np.zeros(self.num_rows, dtype=np.int32))
+
+    # ----------- LOOKUPS -----------
+    def rows(self, column: str, values) -> np.ndarray:
+        """Sorted positions of the rows whose column equals values (a value or a list of values)."""
+        if column not in self.keys:
+            raise KeyError(f"{column} is not indexed; indexed columns: {list(self.keys)}")
+        if isinstance(values, (str, bytes)) or not isinstance(values, Iterable):
+            values = [values]
+        return self.keys[column].rows(values)
+
+    def mask(self, column: str, values) -> np.ndarray:
+        mask = np.zeros(self.num_rows, dtype=bool)
+        mask[self.rows(column, values)] = True
+        return mask
+
+    def action_mask(self, column: str, action: str) -> np.ndarray:
+        """Rows with action anywhere in the action column (all False if it never occurs)."""
+        bitmap = self._bitmaps.get(_bitmap_name(column, action))
+        if bitmap is None:
+            if column not in ACTION_COLUMNS:
+                raise KeyError(f"{column} is not an action column")
+            return np.zeros(self.num_rows, dtype=bool)
+        return bitmap.values
+
+    def hand_mask(self, mask: np.ndarray) -> np.ndarray:
+        """Extend a row mask to every row of the hands it touches."""
+        codes = self.keys["HandID"].codes
+        hands = np.zeros(len(self.keys["HandID"].values) + 1, dtype=bool)
+        hands[codes[mask]] = True
+        hands[-1] = False  # rows without a HandID (code -1)
+        return hands[codes]
+
+    def hand_ids(self, mask: np.ndarray) -> List:
+        key = self.keys["HandID"]
+        codes = np.unique(key.codes[mask])
+        return [key.values[c] for c in codes if c >= 0]
+
+    # ----------- STORAGE -----------
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        """Save as a .npz file; bitmaps are stored one bit per row."""
+        arrays = {"num_rows": np.array(self.num_rows)}
+        for column, key in self.keys.items():
+            arrays[f"key:{column}:codes"] = key.codes
+            arrays[f"key:{column}:values"] = _values_array(key.values)
+        for name, bitmap in self.bitmaps.items():
+            arrays[f"bitmap:{name}"] = np.packbits(bitmap)
+        tmp = f"{os.fspath(path)}.tmp.npz"
+        np.savez(tmp, **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> "HandIndex":
+        index = cls()
+        with np.load(path, allow_pickle=False) as data:
+            index.num_rows = int(data["num_rows"])
+            for name in data.files:
+                kind, _, rest = name.partition(":")
+                if kind == "key" and rest.endswith(":codes"):
+                    column = rest[:-len(":codes")]
+                    index.keys[column] = _KeyIndex(
+                        values=data[f"key:{column}:values"].tolist(),
+                        codes=data[name],
+                    )
+                elif kind == "bitmap":
+                    index._bitmaps[rest] = _GrowableArray(np.unpackbits(data[name], count=index.num_rows).astype(bool))
+        return index
+
+    @classmethod
+    def concat(cls, indexes: Sequence["HandIndex"]) -> "HandIndex":
+        """Index of the frames of indexes concatenated in order."""
+        combined = cls()
+        for index in indexes:
+            combined._extend(index)
+        return combined
+
+    def _extend(self, other: "HandIndex") -> None:
+        # Like append, but from another index: codes are remapped, the data isn't read
+        for column in set(self.keys) | set(other.keys):
+            if column not in self.keys:
+                self.keys[column] = _KeyIndex(codes=np.full(self.num_rows, -1, dtype=np.int32))
+            key = self.keys[column]
+            other_key = other.keys.get(column)
+            if other_key is None:
+                key.append(pd.Series([None] * other.num_rows))
+                continue
+            key.extend_codes(other_key.codes, other_key.values)
+        for name in set(self._bitmaps) | set(other._bitmaps):
+            other_bitmap = other._bitmaps.get(name)
+            self._extend_bitmap(name, other_bitmap.values if other_bitmap is not None else np.zeros(other.num_rows, dtype=bool))
+        self.num_rows += other.num_rows
+
+
+def _bitmap_name(column: str, action: str) -> str:
+    return f"{column}:{action}"
+
+
+def _values_array(values: List) -> np.ndarray:
+    # Strings are stored as a fixed-width unicode array so no pickling is needed
+    array = np.asarray(values)
+    if array.dtype == object:
+        array = np.asarray([str(v) for v in values])
+    return array
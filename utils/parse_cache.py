@@ -0,0 +1,147 @@
+import hashlib
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Literal, Optional, Union
+
+import pandas as pd
+from cachetools import TTLCache
+
+from parser.tour import parse_tour_clean
+
+
+PARSE_CACHE_SIZE = 8
+PARSE_CACHE_TTL = 60 * 60
+
+_cache = TTLCache(maxsize=PARSE_CACHE_SIZE, ttl=PARSE_CACHE_TTL)
+_cache_lock = threading.Lock()
+_key_locks: Dict[str, threading.Lock] = {}
+_stats = {"hits": 0, "misses": 0}
+
+
+def log_digest(log: Union[str, bytes]) -> str:
+    """Content hash of a hand-history log."""
+    data = log.encode("utf-8") if isinstance(log, str) else log
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def parse_log_cached(
+    log: Union[str, bytes],
+    normalize: bool = True,
+    action_format: Literal["list", "arrow"] = "list",
+    digest: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    parse_tour_clean as a DataFrame, memoized by content hash, normalize flag
+    and action format.
+
+    Entries are evicted by count (PARSE_CACHE_SIZE) and age (PARSE_CACHE_TTL).
+    Concurrent callers asking for the same log wait for a single parse (see
+    parse_lock). Pass a precomputed digest (see log_digest) to skip hashing
+    the log again.
+
+    The returned frame is a shallow copy of the cached one: adding or replacing
+    columns is safe, editing values in place is not.
+    """
+    digest = digest or log_digest(log)
+    key = _cache_key(digest, normalize, action_format)
+
+    with _cache_lock:
+        df = _cache.get(key)
+        if df is not None:
+            _stats["hits"] += 1
+            return df.copy(deep=False)
+
+    with parse_lock(digest, normalize, action_format):
+        with _cache_lock:
+            df = _cache.get(key)
+        if df is None:
+            text = log.decode("utf-8-sig", errors="replace") if isinstance(log, bytes) else log
+            parsed = parse_tour_clean(text, normalize=normalize, action_format=action_format)
+            df = parsed if isinstance(parsed, pd.DataFrame) else pd.DataFrame(parsed)
+            with _cache_lock:
+                _cache[key] = df
+                _stats["misses"] += 1
+        else:
+            with _cache_lock:
+                _stats["hits"] += 1
+
+    return df.copy(deep=False)
+
+
+@contextmanager
+def parse_lock(
+    digest: str,
+    normalize: bool = True,
+    action_format: Literal["list", "arrow"] = "list",
+    cancel: Optional[threading.Event] = None
+) -> Iterator[bool]:
+    """
+    Hold the per-log lock while parsing a log that isn't cached, so callers
+    asking for the same log at the same time (e.g. two sessions uploading it)
+    wait for one parse and then find it in the cache:
+
+        with parse_lock(digest, normalize):
+            df = cached_parse(digest, normalize)
+            if df is None:
+                ...                     # parse, then store_parse(digest, df, normalize)
+
+    Yields True once the lock is held, or False (without it) if cancel is set
+    while waiting.
+    """
+    key = _cache_key(digest, normalize, action_format)
+    with _cache_lock:
+        key_lock = _key_locks.setdefault(key, threading.Lock())
+
+    if cancel is None:
+        key_lock.acquire()
+    else:
+        while not key_lock.acquire(timeout=0.1):
+            if cancel.is_set():
+                yield False
+                return
+    try:
+        yield True
+    finally:
+        # Also when the parse raises, or every failing log leaks a lock
+        with _cache_lock:
+            if _key_locks.get(key) is key_lock:
+                del _key_locks[key]
+        key_lock.release()
+
+
+def cached_parse(
+    digest: str,
+    normalize: bool = True,
+    action_format: Literal["list", "arrow"] = "list"
+) -> Optional[pd.DataFrame]:
+    """The cached frame of a log digest, or None; does not count as a hit or miss."""
+    with _cache_lock:
+        df = _cache.get(_cache_key(digest, normalize, action_format))
+    return df.copy(deep=False) if df is not None else None
+
+
+def store_parse(
+    digest: str,
+    df: pd.DataFrame,
+    normalize: bool = True,
+    action_format: Literal["list", "arrow"] = "list"
+) -> None:
+    """Cache a frame parsed elsewhere (e.g. by a BackgroundParse) under its log digest."""
+    with _cache_lock:
+        _cache[_cache_key(digest, normalize, action_format)] = df
+
+
+def _cache_key(digest: str, normalize: bool, action_format: str) -> str:
+    return f"{digest}:{int(normalize)}:{action_format}"
+
+
+def parse_cache_info() -> Dict[str, int]:
+    with _cache_lock:
+        return {**_stats, "size": len(_cache), "maxsize": _cache.maxsize}
+
+
+def clear_parse_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+        _key_locks.clear()
+        _stats["hits"] = _stats["misses"] = 0
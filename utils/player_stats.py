@@ -0,0 +1,259 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Sequence, Union
+
+from models.regex_extractor import RegexExtraction
+from utils.actions import NO_ACTION
+
+
+COUNTERS = [
+    'Hands',
+    'VPIP',
+    'PFR',
+    'ThreeBet',
+    'ThreeBetOpportunity',
+    'PostflopAggressive',
+    'PostflopCalls',
+    'SawFlop',
+    'WentToShowdown',
+]
+KEYS = ['Player', 'Position']
+MAX_SEATS = 9
+# Initial rows of the counter table, which then doubles as players are added
+MIN_CAPACITY = 256
+POSTFLOP_COLUMNS = ['FlopAction', 'TurnAction', 'RiverAction']
+
+
+def _preflop_order(num_players: int) -> List[str]:
+    # The blinds act last preflop, except heads-up where the small blind acts first
+    positions = RegexExtraction.get_positions_order(num_players)
+    return positions if num_players == 2 else positions[2:] + positions[:2]
+
+
+# (players at the table, position) -> 0-based preflop acting order
+PREFLOP_ORDER: Dict[tuple, int] = {
+    (n, position): i
+    for n in range(2, MAX_SEATS + 1)
+    for i, position in enumerate(_preflop_order(n))
+}
+
+
+def _action_counts(actions, names: Sequence[str]) -> np.ndarray:
+    """Number of actions in names of every row."""
+    hit = np.isin(actions.codes, [actions.code(name) for name in names]) & (actions.codes != NO_ACTION)
+    return np.bincount(actions.row_index[hit], minlength=len(actions.offsets) - 1)
+
+
+def player_counters(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Count the stat events of every (Player, Position) in a frame of
+    parse_tour_clean rows, in one vectorized pass:
+
+    - Hands: hands dealt
+    - VPIP / PFR: called, bet or raised / bet or raised preflop
+    - ThreeBet / ThreeBetOpportunity: made the second preflop raise / faced a
+      single raise while still able to re-raise
+    - PostflopAggressive / PostflopCalls: bets and raises / calls on flop,
+      turn and river
+    - SawFlop / WentToShowdown: still in the hand when the flop was dealt /
+      at showdown
+
+    Preflop raises are ordered by their raise-to amount and players by their
+    preflop acting order (from Position), so every player of a hand must be
+    in the frame (no player projection). Rows without a HandID are ignored.
+    """
+    df = df[df['HandID'].notna()]
+    n = len(df)
+    hand_codes, hands = pd.factorize(df['HandID'])
+    num_hands = len(hands)
+
+    def per_hand(flags: np.ndarray) -> np.ndarray:
+        return np.bincount(hand_codes, weights=flags, minlength=num_hands)
+
+    # ----------- PREFLOP -----------
+    preflop = df['PreflopAction'].actions
+    raises = _action_counts(preflop, ['bet', 'raise'])
+    acted = _action_counts(preflop, ['fold', 'check', 'call', 'bet', 'raise'])
+    folded_preflop = _action_counts(preflop, ['fold']) > 0
+    vpip = _action_counts(preflop, ['call', 'bet', 'raise']) > 0
+    pfr = raises > 0
+
+    # Raise level of every preflop raise: 1 is the open, 2 the 3-bet
+    is_raise = np.isin(preflop.codes, [preflop.code('bet'), preflop.code('raise')])
+    raise_rows = preflop.row_index[is_raise]
+    raise_hands = hand_codes[raise_rows]
+    order = np.lexsort((np.nan_to_num(preflop.amounts[is_raise]), raise_hands))
+    raise_rows, raise_hands = raise_rows[order], raise_hands[order]
+    starts = np.searchsorted(raise_hands, raise_hands, side='left')
+    level = np.arange(len(raise_rows)) - starts + 1
+
+    opener = np.full(num_hands, -1)
+    opener[raise_hands[level == 1]] = raise_rows[level == 1]
+    three_bettor = np.full(num_hands, -1)
+    three_bettor[raise_hands[level == 2]] = raise_rows[level == 2]
+
+    playing = df['Playing'].to_numpy() if 'Playing' in df.columns else np.bincount(hand_codes)[hand_codes]
+    rank = np.fromiter(
+        (PREFLOP_ORDER.get((p, pos), -1) for p, pos in zip(playing, df['Position'])),
+        dtype=np.int64, count=n,
+    )
+
+    rows = np.arange(n)
+    hand_opener = opener[hand_codes]
+    hand_three_bettor = three_bettor[hand_codes]
+    opener_rank = np.where(hand_opener >= 0, rank[np.maximum(hand_opener, 0)], -1)
+
+    # When each player answers the open: the players after the opener in
+    # acting order, then the players before it (limpers) getting their turn again
+    limper = rank < opener_rank
+    answer_order = rank + limper * MAX_SEATS
+    three_bettor_order = answer_order[np.maximum(hand_three_bettor, 0)]
+
+    is_three_bettor = hand_three_bettor == rows
+    faced_open = (
+        (hand_opener >= 0) & (hand_opener != rows) & (rank >= 0)
+        & (acted > np.where(limper, 1, 0))
+    )
+    # A 3-bet by a player answering earlier takes the opportunity away
+    three_bet_opportunity = faced_open & ((hand_three_bettor < 0) | (three_bettor_order >= answer_order))
+    three_bet = is_three_bettor & three_bet_opportunity
+
+    # ----------- POSTFLOP -----------
+    aggressive = np.zeros(n, dtype=np.int64)
+    calls = np.zeros(n, dtype=np.int64)
+    folded = folded_preflop.copy()
+    for column in POSTFLOP_COLUMNS:
+        if column not in df.columns:
+            continue
+        actions = df[column].actions
+        aggressive += _action_counts(actions, ['bet', 'raise'])
+        calls += _action_counts(actions, ['call'])
+        folded |= _action_counts(actions, ['fold']) > 0
+
+    # The flop is dealt (and a showdown happens) when at least two players are left
+    saw_flop = ~folded_preflop & (per_hand(~folded_preflop)[hand_codes] >= 2)
+    showdown = ~folded & (per_hand(~folded)[hand_codes] >= 2)
+
+    counters = pd.DataFrame({
+        'Player': df['Player'].to_numpy(),
+        'Position': df['Position'].to_numpy(),
+        'Hands': 1,
+        'VPIP': vpip,
+        'PFR': pfr,
+        'ThreeBet': three_bet,
+        'ThreeBetOpportunity': three_bet_opportunity,
+        'PostflopAggressive': aggressive,
+        'PostflopCalls': calls,
+        'SawFlop': saw_flop,
+        'WentToShowdown': showdown,
+    })
+    return counters.groupby(KEYS, observed=True, sort=False)[COUNTERS].sum().astype(np.int64)
+
+
+class PlayerStats:
+    """
+    Mergeable per-player, per-position stat counters.
+
+        stats = PlayerStats()
+        stats.add(df)                        # e.g. every chunk of stream_tour_frames
+        stats.add(new_hands)                 # or LiveTail(..., on_update=lambda df, path: stats.add(df))
+        stats.stats()                        # VPIP, PFR, 3Bet, AF, WTSD per player
+        stats.stats(by='Position')
+
+    Only counters are kept (see player_counters), in a table updated in
+    place, so adding hands costs O(new hands) and computing the stats
+    O(players). Aggregates built on
+    separate shards (files, processes) are combined with merge() or +.
+    Adding the same hands twice counts them twice; HandStore.ingest and
+    LiveTail only pass on new hands.
+    """
+
+    def __init__(self, counters: pd.DataFrame = None):
+        # Counter table updated in place: a row per (Player, Position), in first-seen order
+        self._rows: Dict[tuple, int] = {}
+        self._values = np.zeros((0, len(COUNTERS)), dtype=np.int64)
+        self._counters: Optional[pd.DataFrame] = None
+        if counters is not None and not counters.empty:
+            self._add_counters(counters)
+
+    @property
+    def counters(self) -> pd.DataFrame:
+        """Counters per (Player, Position); built on the first read after an add."""
+        if self._counters is None:
+            keys = list(self._rows)
+            self._counters = pd.DataFrame(
+                self._values[:len(keys)].copy(),
+                index=pd.MultiIndex.from_arrays(list(zip(*keys)) or [[], []], names=KEYS),
+                columns=COUNTERS,
+            )
+        return self._counters
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "PlayerStats":
+        return cls(player_counters(df))
+
+    def add(self, df: pd.DataFrame) -> "PlayerStats":
+        if not df.empty:
+            self._add_counters(player_counters(df))
+        return self
+
+    def _add_counters(self, part: pd.DataFrame) -> None:
+        # O(rows of part): keys are looked up in a dict and the table grows by doubling
+        rows = np.fromiter(
+            (self._rows.setdefault(key, len(self._rows)) for key in part.index),
+            dtype=np.int64, count=len(part),
+        )
+        if len(self._rows) > len(self._values):
+            values = np.zeros((max(MIN_CAPACITY, 2 * len(self._rows)), len(COUNTERS)), dtype=np.int64)
+            values[:len(self._values)] = self._values
+            self._values = values
+        # part comes from a groupby, so its keys (and rows) are distinct
+        self._values[rows] += part[COUNTERS].to_numpy(dtype=np.int64)
+        self._counters = None
+
+    def merge(self, *others: "PlayerStats") -> "PlayerStats":
+        return PlayerStats(_sum_counters([self.counters, *(other.counters for other in others)]))
+
+    def __add__(self, other: "PlayerStats") -> "PlayerStats":
+        return self.merge(other)
+
+    def __radd__(self, other: Union[int, "PlayerStats"]) -> "PlayerStats":
+        # Allows sum(shards)
+        return self if other == 0 else other.merge(self)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def stats(self, by: Union[str, Sequence[str]] = 'Player') -> pd.DataFrame:
+        """
+        Stats per by ('Player', 'Position' or both), in percent except AF:
+
+        - VPIP, PFR, WTSD (went to showdown / saw flop), 3Bet (per opportunity)
+        - AF: postflop (bets + raises) / calls
+        """
+        counters = self.counters.groupby(level=by, observed=True).sum()
+        return compute_stats(counters)
+
+
+def compute_stats(counters: pd.DataFrame) -> pd.DataFrame:
+    """Turn summed counters into stats; rows without opportunities get NaN."""
+    def ratio(events: str, opportunities: str, scale: float = 100) -> pd.Series:
+        return (scale * counters[events] / counters[opportunities].where(counters[opportunities] > 0)).round(2)
+
+    return pd.DataFrame({
+        'Hands': counters['Hands'],
+        'VPIP': ratio('VPIP', 'Hands'),
+        'PFR': ratio('PFR', 'Hands'),
+        '3Bet': ratio('ThreeBet', 'ThreeBetOpportunity'),
+        'AF': ratio('PostflopAggressive', 'PostflopCalls', scale=1),
+        'WTSD': ratio('WentToShowdown', 'SawFlop'),
+    })
+
+
+def _sum_counters(parts: List[pd.DataFrame]) -> pd.DataFrame:
+    parts = [part for part in parts if not part.empty]
+    if not parts:
+        return PlayerStats().counters
+    if len(parts) == 1:
+        return parts[0]
+    return pd.concat(parts).groupby(level=KEYS, observed=True, sort=False).sum().astype(np.int64)
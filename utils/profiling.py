@@ -0,0 +1,244 @@
+import functools
+import heapq
+import re
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from models import regex_extractor
+from models.regex_extractor import CashRegexExtraction, RegexExtraction
+
+
+# Methods of RegexExtraction that get timed while a profile is active
+PROFILED_METHODS = (
+    "__init__",
+    "_build_index",
+    "normalize_amount",
+    "sort_players_by_position",
+    "assign_positions",
+)
+SLOWEST_HANDS = 10
+LATENCY_PERCENTILES = (50, 90, 99)
+
+
+class ParseProfile:
+    """
+    Opt-in instrumentation of RegexExtraction and parse_tour_clean.
+
+        profile = ParseProfile()
+        rows = parse_tour_clean(log_text, profile=profile)
+        profile.to_frame()          # per-extractor calls, cumulative time, regex scans
+        profile.report()            # the same plus per-hand latency percentiles,
+                                    # failed hands and the slowest hands
+
+    Extractors are only wrapped inside instrument() (which parse_tour_clean
+    enters around every hand when given a profile), so nothing is paid when
+    profiling is off. While active, the RegexExtraction class and the pattern
+    registry it uses are patched for the whole process: do not profile from
+    several threads.
+
+    Cumulative time includes nested extractor calls (extract_result calls
+    extract_allin, ...). Regex scans count the match/search/findall calls on
+    compiled patterns and are attributed to the innermost running extractor.
+    """
+
+    def __init__(self, slowest: int = SLOWEST_HANDS):
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.regex_scans: Dict[str, int] = defaultdict(int)
+        self.hand_seconds: List[float] = []
+        self.failures: List[Dict] = []
+        self.slowest: List[tuple] = []
+        self._max_slowest = slowest
+        self._stack: List[str] = []
+        self._patches: Optional[Dict[tuple, tuple]] = None
+        self._patterns: Optional[_CountingPatterns] = None
+        self._active = False
+
+    # ----------- INSTRUMENTATION -----------
+    @contextmanager
+    def instrument(self):
+        """Time every extractor and count regex scans while the block runs."""
+        if self._active:
+            # Nested, e.g. iter_hands inside an instrument() block
+            yield self
+            return
+        if self._patches is None:
+            # Cash overrides (e.g. extract_hand_id) are patched on their own class
+            self._patches = {
+                (cls, name): (method, self._timed(name, method))
+                for cls in (RegexExtraction, CashRegexExtraction)
+                for name, method in vars(cls).items()
+                if name.startswith("extract_") or name in PROFILED_METHODS
+            }
+            self._patterns = _CountingPatterns(regex_extractor.patterns, self._count_scan)
+        patterns_module = regex_extractor.patterns
+        self._active = True
+        try:
+            for (cls, name), (_, wrapper) in self._patches.items():
+                setattr(cls, name, wrapper)
+            regex_extractor.patterns = self._patterns
+            yield self
+        finally:
+            for (cls, name), (method, _) in self._patches.items():
+                setattr(cls, name, method)
+            regex_extractor.patterns = patterns_module
+            self._active = False
+
+    def _timed(self, name: str, method) -> Callable:
+        if isinstance(method, staticmethod):
+            return method
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            self._stack.append(name)
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.seconds[name] += time.perf_counter() - start
+                self.calls[name] += 1
+                self._stack.pop()
+
+        return wrapper
+
+    def _count_scan(self) -> None:
+        self.regex_scans[self._stack[-1] if self._stack else "<outside extractors>"] += 1
+
+    def iter_hands(self, hand_texts: Iterable[str], parse_hand: Callable[[str], List[Dict]]) -> Iterator[List[Dict]]:
+        """
+        Instrumented version of the parse loop: times every hand and records
+        the ones that fail to parse instead of only printing them.
+
+        Extractors are instrumented around each hand's parse only, never
+        across a yield, so a caller that stops early (break, islice) doesn't
+        leave RegexExtraction patched.
+        """
+        for index, hand_text in enumerate(hand_texts):
+            with self.instrument():
+                start = time.perf_counter()
+                try:
+                    rows = parse_hand(hand_text)
+                    error = None
+                except Exception as e:
+                    rows, error = None, e
+                elapsed = time.perf_counter() - start
+            self._record_hand(index, hand_text, elapsed, error)
+
+            if error is not None:
+                print(f"Error parsing hand: {error}")
+                continue
+            if rows:
+                yield rows
+
+    def _record_hand(self, index: int, hand_text: str, seconds: float, error: Optional[Exception]) -> None:
+        self.hand_seconds.append(seconds)
+        header = hand_text.partition("\n")[0]
+        if error is not None:
+            self.failures.append({
+                "index": index,
+                "header": header,
+                "error": f"{type(error).__name__}: {error}",
+                "seconds": seconds,
+                "hand_text": hand_text,
+            })
+        entry = (seconds, index, header)
+        if len(self.slowest) < self._max_slowest:
+            heapq.heappush(self.slowest, entry)
+        elif seconds > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    # ----------- REPORT -----------
+    def to_frame(self) -> pd.DataFrame:
+        """One row per extractor, slowest (cumulative) first."""
+        names = sorted(set(self.calls) | set(self.regex_scans))
+        df = pd.DataFrame({
+            "calls": [self.calls.get(name, 0) for name in names],
+            "cum_seconds": [self.seconds.get(name, 0.0) for name in names],
+            "regex_scans": [self.regex_scans.get(name, 0) for name in names],
+        }, index=pd.Index(names, name="extractor"))
+        df["us_per_call"] = (df["cum_seconds"] / df["calls"].where(df["calls"] > 0) * 1e6).round(2)
+        return df.sort_values("cum_seconds", ascending=False)
+
+    def latency(self) -> Dict[str, float]:
+        """Per-hand parse time percentiles, in milliseconds."""
+        if not self.hand_seconds:
+            return {}
+        ms = np.asarray(self.hand_seconds) * 1e3
+        stats = {f"p{p}": round(float(np.percentile(ms, p)), 3) for p in LATENCY_PERCENTILES}
+        stats["max"] = round(float(ms.max()), 3)
+        stats["mean"] = round(float(ms.mean()), 3)
+        return stats
+
+    def report(self) -> Dict:
+        return {
+            "hands": len(self.hand_seconds),
+            "failed": len(self.failures),
+            "total_seconds": round(sum(self.hand_seconds), 4),
+            "hand_latency_ms": self.latency(),
+            "extractors": self.to_frame().reset_index().to_dict("records"),
+            "failures": [{k: v for k, v in f.items() if k != "hand_text"} for f in self.failures],
+            "slowest_hands": [
+                {"index": index, "header": header, "seconds": seconds}
+                for seconds, index, header in sorted(self.slowest, reverse=True)
+            ],
+        }
+
+
+class _CountingPattern:
+    """Compiled pattern that reports every scan before delegating."""
+
+    __slots__ = ("_pattern", "_count")
+
+    def __init__(self, pattern: re.Pattern, count: Callable[[], None]):
+        self._pattern = pattern
+        self._count = count
+
+    def match(self, *args, **kwargs):
+        self._count()
+        return self._pattern.match(*args, **kwargs)
+
+    def search(self, *args, **kwargs):
+        self._count()
+        return self._pattern.search(*args, **kwargs)
+
+    def fullmatch(self, *args, **kwargs):
+        self._count()
+        return self._pattern.fullmatch(*args, **kwargs)
+
+    def findall(self, *args, **kwargs):
+        self._count()
+        return self._pattern.findall(*args, **kwargs)
+
+    def finditer(self, *args, **kwargs):
+        self._count()
+        return self._pattern.finditer(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._pattern, name)
+
+
+class _CountingPatterns:
+    """Stand-in for models.regex_patterns whose compiled patterns count scans."""
+
+    def __init__(self, module, count: Callable[[], None]):
+        self._module = module
+        self._count = count
+        self._wrapped: Dict[str, object] = {}
+
+    def __getattr__(self, name):
+        wrapped = self._wrapped.get(name)
+        if wrapped is None:
+            value = getattr(self._module, name)
+            if isinstance(value, re.Pattern):
+                wrapped = _CountingPattern(value, self._count)
+            elif name == "player_pattern":
+                wrapped = lambda template, player: _CountingPattern(value(template, player), self._count)
+            else:
+                wrapped = value
+            self._wrapped[name] = wrapped
+        return wrapped
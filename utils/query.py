@@ -0,0 +1,263 @@
+import operator
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+
+from utils.actions import arrow_actions_mapper
+from utils.hand_index import KEY_COLUMNS, HandIndex
+from utils.filters import (
+    COMPARISONS,
+    action_amount_mask,
+    action_mask,
+    all_checked_mask,
+    check_raise_mask,
+    postflop_players_mask,
+)
+
+
+STREETS = ['Flop', 'Turn', 'River']
+
+OPERATORS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+
+class _Step(NamedTuple):
+    description: str
+    hand_level: bool
+    columns: Tuple[str, ...]
+    # Row mask of the step, computed on a frame holding (at least) its columns
+    evaluate: Callable[[pd.DataFrame], np.ndarray]
+    expression: Optional[ds.Expression] = None
+    # Same mask from a HandIndex of the full frame, for steps it can answer
+    lookup: Optional[Callable[[HandIndex], np.ndarray]] = None
+
+
+class FilterPlan:
+    """
+    A chain of utils.filters predicates, evaluated in one fused pass.
+
+        plan = (FilterPlan()
+                .where('Position', 'in', ['small blind', 'big blind'])
+                .action('PreflopAction', 'raise')
+                .postflop_players_by_position(['small blind', 'big blind'], 2, 'Flop')
+                .all_checked_on_street('Flop'))
+        result = plan.run(df)              # same rows as chaining the filters
+        result = plan.scan(store)          # HandStore or pyarrow dataset on disk
+        result = plan.run(df, index=index) # with a utils.hand_index.HandIndex of df
+
+    Each step sees the rows kept by the previous ones, exactly like chaining
+    FilterAction -> filter_postflop_players_by_position -> ..., but the full
+    frame is only indexed once, at the end. Consecutive row-level steps are
+    fused into one mask; before each hand-level step (which has to group the
+    surviving rows by HandID) only the columns the remaining steps read are
+    carried over to the surviving rows.
+
+    With an index, the leading row-level steps it can answer (where ==/in on
+    Player, TournID or HandID, action without a street) are intersected as
+    bitmaps instead of scanning their columns.
+
+    Plans are immutable; every builder method returns a new plan.
+    """
+
+    def __init__(self, steps: Sequence[_Step] = ()):
+        self.steps: Tuple[_Step, ...] = tuple(steps)
+
+    def _add(self, step: _Step) -> "FilterPlan":
+        return FilterPlan(self.steps + (step,))
+
+    # ----------- ROW-LEVEL STEPS -----------
+    def where(self, column: str, op: str, value) -> "FilterPlan":
+        """
+        Compare a plain column: op is one of ==, !=, <, <=, >, >=, in, not in.
+        These are the predicates that can be pushed down into a dataset scan.
+
+        Missing values (None/NaN) match != and not in, and nothing else, as
+        with pandas comparisons; the pushed-down expression does the same.
+        """
+        if op in ('in', 'not in'):
+            values = list(value)
+            expression = ds.field(column).isin(values)
+            if op == 'not in':
+                expression = ~expression
+            evaluate = lambda df: df[column].isin(values).to_numpy(dtype=bool) ^ (op == 'not in')
+            lookup = lambda index: index.mask(column, values) ^ (op == 'not in')
+        elif op in OPERATORS:
+            compare = OPERATORS[op]
+            expression = compare(ds.field(column), value)
+            if op == '!=':
+                # Arrow comparisons with null are null, which a scan drops
+                expression = expression | ds.field(column).is_null(nan_is_null=True)
+            evaluate = lambda df: np.asarray(compare(df[column], value).fillna(False), dtype=bool)
+            lookup = (lambda index: index.mask(column, value) ^ (op == '!=')) if op in ('==', '!=') else None
+        else:
+            raise ValueError(f"Unknown operator {op!r}")
+        if column not in KEY_COLUMNS:
+            lookup = None
+        return self._add(_Step(f"{column} {op} {value!r}", False, (column,), evaluate, expression, lookup))
+
+    def action(self, column: str, action: str, street: int = None) -> "FilterPlan":
+        """Same rows as FilterAction."""
+        return self._add(_Step(
+            f"{column} has {action!r}" + (f" at #{street}" if street else ""),
+            False, (column,), lambda df: action_mask(df, column, action, street),
+            lookup=None if street else lambda index: index.action_mask(column, action),
+        ))
+
+    def action_amount(self, column: str, comparison: str, amount: float, street: int = None) -> "FilterPlan":
+        """Same rows as FilterActionAmount."""
+        if comparison not in COMPARISONS:
+            raise ValueError(f"Comparison must be one of {list(COMPARISONS)}")
+        return self._add(_Step(
+            f"{column} amount {comparison} {amount}" + (f" at #{street}" if street else ""),
+            False, (column,), lambda df: action_amount_mask(df, column, comparison, amount, street),
+        ))
+
+    # ----------- HAND-LEVEL STEPS -----------
+    def check_raises(self, street: str) -> "FilterPlan":
+        """Same rows as detect_check_raises."""
+        _check_street(street)
+        return self._add(_Step(
+            f"hand has a {street} check-raise", True, ('HandID', f"{street}Action"),
+            lambda df: check_raise_mask(df, street),
+        ))
+
+    def postflop_players_by_position(
+        self,
+        req_positions: List[str],
+        number_of_players: int,
+        street: str
+    ) -> "FilterPlan":
+        """Same rows as filter_postflop_players_by_position."""
+        _check_street(street)
+        if len(req_positions) < number_of_players:
+            raise ValueError("Cannot require more players than positions provided")
+        positions = list(req_positions)
+        return self._add(_Step(
+            f"{number_of_players} of {positions} played the {street}", True,
+            ('HandID', 'Position', f"{street}Action"),
+            lambda df: postflop_players_mask(df, positions, number_of_players, street),
+        ))
+
+    def all_checked_on_street(self, street: str) -> "FilterPlan":
+        """Same rows as filter_all_checked_on_street."""
+        street = street.capitalize()
+        return self._add(_Step(
+            f"everyone active checked the {street}", True, ('HandID', f"{street}Action"),
+            lambda df: all_checked_mask(df, street),
+        ))
+
+    # ----------- EXECUTION -----------
+    @property
+    def columns(self) -> List[str]:
+        """Columns the plan reads."""
+        return list(dict.fromkeys(col for step in self.steps for col in step.columns))
+
+    def rows(self, df: pd.DataFrame, index: Optional[HandIndex] = None) -> np.ndarray:
+        """Positions of the rows the plan keeps."""
+        rows = np.arange(len(df))
+        view = df
+        stages = self._stages()
+        narrowed = False
+        if index is not None and stages and not stages[0][0].hand_level:
+            if len(index) != len(df):
+                raise ValueError(f"Index has {len(index)} rows, the frame {len(df)}")
+            indexed = [step for step in stages[0] if step.lookup is not None]
+            if indexed:
+                mask = np.ones(len(df), dtype=bool)
+                for step in indexed:
+                    mask &= step.lookup(index)
+                rows = np.flatnonzero(mask)
+                rest = [step for step in stages[0] if step.lookup is None]
+                stages = ([rest] if rest else []) + stages[1:]
+                narrowed = True
+        for i, steps in enumerate(stages):
+            if i or narrowed:
+                # Narrow the frame to the surviving rows and the columns still needed
+                needed = FilterPlan([step for later in stages[i:] for step in later]).columns
+                view = pd.DataFrame({col: df[col].take(rows) for col in needed})
+            mask = np.ones(len(view), dtype=bool)
+            for step in steps:
+                mask &= step.evaluate(view)
+            rows = rows[mask]
+        return rows
+
+    def mask(self, df: pd.DataFrame, index: Optional[HandIndex] = None) -> np.ndarray:
+        """Boolean row mask of the rows the plan keeps."""
+        mask = np.zeros(len(df), dtype=bool)
+        mask[self.rows(df, index=index)] = True
+        return mask
+
+    def run(self, df: pd.DataFrame, index: Optional[HandIndex] = None) -> pd.DataFrame:
+        return df.take(self.rows(df, index=index)) if self.steps else df
+
+    def _stages(self) -> List[List[_Step]]:
+        # Consecutive row steps share a stage; every hand step is its own stage
+        stages = []
+        for step in self.steps:
+            if not step.hand_level and stages and not stages[-1][0].hand_level:
+                stages[-1].append(step)
+            else:
+                stages.append([step])
+        return stages
+
+    def pushdown(self) -> Tuple[Optional[ds.Expression], "FilterPlan"]:
+        """
+        Split the plan into a dataset filter expression and the steps left to
+        run in memory. Only where() steps that come before the first
+        hand-level step are pushed down, since hand-level steps depend on the
+        rows kept before them.
+        """
+        expression, remaining = None, []
+        seen_hand_step = False
+        for step in self.steps:
+            seen_hand_step |= step.hand_level
+            if step.expression is not None and not seen_hand_step:
+                expression = step.expression if expression is None else expression & step.expression
+            else:
+                remaining.append(step)
+        return expression, FilterPlan(remaining)
+
+    def scan(self, source, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Run the plan on data on disk: a HandStore or a pyarrow dataset. Pushed
+        down predicates are applied by the scan (partition pruning and
+        row-group statistics); only the needed columns are read. Action
+        columns come back Arrow-encoded.
+        """
+        expression, remaining = self.pushdown()
+        read_columns = None if columns is None else list(dict.fromkeys([*columns, *remaining.columns]))
+
+        if hasattr(source, 'load'):
+            df = source.load(columns=read_columns, filters=expression, action_format='arrow')
+        else:
+            table = source.to_table(columns=read_columns, filter=expression)
+            df = table.to_pandas(types_mapper=arrow_actions_mapper)
+
+        result = remaining.run(df)
+        return result[columns] if columns is not None else result
+
+    def explain(self) -> str:
+        expression, remaining = self.pushdown()
+        lines = [f"scan filter: {expression}" if expression is not None else "scan filter: none"]
+        lines += [
+            f"{'hand' if step.hand_level else 'row'}: {step.description}"
+            for step in remaining.steps
+        ]
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return f"FilterPlan({', '.join(step.description for step in self.steps)})"
+
+
+def _check_street(street: str) -> None:
+    if street not in STREETS:
+        raise ValueError("Street must be one of: 'Flop', 'Turn', or 'River'")
+
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+from models.regex_extractor import RegexExtraction
+
+# pandas and numpy are only needed for frames: hand_balance_error runs without them (see cli.py)
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Every Balance is rounded to 2 decimals, so a hand may be off by half a cent per player
+ROUNDING_PER_PLAYER = 0.005
+
+
+def hand_balance_error(parser: RegexExtraction, tolerance: float = None) -> Optional[float]:
+    """
+    Same check as balance_errors on a single parsed hand, straight from its
+    extractor: the residual of the balances plus the rake if it is over the
+    tolerance, else None.
+    """
+    balances = parser.extract_balances()
+    if any(balance is None for balance in balances.values()):
+        return float("nan")
+    residual = sum(balances.values()) + (parser.extract_rake() or 0.0)
+    allowed = len(balances) * ROUNDING_PER_PLAYER + 1e-9 if tolerance is None else tolerance
+    return round(residual, 2) if abs(residual) > allowed else None
+
+
+def balance_errors(df: pd.DataFrame, tolerance: float = None) -> pd.DataFrame:
+    """
+    Check that chips are conserved in every hand: the Balance of all players
+    of a HandID plus the Rake (when the frame has one) must be zero.
+
+    Returns one row per failing hand, indexed by HandID, with the Balance sum,
+    the Rake, the number of players and the Residual; empty if every hand
+    balances. Hands with a missing Balance fail. tolerance is the allowed
+    residual per hand (by default the rounding error of its players).
+
+    One factorize and a few bincounts over the whole frame, so it is cheap
+    enough to run on every ingest.
+    """
+    import numpy as np
+    import pandas as pd
+
+    hand_codes, hands = pd.factorize(df['HandID'])
+    has_hand = hand_codes >= 0
+    codes = hand_codes[has_hand]
+    num_hands = len(hands)
+
+    balance = pd.to_numeric(df['Balance'], errors='coerce').to_numpy(dtype=np.float64)[has_hand]
+    players = np.bincount(codes, minlength=num_hands)
+    missing = np.bincount(codes, weights=np.isnan(balance), minlength=num_hands) > 0
+    total = np.bincount(codes, weights=np.nan_to_num(balance), minlength=num_hands)
+
+    if 'Rake' in df.columns:
+        rake = pd.to_numeric(df['Rake'], errors='coerce').to_numpy(dtype=np.float64)[has_hand]
+        # Rake is repeated on every row of the hand
+        rake = np.bincount(codes, weights=np.nan_to_num(rake), minlength=num_hands) / np.maximum(players, 1)
+    else:
+        rake = np.zeros(num_hands)
+
+    residual = total + rake
+    allowed = players * ROUNDING_PER_PLAYER + 1e-9 if tolerance is None else tolerance
+    failing = missing | (np.abs(residual) > allowed)
+
+    return pd.DataFrame(
+        {
+            'Balance': total[failing].round(2),
+            'Rake': rake[failing].round(2),
+            'Players': players[failing],
+            'Residual': residual[failing].round(2),
+        },
+        index=pd.Index(np.asarray(hands)[failing], name='HandID'),
+    )
+
+
+def validate_balances(df: pd.DataFrame, tolerance: float = None) -> bool:
+    """
+    True if every hand of the frame balances; failing hands are reported.
+    """
+    errors = balance_errors(df, tolerance=tolerance)
+    if errors.empty:
+        return True
+    print(f"Balance check failed for {len(errors)} hands: {errors.index[:10].tolist()}")
+    return False